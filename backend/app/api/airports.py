@@ -1,20 +1,30 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from app.database.airport_repository import AirportRepository
+from app.parsers import json_codec
 
 router = APIRouter()
 
+
+def _airports_response(airports: List[dict]) -> Response:
+    """
+    Encode an airport list straight to JSON (orjson when installed).
+    The rows are plain sqlite dicts, so FastAPI's jsonable_encoder walk is skipped.
+    """
+    return Response(
+        content=json_codec.dumps({"airports": airports, "count": len(airports)}),
+        media_type="application/json",
+    )
+
 @router.get("/airports")
 def get_all_airports():
     """Get all airports."""
-    airports = AirportRepository.get_all_airports()
-    return {"airports": airports, "count": len(airports)}
+    return _airports_response(AirportRepository.get_all_airports())
 
 @router.get("/airports/search")
 def search_airports(q: str = Query(..., min_length=1)):
     """Search airports by name, city, country, or IATA code."""
-    airports = AirportRepository.search_airports(q)
-    return {"airports": airports, "count": len(airports)}
+    return _airports_response(AirportRepository.search_airports(q))
 
 @router.get("/airports/{iata}")
 def get_airport(iata: str):
@@ -33,4 +43,4 @@ def get_airports_in_bounds(
 ):
     """Get airports within geographic bounds."""
     airports = AirportRepository.get_airports_in_bounds(min_lat, max_lat, min_lon, max_lon)
-    return {"airports": airports, "count": len(airports)}
+    return _airports_response(airports)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from app.logic.core_logic import CoreLogic
 from app.models.schemas import Airport, Flight, Ticket, Weather, FlightSchedule, FlightInfo, Item
 from pydantic import BaseModel
@@ -12,6 +13,9 @@ from typing import List
 
 router = APIRouter()
 
+# How long a transport request may wait for the background stop-index load
+_STOP_INDEX_WAIT_SECONDS = 30
+
 # Include airport routes
 from app.api.airports import router as airports_router
 router.include_router(airports_router, tags=["airports"])
@@ -234,6 +238,7 @@ async def get_tips(destination: str = None):
 # --- Transport Routes ---
 from app.transport.models import (
     NearbyStopSchema, RouteResultSchema, RouteLegSchema, StopSchema,
+    stop_to_schema,
 )
 
 @router.get("/transport/route", response_model=RouteResultSchema)
@@ -291,22 +296,28 @@ async def get_transport_route(
     )
 
 
+async def _ready_stop_index():
+    """The preloaded StopIndex, waiting off the event loop if it is still loading."""
+    from main import _stop_index
+
+    if _stop_index is None:
+        raise HTTPException(status_code=503, detail="Transport not initialized.")
+    if not await run_in_threadpool(_stop_index.wait_ready, _STOP_INDEX_WAIT_SECONDS):
+        raise HTTPException(status_code=503, detail="Transport index not ready.")
+    return _stop_index
+
+
 @router.get("/transport/stops/nearby", response_model=List[NearbyStopSchema])
 async def get_nearby_stops(lat: float, lon: float, k: int = 10):
     """
     Find the nearest stops to given coordinates.
     """
-    from main import _stop_index
-
-    if _stop_index is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Transport index not initialized."
-        )
+    stop_index = await _ready_stop_index()
 
-    results = _stop_index.find_nearest(lat, lon, k=min(k, 50))
+    results = stop_index.find_nearest(lat, lon, k=min(k, 50))
+    # Index data is trusted: build the schemas without re-validating
     return [
-        NearbyStopSchema(
+        NearbyStopSchema.model_construct(
             stop_id=stop.stop_id,
             stop_name=stop.stop_name,
             lat=stop.lat,
@@ -322,17 +333,15 @@ async def get_transport_info():
     """
     Get transport data metadata: valid date range and stop count.
     """
-    from main import _stop_index
     from app.transport.schedule import ScheduleService
 
-    if _stop_index is None:
-        raise HTTPException(status_code=503, detail="Transport not initialized.")
+    stop_index = await _ready_stop_index()
 
     sched = ScheduleService()
     date_from, date_to = sched.get_data_date_range()
 
     return {
-        "total_stops": _stop_index.size,
+        "total_stops": stop_index.size,
         "schedule_date_from": date_from,
         "schedule_date_to": date_to,
         "agencies": ["CP", "FlixBus", "CarrisMet", "STCP"],
@@ -345,21 +354,10 @@ async def search_stops(q: str, limit: int = 15):
     Search stops by name (case-insensitive substring match).
     Used for autocomplete in the frontend.
     """
-    from main import _stop_index
-
-    if _stop_index is None:
-        raise HTTPException(status_code=503, detail="Transport not initialized.")
+    stop_index = await _ready_stop_index()
 
-    stops = _stop_index.search_by_name(q, limit=min(limit, 50))
-    return [
-        StopSchema(
-            stop_id=s.stop_id,
-            stop_name=s.stop_name,
-            lat=s.lat,
-            lon=s.lon,
-        )
-        for s in stops
-    ]
+    stops = stop_index.search_by_name(q, limit=min(limit, 50))
+    return [stop_to_schema(s) for s in stops]
 
 
 # --- AI Routes ---
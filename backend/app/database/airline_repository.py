@@ -64,8 +64,12 @@ class AirlineRepository:
         return None
     
     @staticmethod
-    def bulk_insert_airlines(airlines: List[AirlineDB]):
-        """Bulk insert airlines."""
+    def bulk_insert_airlines(airlines: List[AirlineDB]) -> int:
+        """
+        Bulk insert airlines in a single transaction.
+        Airlines whose ICAO already exists are skipped by the database.
+        Returns the number of rows actually inserted.
+        """
         conn = get_db_connection()
         cursor = conn.cursor()
         
@@ -73,9 +77,11 @@ class AirlineRepository:
             INSERT OR IGNORE INTO airlines (icao, iata, name, logo_url)
             VALUES (?, ?, ?, ?)
         """, [(a.icao, a.iata, a.name, a.logo_url) for a in airlines])
+        inserted = cursor.rowcount
         
         conn.commit()
         conn.close()
+        return inserted
     
     @staticmethod
     def is_empty() -> bool:
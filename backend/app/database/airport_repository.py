@@ -1,5 +1,5 @@
 import sqlite3
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from app.database.connection import get_db_connection
 
 class AirportRepository:
@@ -87,8 +87,8 @@ class AirportRepository:
         return count == 0
     
     @staticmethod
-    def bulk_insert_airports(airports: List[dict]):
-        """Bulk insert airports."""
+    def bulk_insert_airports(airports: Iterable[dict]):
+        """Bulk insert airports (a list of dicts or an AirportTable)."""
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
@@ -44,6 +44,65 @@ class FlightScheduleRepository:
         conn.close()
         return schedule
     
+    @staticmethod
+    def bulk_upsert(schedules: List[FlightScheduleDB], batch_size: int = 500) -> int:
+        """
+        Insert or update many flight schedules in a single transaction.
+        Same semantics as create_or_update, keyed on (flight_number, airline_icao),
+        but with one SELECT per batch and executemany writes instead of
+        several round-trips per schedule.
+        Returns the number of schedules written.
+        """
+        if not schedules:
+            return 0
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        
+        # Existing rows for the incoming flight numbers, in batches to stay under SQLite's variable limit
+        flight_numbers = list({s.flight_number for s in schedules})
+        existing = {}
+        for i in range(0, len(flight_numbers), batch_size):
+            batch = flight_numbers[i:i + batch_size]
+            cursor.execute(f"""
+                SELECT id, flight_number, airline_icao FROM flight_schedules
+                WHERE flight_number IN ({",".join("?" * len(batch))})
+            """, batch)
+            for row in cursor.fetchall():
+                existing.setdefault((row["flight_number"], row["airline_icao"]), row["id"])
+        
+        # Last occurrence wins, as with sequential create_or_update calls
+        to_update = {}
+        to_insert = {}
+        for schedule in schedules:
+            key = (schedule.flight_number, schedule.airline_icao)
+            if key in existing:
+                schedule.id = existing[key]
+                to_update[key] = schedule
+            else:
+                to_insert[key] = schedule
+        
+        cursor.executemany("""
+            UPDATE flight_schedules 
+            SET aircraft_type = ?, origin_airport = ?, destination_airport = ?,
+                last_updated = ?
+            WHERE id = ?
+        """, [(s.aircraft_type, s.origin_airport, s.destination_airport, now, s.id)
+              for s in to_update.values()])
+        
+        cursor.executemany("""
+            INSERT INTO flight_schedules 
+            (flight_number, airline_icao, aircraft_type, origin_airport, destination_airport, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(s.flight_number, s.airline_icao, s.aircraft_type,
+               s.origin_airport, s.destination_airport, now)
+              for s in to_insert.values()])
+        
+        conn.commit()
+        conn.close()
+        return len(to_update) + len(to_insert)
+    
     @staticmethod
     def get_by_flight_number(flight_number: str) -> Optional[FlightScheduleDB]:
         """Get schedule by flight number."""
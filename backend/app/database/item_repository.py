@@ -18,20 +18,15 @@ class ItemRepository:
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
-            for item in items:
-                # Check if exists (by ID) to avoid duplicates if ID preserverd
-                if item.id:
-                    cursor.execute("SELECT 1 FROM items WHERE id = ?", (item.id,))
-                    if cursor.fetchone():
-                        continue # Skip existing
-
-                cursor.execute("""
-                INSERT INTO items (id, title, text, image, public_tags, hidden_tags)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    item.id, item.title, item.text, item.image, 
-                    item.public_tags, item.hidden_tags
-                ))
+            # One executemany; items whose ID already exists are skipped by the DB
+            cursor.executemany("""
+            INSERT OR IGNORE INTO items (id, title, text, image, public_tags, hidden_tags)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (item.id, item.title, item.text, item.image,
+                 item.public_tags, item.hidden_tags)
+                for item in items
+            ])
             conn.commit()
         except Exception as e:
             print(f"[ItemRepository] Error loading items: {e}")
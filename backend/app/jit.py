@@ -0,0 +1,17 @@
+"""
+Optional Numba JIT compilation shared by the planner and transport engines.
+Re-exports numba.njit when numba is installed; otherwise njit is a stand-in
+that leaves the decorated functions as plain Python.
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional speedup
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when numba isn't installed: run as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
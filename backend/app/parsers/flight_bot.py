@@ -1,7 +1,52 @@
-import datetime
+import re
+import threading
+import time
 from typing import Optional
 from FlightRadar24 import FlightRadar24API
 from app.models.schemas import FlightInfo, FlightInfoAirport
+from app.database.flight_schedule_repository import FlightScheduleRepository
+from app.database.airline_repository import AirlineRepository
+from app.database.models import FlightScheduleDB, AirlineDB
+
+_NON_DIGITS_RE = re.compile(r'[^0-9]')
+
+
+def _fmt_time(ts) -> Optional[str]:
+    """Format a UNIX timestamp as a local ISO string (seconds precision) without building a datetime."""
+    if not ts:
+        return None
+    return "%04d-%02d-%02dT%02d:%02d:%02d" % time.localtime(ts)[:6]
+
+
+def _persist_search_result(flight_number: str, operator_icao: Optional[str], logo_url: Optional[str],
+                           create_airline: bool, save_schedule: bool) -> None:
+    """Save a search-result-only flight (and its airline) to the database. Runs off the request path."""
+    try:
+        # First, ensure the airline exists in database
+        if create_airline:
+            new_airline = AirlineDB(
+                icao=operator_icao,
+                iata=None,  # Could extract from flight prefix
+                name=operator_icao,  # Temporary, will be updated when airlines are scraped
+                logo_url=logo_url
+            )
+            AirlineRepository.create_airline(new_airline)
+            print(f"[FlightBot] Created airline entry for {operator_icao}")
+        
+        # No aircraft info, save what we have
+        if save_schedule:
+            schedule_entry = FlightScheduleDB(
+                flight_number=flight_number,
+                airline_icao=operator_icao or "UNKNOWN",
+                aircraft_type=None,  # Not available in search results
+                origin_airport=None,
+                destination_airport=None
+            )
+            FlightScheduleRepository.create_or_update(schedule_entry)
+            print(f"[FlightBot] Saved flight schedule to database (no aircraft data)")
+    except Exception as e:
+        print(f"[FlightBot] Failed to save to database: {e}")
+
 
 class FlightBot:
     """
@@ -91,14 +136,16 @@ class FlightBot:
                     
             # Step 3: Match the flight (only if we didn't get data from search results)
             if not data and operator_icao:
-                for idx, f in enumerate(flights):
-                    fn = f.number.upper() if f.number else ""
-                    cs = f.callsign.upper() if f.callsign else ""
-                    
+                # Normalize the target and every candidate once, up front
+                target_numeric = _NON_DIGITS_RE.sub('', target)
+                normalized = [
+                    (f, (f.number or '').upper(), (f.callsign or '').upper())
+                    for f in flights
+                ]
+                
+                for f, fn, cs in normalized:
                     # Fixed matching logic - prevent empty string matches!
-                    import re
-                    target_numeric = re.sub(r'[^0-9]', '', target)
-                    fn_numeric = re.sub(r'[^0-9]', '', fn) if fn else ""
+                    fn_numeric = _NON_DIGITS_RE.sub('', fn) if fn else ""
                     
                     matched = False
                     
@@ -130,25 +177,9 @@ class FlightBot:
                         print(f"[FlightBot] Using search result data instead of live flight")
                         det = search_result_data.get('detail', {})
                         
-                        # Save to database for future lookups
+                        # Read what we already know, then save to database for future lookups
                         try:
-                            from app.database.flight_schedule_repository import FlightScheduleRepository
-                            from app.database.airline_repository import AirlineRepository
-                            from app.database.models import FlightScheduleDB, AirlineDB
-                            
-                            # First, ensure the airline exists in database
-                            if operator_icao:
-                                existing_airline = AirlineRepository.get_by_icao(operator_icao)
-                                if not existing_airline:
-                                    # Create the airline entry
-                                    new_airline = AirlineDB(
-                                        icao=operator_icao,
-                                        iata=None,  # Could extract from flight prefix
-                                        name=operator_icao,  # Temporary, will be updated when airlines are scraped
-                                        logo_url=det.get('logo')
-                                    )
-                                    AirlineRepository.create_airline(new_airline)
-                                    print(f"[FlightBot] Created airline entry for {operator_icao}")
+                            airline_db = AirlineRepository.get_by_icao(operator_icao) if operator_icao else None
                             
                             # Check if we already have this flight in database (with aircraft info)
                             existing_schedule = FlightScheduleRepository.get_by_flight_number(flight_number)
@@ -158,48 +189,48 @@ class FlightBot:
                                 print(f"[FlightBot] Found existing flight data in database with aircraft: {existing_schedule.aircraft_type}")
                                 aircraft_type_to_use = existing_schedule.aircraft_type
                             else:
-                                # No aircraft info, save what we have
                                 aircraft_type_to_use = None
-                                schedule_entry = FlightScheduleDB(
-                                    flight_number=flight_number,
-                                    airline_icao=operator_icao or "UNKNOWN",
-                                    aircraft_type=None,  # Not available in search results
-                                    origin_airport=None,
-                                    destination_airport=None
-                                )
-                                FlightScheduleRepository.create_or_update(schedule_entry)
-                                print(f"[FlightBot] Saved flight schedule to database (no aircraft data)")
                             
                             # Get airline name for display
-                            airline_name = operator_icao
-                            if operator_icao:
-                                airline_db = AirlineRepository.get_by_icao(operator_icao)
-                                if airline_db:
-                                    airline_name = airline_db.name
+                            airline_name = airline_db.name if airline_db else operator_icao
+                            
+                            # Writes don't affect this response, so don't make the user wait for them
+                            threading.Thread(
+                                target=_persist_search_result,
+                                args=(
+                                    flight_number,
+                                    operator_icao,
+                                    det.get('logo'),
+                                    bool(operator_icao) and not airline_db,
+                                    not aircraft_type_to_use,
+                                ),
+                                daemon=True,
+                            ).start()
                                     
                         except Exception as e:
-                            print(f"[FlightBot] Failed to save to database: {e}")
+                            print(f"[FlightBot] Database lookup failed: {e}")
                             airline_name = det.get('operator') or "Unknown Airline"
                             aircraft_type_to_use = None
                         
-                        # Extract what we can from search results
-                        return FlightInfo(
+                        # Extract what we can from search results.
+                        # model_construct skips validation, so every field must already be str/None.
+                        return FlightInfo.model_construct(
                             flight_number=flight_number,
                             operator=airline_name,
                             aircraft_type=aircraft_type_to_use or det.get('aircraft', {}).get('model', {}).get('text') or det.get('ac_type') or "Unknown Aircraft",
                             status=det.get('status', {}).get('text') or "Scheduled",
-                            origin=FlightInfoAirport(
+                            origin=FlightInfoAirport.model_construct(
                                 code=det.get('airport', {}).get('origin', {}).get('code', {}).get('iata', ''),
                                 name=det.get('airport', {}).get('origin', {}).get('name', ''),
                                 city=det.get('airport', {}).get('origin', {}).get('position', {}).get('region', {}).get('city', ''),
                             ) if det.get('airport', {}).get('origin') else None,
-                            destination=FlightInfoAirport(
+                            destination=FlightInfoAirport.model_construct(
                                 code=det.get('airport', {}).get('destination', {}).get('code', {}).get('iata', ''),
                                 name=det.get('airport', {}).get('destination', {}).get('name', ''),
                                 city=det.get('airport', {}).get('destination', {}).get('position', {}).get('region', {}).get('city', ''),
                             ) if det.get('airport', {}).get('destination') else None,
-                            scheduled_departure=det.get('time', {}).get('scheduled', {}).get('departure'),
-                            scheduled_arrival=det.get('time', {}).get('scheduled', {}).get('arrival'),
+                            scheduled_departure=_fmt_time(det.get('time', {}).get('scheduled', {}).get('departure')),
+                            scheduled_arrival=_fmt_time(det.get('time', {}).get('scheduled', {}).get('arrival')),
                         )
                     return None
                 
@@ -222,7 +253,7 @@ class FlightBot:
             org = data.get('airport', {}).get('origin', {})
             # ... continue with previous parsing logic ...
 
-            origin_obj = FlightInfoAirport(
+            origin_obj = FlightInfoAirport.model_construct(
                 code=org.get('code', {}).get('iata', ''),
                 name=org.get('name', 'Unknown Airport'),
                 city=org.get('position', {}).get('region', {}).get('city', ''),
@@ -232,7 +263,7 @@ class FlightBot:
             
             # Destination
             dst = data.get('airport', {}).get('destination', {})
-            dest_obj = FlightInfoAirport(
+            dest_obj = FlightInfoAirport.model_construct(
                 code=dst.get('code', {}).get('iata', ''),
                 name=dst.get('name', 'Unknown Airport'),
                 city=dst.get('position', {}).get('region', {}).get('city', ''),
@@ -247,12 +278,10 @@ class FlightBot:
             est_dep = time_info.get('estimated', {}).get('departure')
             first_est_arr = time_info.get('estimated', {}).get('arrival') 
             
-            # Convert timestamps to distinct strings if needed, or pass as is (frontend handles iso? backend schema expects str?)
-            # Backend schema expects str. If these are timestamps (int), convert.
-            
-            def fmt_time(ts):
-                if not ts: return None
-                return datetime.datetime.fromtimestamp(ts).isoformat()
+            # Backend schema expects str. Timestamps are UNIX seconds, format each one once.
+            sched_dep, sched_arr, est_dep, first_est_arr = [
+                _fmt_time(ts) for ts in (sched_dep, sched_arr, est_dep, first_est_arr)
+            ]
             
             # Status
             status_text = data.get('status', {}).get('text')
@@ -263,19 +292,19 @@ class FlightBot:
             # Airline
             airline_name = data.get('airline', {}).get('name')
             
-            return FlightInfo(
+            return FlightInfo.model_construct(
                 flight_number=flight_number,
                 operator=airline_name or "Unknown Airline",
                 aircraft_type=aircraft_model or "Unknown Aircraft",
                 status=status_text or "Active",
                 origin=origin_obj,
                 destination=dest_obj,
-                scheduled_departure=fmt_time(sched_dep),
-                scheduled_arrival=fmt_time(sched_arr),
-                estimated_departure=fmt_time(est_dep),
-                estimated_arrival=fmt_time(first_est_arr),
-                dep_time=fmt_time(sched_dep),
-                arr_time=fmt_time(sched_arr),
+                scheduled_departure=sched_dep,
+                scheduled_arrival=sched_arr,
+                estimated_departure=est_dep,
+                estimated_arrival=first_est_arr,
+                dep_time=sched_dep,
+                arr_time=sched_arr,
                 # Timezones might be in airport info, defaulting to None if complex to extract
                 dep_timezone=org.get('timezone', {}).get('name'),
                 arr_timezone=dst.get('timezone', {}).get('name')
@@ -1,7 +1,115 @@
 from app.models.schemas import Flight, FlightSchedule
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import random
 
+# Hardcoded real schedules, keyed by normalized (stripped, upper-case) flight number.
+# Built once at import time instead of on every lookup.
+_KNOWN_FLIGHTS = MappingProxyType({
+    # === SATA Air Açores ===
+    "S4183": FlightSchedule(
+        flight_number="S4183",
+        dep_time="2026-02-19T12:35:00",
+        arr_time="2026-02-19T14:15:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="Atlantic/Azores",
+    ),
+    "S4513": FlightSchedule(
+        flight_number="S4513",
+        dep_time="2026-02-15T11:00:00",
+        arr_time="2026-02-15T13:45:00",
+        dep_timezone="Europe/Paris",
+        arr_timezone="Atlantic/Azores",
+    ),
+    # SP = SATA Air Açores inter-island
+    "SP7601": FlightSchedule(
+        flight_number="SP7601",
+        dep_time="2026-02-22T08:30:00",
+        arr_time="2026-02-22T09:00:00",
+        dep_timezone="Atlantic/Azores",
+        arr_timezone="Atlantic/Azores",
+    ),
+
+    # === Ryanair ===
+    "FR2160": FlightSchedule(
+        flight_number="FR2160",
+        dep_time="2026-02-15T14:15:00",
+        arr_time="2026-02-15T18:00:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="Europe/Rome",
+    ),
+
+    # === TAP Air Portugal ===
+    "TP1713": FlightSchedule(
+        flight_number="TP1713",
+        dep_time="2026-12-27T07:00:00",
+        arr_time="2026-12-27T08:40:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="Atlantic/Madeira",
+    ),
+    "TP1234": FlightSchedule(
+        flight_number="TP1234",
+        dep_time="2026-02-15T08:30:00",
+        arr_time="2026-02-15T09:30:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="Europe/Lisbon",
+    ),
+    "TP4570": FlightSchedule(
+        flight_number="TP4570",
+        dep_time="2026-02-15T17:00:00",
+        arr_time="2026-02-15T19:00:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="Atlantic/Azores",
+    ),
+    "TP542": FlightSchedule(
+        flight_number="TP542",
+        dep_time="2026-02-15T14:00:00",
+        arr_time="2026-02-15T17:30:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="America/Sao_Paulo",
+    ),
+    "TP1000": FlightSchedule(
+        flight_number="TP1000",
+        dep_time="2026-02-15T11:25:00",
+        arr_time="2026-02-15T15:40:00",
+        dep_timezone="Europe/Lisbon",
+        arr_timezone="America/New_York",
+    ),
+
+    # === United Airlines ===
+    "UA3936": FlightSchedule(
+        flight_number="UA3936",
+        dep_time="2026-03-06T06:00:00",
+        arr_time="2026-03-06T08:21:00",
+        dep_timezone="America/New_York",
+        arr_timezone="America/Chicago",
+    ),
+
+    # === Other airlines ===
+    "FR1926": FlightSchedule(
+        flight_number="FR1926",
+        dep_time="2026-02-15T06:15:00",
+        arr_time="2026-02-15T09:30:00",
+        dep_timezone="Europe/Dublin",
+        arr_timezone="Europe/Lisbon",
+    ),
+    "LH400": FlightSchedule(
+        flight_number="LH400",
+        dep_time="2026-02-15T10:10:00",
+        arr_time="2026-02-15T13:25:00",
+        dep_timezone="Europe/Berlin",
+        arr_timezone="America/New_York",
+    ),
+    "BA500": FlightSchedule(
+        flight_number="BA500",
+        dep_time="2026-02-15T09:00:00",
+        arr_time="2026-02-16T06:30:00",
+        dep_timezone="Europe/London",
+        arr_timezone="Australia/Sydney",
+    ),
+})
+
+
 class FlightParser:
     """
     Flight schedule parser with hardcoded real schedule data.
@@ -30,113 +138,9 @@ class FlightParser:
         """
         print(f"[PARSER] Fetching schedule for flight: {flight_number}")
 
-        known_flights = {
-            # === SATA Air Açores ===
-            "S4183": FlightSchedule(
-                flight_number="S4183",
-                dep_time="2026-02-19T12:35:00",
-                arr_time="2026-02-19T14:15:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="Atlantic/Azores",
-            ),
-            "S4513": FlightSchedule(
-                flight_number="S4513",
-                dep_time="2026-02-15T11:00:00",
-                arr_time="2026-02-15T13:45:00",
-                dep_timezone="Europe/Paris",
-                arr_timezone="Atlantic/Azores",
-            ),
-            # SP = SATA Air Açores inter-island
-            "SP7601": FlightSchedule(
-                flight_number="SP7601",
-                dep_time="2026-02-22T08:30:00",
-                arr_time="2026-02-22T09:00:00",
-                dep_timezone="Atlantic/Azores",
-                arr_timezone="Atlantic/Azores",
-            ),
-
-            # === Ryanair ===
-            "FR2160": FlightSchedule(
-                flight_number="FR2160",
-                dep_time="2026-02-15T14:15:00",
-                arr_time="2026-02-15T18:00:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="Europe/Rome",
-            ),
-
-            # === TAP Air Portugal ===
-            "TP1713": FlightSchedule(
-                flight_number="TP1713",
-                dep_time="2026-12-27T07:00:00",
-                arr_time="2026-12-27T08:40:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="Atlantic/Madeira",
-            ),
-            "TP1234": FlightSchedule(
-                flight_number="TP1234",
-                dep_time="2026-02-15T08:30:00",
-                arr_time="2026-02-15T09:30:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="Europe/Lisbon",
-            ),
-            "TP4570": FlightSchedule(
-                flight_number="TP4570",
-                dep_time="2026-02-15T17:00:00",
-                arr_time="2026-02-15T19:00:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="Atlantic/Azores",
-            ),
-            "TP542": FlightSchedule(
-                flight_number="TP542",
-                dep_time="2026-02-15T14:00:00",
-                arr_time="2026-02-15T17:30:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="America/Sao_Paulo",
-            ),
-            "TP1000": FlightSchedule(
-                flight_number="TP1000",
-                dep_time="2026-02-15T11:25:00",
-                arr_time="2026-02-15T15:40:00",
-                dep_timezone="Europe/Lisbon",
-                arr_timezone="America/New_York",
-            ),
-
-            # === United Airlines ===
-            "UA3936": FlightSchedule(
-                flight_number="UA3936",
-                dep_time="2026-03-06T06:00:00",
-                arr_time="2026-03-06T08:21:00",
-                dep_timezone="America/New_York",
-                arr_timezone="America/Chicago",
-            ),
-
-            # === Other airlines ===
-            "FR1926": FlightSchedule(
-                flight_number="FR1926",
-                dep_time="2026-02-15T06:15:00",
-                arr_time="2026-02-15T09:30:00",
-                dep_timezone="Europe/Dublin",
-                arr_timezone="Europe/Lisbon",
-            ),
-            "LH400": FlightSchedule(
-                flight_number="LH400",
-                dep_time="2026-02-15T10:10:00",
-                arr_time="2026-02-15T13:25:00",
-                dep_timezone="Europe/Berlin",
-                arr_timezone="America/New_York",
-            ),
-            "BA500": FlightSchedule(
-                flight_number="BA500",
-                dep_time="2026-02-15T09:00:00",
-                arr_time="2026-02-16T06:30:00",
-                dep_timezone="Europe/London",
-                arr_timezone="Australia/Sydney",
-            ),
-        }
-
-        normalized = flight_number.strip().upper()
-        if normalized in known_flights:
-            return known_flights[normalized]
+        known = _KNOWN_FLIGHTS.get(flight_number.strip().upper())
+        if known is not None:
+            return known
 
         # Fallback: generate plausible schedule from hash
         seed = sum(ord(c) for c in flight_number)
@@ -50,8 +50,21 @@ class FlightAwareClient:
             print(f"[FlightAware] Unexpected error: {e}")
             return None
 
-    @classmethod
-    def _parse_response(cls, flight_number: str, data: dict) -> Optional[FlightInfo]:
+    @staticmethod
+    def _airport_or_none(airport: Optional[dict], gate: Optional[str], terminal: Optional[str]) -> Optional[FlightInfoAirport]:
+        """Build a FlightInfoAirport, or None when AeroAPI gave no usable code or name."""
+        if not airport or not (airport.get("code_iata") or airport.get("code") or airport.get("name")):
+            return None
+        return FlightInfoAirport.model_construct(
+            code=airport.get("code_iata") or airport.get("code"),
+            name=airport.get("name"),
+            city=airport.get("city"),
+            gate=gate,
+            terminal=terminal,
+        )
+
+    @staticmethod
+    def _parse_response(flight_number: str, data: dict) -> Optional[FlightInfo]:
         """
         Parse the AeroAPI /flights/{ident} response.
         The response contains a 'flights' array; we pick the most relevant one.
@@ -61,46 +74,39 @@ class FlightAwareClient:
             print(f"[FlightAware] No flights found for {flight_number}")
             return None
 
-        # Pick the first scheduled/active flight (most relevant)
+        # Pick the first scheduled/active flight (most relevant).
+        # AeroAPI fields are already strings/None, so models are built with
+        # model_construct and skip validation; FastAPI still validates the response.
         flight = flights[0]
+        o = flight.get("origin")
+        d = flight.get("destination")
+
+        origin = FlightAwareClient._airport_or_none(
+            o, flight.get("gate_origin"), flight.get("terminal_origin")
+        )
+        destination = FlightAwareClient._airport_or_none(
+            d, flight.get("gate_destination"), flight.get("terminal_destination")
+        )
+
+        scheduled_departure = flight.get("scheduled_out") or flight.get("scheduled_off")
+        scheduled_arrival = flight.get("scheduled_in") or flight.get("scheduled_on")
+        route_distance = flight.get("route_distance")
 
-        origin = None
-        if flight.get("origin"):
-            o = flight["origin"]
-            origin = FlightInfoAirport(
-                code=o.get("code_iata") or o.get("code"),
-                name=o.get("name"),
-                city=o.get("city"),
-                gate=flight.get("gate_origin"),
-                terminal=flight.get("terminal_origin"),
-            )
-
-        destination = None
-        if flight.get("destination"):
-            d = flight["destination"]
-            destination = FlightInfoAirport(
-                code=d.get("code_iata") or d.get("code"),
-                name=d.get("name"),
-                city=d.get("city"),
-                gate=flight.get("gate_destination"),
-                terminal=flight.get("terminal_destination"),
-            )
-
-        return FlightInfo(
+        return FlightInfo.model_construct(
             flight_number=flight_number,
             operator=flight.get("operator"),
             aircraft_type=flight.get("aircraft_type"),
             status=flight.get("status"),
             origin=origin,
             destination=destination,
-            scheduled_departure=flight.get("scheduled_out") or flight.get("scheduled_off"),
-            scheduled_arrival=flight.get("scheduled_in") or flight.get("scheduled_on"),
+            scheduled_departure=scheduled_departure,
+            scheduled_arrival=scheduled_arrival,
             estimated_departure=flight.get("estimated_out") or flight.get("estimated_off"),
             estimated_arrival=flight.get("estimated_in") or flight.get("estimated_on"),
-            route_distance=str(flight.get("route_distance")) if flight.get("route_distance") else None,
+            route_distance=str(route_distance) if route_distance else None,
             # Schedule compat fields
-            dep_time=flight.get("scheduled_out") or flight.get("scheduled_off"),
-            arr_time=flight.get("scheduled_in") or flight.get("scheduled_on"),
-            dep_timezone=flight["origin"].get("timezone") if flight.get("origin") else None,
-            arr_timezone=flight["destination"].get("timezone") if flight.get("destination") else None,
+            dep_time=scheduled_departure,
+            arr_time=scheduled_arrival,
+            dep_timezone=o.get("timezone") if o else None,
+            arr_timezone=d.get("timezone") if d else None,
         )
@@ -1,10 +1,96 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Optional, Dict
+import logging
+import re
+from html import unescape
+from lxml import etree, html as lxml_html
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List
 from app.database.models import FlightScheduleDB, AirlineDB
+from app.parsers.http_session import make_session
 from app.database.airline_repository import AirlineRepository
 from app.database.flight_schedule_repository import FlightScheduleRepository
 
+logger = logging.getLogger(__name__)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one token of a (possibly multi-valued) class attribute."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled once.  Alternatives are tried in priority order rather than as one
+# XPath union, which would return whichever element comes first in the page.
+_AIRCRAFT_XPATHS = (
+    etree.XPath(f"//span[{_has_class('aircraft-type')}]"),
+    etree.XPath(f"//div[{_has_class('flightPageAircraftText')}]"),
+)
+_AIRLINE_XPATHS = (
+    etree.XPath(f"//div[{_has_class('flightPageAirlineText')}]"),
+    etree.XPath("//a[contains(@href, '/live/fleet/')]"),
+)
+_ROUTE_XPATHS = (etree.XPath(f"//h1[{_has_class('flightPageSummaryAirports')}]"),)
+
+
+def _class_attr(name: str) -> str:
+    """Regex for a double-quoted class attribute containing name as a token."""
+    return r'class="(?:[^"]*\s)?' + name + r'(?:\s[^"]*)?"'
+
+
+def _element_re(tag: str, attr: str) -> "re.Pattern":
+    """Regex for a <tag> opening tag with attr, capturing the element's text if it holds only text."""
+    return re.compile(r'<' + tag + r'\s[^>]*?' + attr + r'[^>]*>(?:([^<]*)</' + tag + r'>)?')
+
+
+# Raw-HTML fast path, in the same priority order as the XPaths.  Each pattern
+# finds the first matching element; one with nested markup captures nothing
+# and is left to the XPath lookups.
+_TITLE_EL_RES = (re.compile(r'<title[^>]*>([^<]*)</title>', re.IGNORECASE),)
+_AIRCRAFT_EL_RES = (
+    _element_re('span', _class_attr('aircraft-type')),
+    _element_re('div', _class_attr('flightPageAircraftText')),
+)
+_AIRLINE_EL_RES = (
+    _element_re('div', _class_attr('flightPageAirlineText')),
+    _element_re('a', r'href="[^"]*/live/fleet/[^"]*"'),
+)
+_ROUTE_EL_RES = (_element_re('h1', _class_attr('flightPageSummaryAirports')),)
+
+# One pass over the page text for any known manufacturer, e.g. "Boeing 737-800"
+_AIRCRAFT_RE = re.compile(r'(?:Boeing|Airbus|Embraer|Bombardier|ATR)\s+[A-Z0-9-]+')
+_ROUTE_RE = re.compile(r'([A-Z]{3,4}).*?to.*?([A-Z]{3,4})')
+
+
+def _first_text(elements) -> Optional[str]:
+    """Stripped text of the first element in document order, like BeautifulSoup's get_text(strip=True)."""
+    if not elements:
+        return None
+    return ''.join(t.strip() for t in elements[0].itertext())
+
+
+def _find_text(xpaths, tree) -> Optional[str]:
+    """Text of the first element matched by the highest-priority XPath that matches anything."""
+    for xpath in xpaths:
+        elements = xpath(tree)
+        if elements:
+            return _first_text(elements)
+    return None
+
+
+def _element_text(patterns, html_text: str) -> Optional[str]:
+    """Unescaped, stripped text of the element found by the highest-priority pattern, or None."""
+    for pattern in patterns:
+        match = pattern.search(html_text)
+        if match:
+            # No capture when the element holds markup: the DOM has to read it
+            return unescape(match.group(1) or '').strip() or None
+    return None
+
+
+# Shared keep-alive session so repeated scrapes reuse the TCP/TLS connection
+_SESSION = make_session(
+    pool_maxsize=20,
+    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+)
+
 class FlightAwareScraper:
     """
     Scrapes FlightAware for flight schedule and aircraft information.
@@ -18,77 +104,99 @@ class FlightAwareScraper:
         Scrape FlightAware for a specific flight number.
         Returns FlightScheduleDB with aircraft type and route info.
         """
+        schedule = FlightAwareScraper._fetch_and_parse(flight_number)
+        if schedule is None:
+            return None
+        
+        try:
+            # Save to database
+            FlightScheduleRepository.create_or_update(schedule)
+        except Exception as e:
+            logger.error("[FlightAwareScraper] Error scraping %s: %s", flight_number, e)
+            return None
+        
+        return schedule
+    
+    @staticmethod
+    def scrape_flights(flight_numbers: List[str], max_workers: int = 16) -> List[FlightScheduleDB]:
+        """
+        Scrape several flights concurrently and save them in one batch.
+        Fetches share the pooled session, so the batch takes roughly one round-trip
+        instead of one per flight. Returns the schedules that were found.
+        """
+        if not flight_numbers:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(flight_numbers))) as pool:
+            results = pool.map(FlightAwareScraper._fetch_and_parse, flight_numbers)
+            schedules = [schedule for schedule in results if schedule is not None]
+        
+        if schedules:
+            try:
+                FlightScheduleRepository.bulk_upsert(schedules)
+            except Exception as e:
+                logger.error("[FlightAwareScraper] Error saving %d scraped flights: %s", len(schedules), e)
+                return []
+        
+        return schedules
+    
+    @staticmethod
+    def _fetch_and_parse(flight_number: str) -> Optional[FlightScheduleDB]:
+        """Fetch and parse one FlightAware page, without saving it."""
         try:
             url = f"{FlightAwareScraper.BASE_URL}/{flight_number}"
-            print(f"[FlightAwareScraper] Fetching {url}...")
+            logger.debug("[FlightAwareScraper] Fetching %s...", url)
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _SESSION.get(url, timeout=10)
             
             if response.status_code != 200:
-                print(f"[FlightAwareScraper] Failed to fetch: HTTP {response.status_code}")
+                logger.warning("[FlightAwareScraper] Failed to fetch: HTTP %s", response.status_code)
                 return None
             
-            print(f"[FlightAwareScraper] Successfully fetched page (length: {len(response.text)} chars)")
+            html_text = response.text
+            logger.debug("[FlightAwareScraper] Successfully fetched page (length: %d chars)", len(html_text))
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[FlightAwareScraper] Page title: %s", _element_text(_TITLE_EL_RES, html_text))
             
-            # DEBUG: Show page title
-            title = soup.find('title')
-            if title:
-                print(f"[FlightAwareScraper] Page title: {title.get_text(strip=True)}")
+            # Fast path: read aircraft, airline and route straight from the raw HTML.
+            # Only build a DOM when one of them isn't a plain-text element.
+            aircraft_type = _element_text(_AIRCRAFT_EL_RES, html_text)
+            airline_name = _element_text(_AIRLINE_EL_RES, html_text)
+            route_text = _element_text(_ROUTE_EL_RES, html_text)
             
-            # Extract aircraft type
-            aircraft_type = None
-            # Look for aircraft type in various possible locations
-            aircraft_span = soup.find('span', {'class': 'aircraft-type'}) or \
-                           soup.find('div', {'class': 'flightPageAircraftText'})
+            if not (aircraft_type and airline_name and route_text):
+                tree = lxml_html.fromstring(response.content)
+                # Look for aircraft type in various possible locations
+                aircraft_type = aircraft_type or _find_text(_AIRCRAFT_XPATHS, tree)
+                airline_name = airline_name or _find_text(_AIRLINE_XPATHS, tree)
+                # FlightAware typically has route in <h1> or breadcrumb
+                route_text = route_text or _find_text(_ROUTE_XPATHS, tree)
             
-            if aircraft_span:
-                aircraft_type = aircraft_span.get_text(strip=True)
-                print(f"[FlightAwareScraper] Found aircraft via element: {aircraft_type}")
+            # Extract aircraft type
+            if aircraft_type:
+                logger.debug("[FlightAwareScraper] Found aircraft via element: %s", aircraft_type)
             else:
-                print(f"[FlightAwareScraper] No aircraft element found, trying text search...")
-                # Try alternative: look for text containing common aircraft names
-                page_text = soup.get_text()
-                for keyword in ['Boeing', 'Airbus', 'Embraer', 'Bombardier', 'ATR']:
-                    if keyword in page_text:
-                        # Extract pattern like "Boeing 737-800"
-                        import re
-                        pattern = f'{keyword}\\s+[A-Z0-9-]+'
-                        match = re.search(pattern, page_text)
-                        if match:
-                            aircraft_type = match.group()
-                            print(f"[FlightAwareScraper] Found aircraft via text search: {aircraft_type}")
-                            break
+                logger.debug("[FlightAwareScraper] No aircraft element found, trying text search...")
+                # Try alternative: look for common aircraft names in the raw HTML.
+                # They appear verbatim in the source, so there is no need to build the page text.
+                # Extract pattern like "Boeing 737-800"
+                match = _AIRCRAFT_RE.search(html_text)
+                if match:
+                    aircraft_type = match.group()
+                    logger.debug("[FlightAwareScraper] Found aircraft via text search: %s", aircraft_type)
             
             if not aircraft_type:
-                print(f"[FlightAwareScraper] No aircraft type found on page")
-            
-            # Extract airline (operator)
-            airline_name = None
-            airline_icao = None
-            
-            airline_elem = soup.find('div', {'class': 'flightPageAirlineText'}) or \
-                          soup.find('a', {'href': lambda x: x and '/live/fleet/' in x})
-            
-            if airline_elem:
-                airline_name = airline_elem.get_text(strip=True)
+                logger.debug("[FlightAwareScraper] No aircraft type found on page")
             
             # Extract route
+            airline_icao = None
             origin = None
             destination = None
             
-            # FlightAware typically has route in <h1> or breadcrumb
-            route_header = soup.find('h1', {'class': 'flightPageSummaryAirports'})
-            if route_header:
-                route_text = route_header.get_text(strip=True)
+            if route_text:
                 # Pattern: "AIRPORT1 to AIRPORT2" or "AIRPORT1 - AIRPORT2"
-                import re
-                route_match = re.search(r'([A-Z]{3,4}).*?to.*?([A-Z]{3,4})', route_text)
+                route_match = _ROUTE_RE.search(route_text)
                 if route_match:
                     origin = route_match.group(1)
                     destination = route_match.group(2)
@@ -107,7 +215,7 @@ class FlightAwareScraper:
             
             if not airline_icao and aircraft_type:
                 # At least we have some data
-                print(f"[FlightAwareScraper] Found aircraft: {aircraft_type}, but no airline ICAO")
+                logger.debug("[FlightAwareScraper] Found aircraft: %s, but no airline ICAO", aircraft_type)
                 # Use flight prefix as fallback
                 airline_icao = flight_prefix or "UNKNOWN"
             
@@ -120,16 +228,12 @@ class FlightAwareScraper:
                     destination_airport=destination
                 )
                 
-                print(f"[FlightAwareScraper] Scraped: {flight_number} -> {aircraft_type} ({origin} to {destination})")
-                
-                # Save to database
-                FlightScheduleRepository.create_or_update(schedule)
-                
+                logger.debug("[FlightAwareScraper] Scraped: %s -> %s (%s to %s)", flight_number, aircraft_type, origin, destination)
                 return schedule
             else:
-                print(f"[FlightAwareScraper] No useful data found for {flight_number}")
+                logger.debug("[FlightAwareScraper] No useful data found for %s", flight_number)
                 return None
                 
         except Exception as e:
-            print(f"[FlightAwareScraper] Error scraping {flight_number}: {e}")
+            logger.error("[FlightAwareScraper] Error scraping %s: %s", flight_number, e)
             return None
@@ -0,0 +1,36 @@
+"""
+Shared HTTP session setup for the scrapers and downloaders.
+Each module keeps one keep-alive session so repeated requests reuse the
+TCP/TLS connection instead of opening a new one per call.
+"""
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def make_session(pool_maxsize: int = 20,
+                 pool_connections: int = 10,
+                 retries: int = 2,
+                 user_agent: Optional[str] = None) -> requests.Session:
+    """
+    Build a requests.Session with a sized connection pool.
+
+    Args:
+        pool_maxsize: Connections kept open per host (match the caller's concurrency)
+        pool_connections: Number of hosts to keep pools for
+        retries: Retries on connection errors, with a short backoff (0 = none)
+        user_agent: User-Agent header sent with every request, if given
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        max_retries=Retry(total=retries, backoff_factor=0.2) if retries else 0,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if user_agent:
+        session.headers.update({'User-Agent': user_agent})
+    return session
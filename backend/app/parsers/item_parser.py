@@ -1,7 +1,10 @@
-import json
+import logging
 import os
 from typing import List
 from app.database.models import ItemDB
+from app.parsers import json_codec
+
+logger = logging.getLogger(__name__)
 
 ITEMS_JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "items.json")
 
@@ -13,31 +16,31 @@ class ItemParser:
     @staticmethod
     def load_items_from_json() -> List[ItemDB]:
         if not os.path.exists(ITEMS_JSON_PATH):
-            print(f"[ItemParser] Warning: {ITEMS_JSON_PATH} not found.")
+            logger.warning("[ItemParser] Warning: %s not found.", ITEMS_JSON_PATH)
             return []
             
         try:
-            with open(ITEMS_JSON_PATH, 'r') as f:
-                data = json.load(f)
-                
-            items = []
-            for entry in data:
-                # Tags are lists in JSON, need to create ItemDB which expects strings (if we strictly follow DB model)
-                # OR we handle the conversion logic here. 
-                # The prompt asks for "public_tags (array of strings)" in Item Structure,
-                # but "Store public_tags as JSON strings" in Database Layer.
-                # ItemDB in models.py uses 'str' for tags as per previous step.
+            data = json_codec.load_file(ITEMS_JSON_PATH)
                 
-                item = ItemDB(
+            # Tags are lists in JSON, but ItemDB stores them as JSON strings
+            # ("Store public_tags as JSON strings" in the Database Layer).
+            # Serialize each tag column in one pass, then build the items.
+            dumps = json_codec.dumps
+            public_tags = [dumps(entry["public_tags"]) for entry in data]
+            hidden_tags = [dumps(entry["hidden_tags"]) for entry in data]
+            
+            items = [
+                ItemDB(
                     id=entry.get("id"),
                     title=entry["title"],
                     text=entry["text"],
                     image=entry["image"],
-                    public_tags=json.dumps(entry["public_tags"]),
-                    hidden_tags=json.dumps(entry["hidden_tags"])
+                    public_tags=pt,
+                    hidden_tags=ht
                 )
-                items.append(item)
+                for entry, pt, ht in zip(data, public_tags, hidden_tags)
+            ]
             return items
         except Exception as e:
-            print(f"[ItemParser] Error loading items: {e}")
+            logger.error("[ItemParser] Error loading items: %s", e)
             return []
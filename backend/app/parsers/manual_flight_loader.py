@@ -1,9 +1,12 @@
-import json
+import logging
 import os
 from typing import List
 from app.database.models import FlightScheduleDB, AirlineDB
 from app.database.airline_repository import AirlineRepository
 from app.database.flight_schedule_repository import FlightScheduleRepository
+from app.parsers import json_codec
+
+logger = logging.getLogger(__name__)
 
 class ManualFlightLoader:
     """Loads manually curated flight and airline data from JSON."""
@@ -17,49 +20,38 @@ class ManualFlightLoader:
         json_path = os.path.join(current_dir, '..', 'data', 'flight_mappings.json')
         
         if not os.path.exists(json_path):
-            print(f"[ManualFlightLoader] No manual mappings file found at {json_path}")
+            logger.warning("[ManualFlightLoader] No manual mappings file found at %s", json_path)
             return
         
-        print(f"[ManualFlightLoader] Loading manual flight mappings from {json_path}...")
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        logger.info("[ManualFlightLoader] Loading manual flight mappings from %s...", json_path)
         
-        # Load airlines first
-        airlines_data = data.get('airlines', [])
-        airlines_loaded = 0
+        data = json_codec.load_file(json_path)
         
-        for airline_dict in airlines_data:
-            airline = AirlineDB(
+        # Load airlines first (the database skips ICAOs it already has)
+        airlines = [
+            AirlineDB(
                 icao=airline_dict['icao'],
                 iata=airline_dict.get('iata'),
                 name=airline_dict['name'],
                 logo_url=None
             )
-            
-            # Check if exists
-            existing = AirlineRepository.get_by_icao(airline.icao)
-            if not existing:
-                AirlineRepository.create_airline(airline)
-                airlines_loaded += 1
-        
-        print(f"[ManualFlightLoader] Loaded {airlines_loaded} airlines")
+            for airline_dict in data.get('airlines', [])
+        ]
+        airlines_loaded = AirlineRepository.bulk_insert_airlines(airlines) if airlines else 0
         
-        # Load flight schedules
-        flights_data = data.get('flights', [])
-        flights_loaded = 0
+        logger.info("[ManualFlightLoader] Loaded %d airlines", airlines_loaded)
         
-        for flight_dict in flights_data:
-            schedule = FlightScheduleDB(
+        # Load flight schedules (create or update)
+        schedules = [
+            FlightScheduleDB(
                 flight_number=flight_dict['flight_number'],
                 airline_icao=flight_dict['airline_icao'],
                 aircraft_type=flight_dict.get('aircraft_type'),
                 origin_airport=flight_dict.get('origin'),
                 destination_airport=flight_dict.get('destination')
             )
-            
-            # Create or update
-            FlightScheduleRepository.create_or_update(schedule)
-            flights_loaded += 1
+            for flight_dict in data.get('flights', [])
+        ]
+        FlightScheduleRepository.bulk_upsert(schedules)
         
-        print(f"[ManualFlightLoader] Loaded {flights_loaded} flight schedules")
+        logger.info("[ManualFlightLoader] Loaded %d flight schedules", len(schedules))
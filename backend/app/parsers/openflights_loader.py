@@ -1,6 +1,108 @@
+import codecs
 import csv
-import requests
-from typing import List
+import logging
+from dataclasses import dataclass, fields
+from typing import Iterator, List
+
+import numpy as np
+
+from app.parsers.http_session import make_session
+
+logger = logging.getLogger(__name__)
+
+# Shared keep-alive session (with retries) for OpenFlights downloads
+_SESSION = make_session(pool_maxsize=20)
+
+@dataclass
+class AirportTable:
+    """
+    Airports stored column-wise: one NumPy array per field instead of one dict per airport.
+    Indexing or iterating yields the same dicts download_and_parse used to return.
+    """
+    name: np.ndarray
+    city: np.ndarray
+    country: np.ndarray
+    iata: np.ndarray
+    icao: np.ndarray
+    latitude: np.ndarray          # float64
+    longitude: np.ndarray         # float64
+    altitude: np.ndarray          # int64, feet
+    timezone_offset: np.ndarray   # float64, hours from UTC
+    dst: np.ndarray
+    timezone_name: np.ndarray
+
+    @classmethod
+    def from_columns(cls, name, city, country, iata, icao, latitude, longitude,
+                     altitude, timezone_offset, dst, timezone_name) -> "AirportTable":
+        """Build a table from per-field sequences of equal length."""
+        return cls(
+            name=np.array(name, dtype=object),
+            city=np.array(city, dtype=object),
+            country=np.array(country, dtype=object),
+            iata=np.array(iata, dtype=object),
+            icao=np.array(icao, dtype=object),
+            latitude=np.asarray(latitude, dtype=np.float64),
+            longitude=np.asarray(longitude, dtype=np.float64),
+            altitude=np.asarray(altitude, dtype=np.int64),
+            timezone_offset=np.asarray(timezone_offset, dtype=np.float64),
+            dst=np.array(dst, dtype=object),
+            timezone_name=np.array(timezone_name, dtype=object),
+        )
+
+    @classmethod
+    def from_records(cls, records: List[dict]) -> "AirportTable":
+        """Build a table from airport dicts."""
+        return cls.from_columns(**{
+            f.name: [r[f.name] for r in records] for f in fields(cls)
+        })
+
+    def __len__(self) -> int:
+        return len(self.iata)
+
+    def __getitem__(self, i: int) -> dict:
+        row = {}
+        for f in fields(self):
+            value = getattr(self, f.name)[i]
+            # Plain Python scalars, since sqlite3 can't bind np.int64
+            row[f.name] = value.item() if isinstance(value, np.generic) else value
+        return row
+
+    def __iter__(self) -> Iterator[dict]:
+        names = [f.name for f in fields(self)]
+        columns = [getattr(self, n).tolist() for n in names]
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+
+# OpenFlights' marker for a missing value
+_NULL = '\\N'
+
+
+def _text_column(rows: List[list], index: int, default: str) -> List[str]:
+    return [default if r[index] == _NULL else r[index] for r in rows]
+
+
+def _numeric_columns(rows: List[list]) -> dict:
+    """
+    Convert lat/lon/altitude/timezone offset for all rows, one NumPy call per column.
+    Raises ValueError if any value is malformed.
+    """
+    return {
+        'latitude': np.array([r[6] for r in rows], dtype=np.float64),
+        'longitude': np.array([r[7] for r in rows], dtype=np.float64),
+        'altitude': np.array(['0' if r[8] == _NULL else r[8] for r in rows], dtype=np.int64),
+        'timezone_offset': np.array(['0' if r[9] == _NULL else r[9] for r in rows], dtype=np.float64),
+    }
+
+
+def _is_numeric_row(row: list) -> bool:
+    try:
+        _numeric_columns([row])
+        return True
+    except ValueError as e:
+        logger.warning("[OpenFlights] Skipping invalid row: %s", e)
+        return False
+
 
 class OpenFlightsLoader:
     """Loads airport data from OpenFlights database."""
@@ -8,61 +110,48 @@ class OpenFlightsLoader:
     AIRPORTS_URL = "https://raw.githubusercontent.com/jpatokal/openflights/master/data/airports.dat"
     
     @staticmethod
-    def download_and_parse() -> List[dict]:
-        """Download and parse OpenFlights airport data."""
-        print("[OpenFlights] Downloading airport data...")
+    def download_and_parse() -> AirportTable:
+        """Download and parse OpenFlights airport data into a columnar AirportTable."""
+        logger.info("[OpenFlights] Downloading airport data...")
         
         try:
-            response = requests.get(OpenFlightsLoader.AIRPORTS_URL, timeout=10)
-            response.raise_for_status()
-            
-            airports = []
-            lines = response.text.strip().split('\n')
-            
-            for line in lines:
-                # OpenFlights format: ID,Name,City,Country,IATA,ICAO,Lat,Lon,Alt,Timezone,DST,Tz
-                parts = line.split(',')
-                if len(parts) < 12:
-                    continue
-                
-                # Clean quotes
-                parts = [p.strip('"') for p in parts]
+            # Stream rows straight from the socket; csv handles quoted commas
+            with _SESSION.get(OpenFlightsLoader.AIRPORTS_URL, stream=True, timeout=10) as response:
+                response.raise_for_status()
+                reader = csv.reader(codecs.iterdecode(response.iter_lines(), 'utf-8'))
                 
-                # Skip if no IATA code
-                iata = parts[4]
-                if not iata or iata == '\\N':
-                    continue
-                
-                try:
-                    airport = {
-                        'name': parts[1],
-                        'city': parts[2] if parts[2] != '\\N' else '',
-                        'country': parts[3],
-                        'iata': iata,
-                        'icao': parts[5] if parts[5] != '\\N' else '',
-                        'latitude': float(parts[6]),
-                        'longitude': float(parts[7]),
-                        'altitude': int(parts[8]) if parts[8] != '\\N' else 0,
-                        'timezone_offset': float(parts[9]) if parts[9] != '\\N' else 0,
-                        'dst': parts[10] if parts[10] != '\\N' else 'U',
-                        'timezone_name': parts[11] if parts[11] != '\\N' else ''
-                    }
-                    airports.append(airport)
-                except (ValueError, IndexError) as e:
-                    print(f"[OpenFlights] Skipping invalid row: {e}")
-                    continue
+                # OpenFlights format: ID,Name,City,Country,IATA,ICAO,Lat,Lon,Alt,Timezone,DST,Tz
+                # Skip short rows and rows without an IATA code
+                rows = [row for row in reader if len(row) >= 12 and row[4] not in ('', _NULL)]
+            
+            try:
+                numeric = _numeric_columns(rows)
+            except ValueError:
+                # Rare: drop the malformed rows one by one, then convert the rest in bulk
+                rows = [row for row in rows if _is_numeric_row(row)]
+                numeric = _numeric_columns(rows)
             
-            print(f"[OpenFlights] Parsed {len(airports)} airports")
+            airports = AirportTable.from_columns(
+                name=[r[1] for r in rows],
+                city=_text_column(rows, 2, ''),
+                country=[r[3] for r in rows],
+                iata=[r[4] for r in rows],
+                icao=_text_column(rows, 5, ''),
+                dst=_text_column(rows, 10, 'U'),
+                timezone_name=_text_column(rows, 11, ''),
+                **numeric,
+            )
+            logger.info("[OpenFlights] Parsed %d airports", len(airports))
             return airports
             
         except Exception as e:
-            print(f"[OpenFlights] Error downloading data: {e}")
-            return []
+            logger.error("[OpenFlights] Error downloading data: %s", e)
+            return AirportTable.from_columns(**{f.name: [] for f in fields(AirportTable)})
     
     @staticmethod
-    def get_sample_airports() -> List[dict]:
+    def get_sample_airports() -> AirportTable:
         """Get a sample of major airports for testing."""
-        return [
+        return AirportTable.from_records([
             {
                 'name': 'Heathrow Airport', 'city': 'London', 'country': 'United Kingdom',
                 'iata': 'LHR', 'icao': 'EGLL', 'latitude': 51.4706, 'longitude': -0.461941,
@@ -88,4 +177,4 @@ class OpenFlightsLoader:
                 'iata': 'HND', 'icao': 'RJTT', 'latitude': 35.552258, 'longitude': 139.779694,
                 'altitude': 35, 'timezone_offset': 9, 'dst': 'U', 'timezone_name': 'Asia/Tokyo'
             }
-        ]
+        ])
@@ -1,9 +1,24 @@
-import json
+import logging
 import os
-from typing import List, Dict, Optional
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from app.parsers import json_codec
+
+logger = logging.getLogger(__name__)
+
+_TIPS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'tips.json')
+# Per-destination sidecar files (data/tips/{IATA}.json), written by auto-scrape
+# so adding one airport doesn't rewrite the whole tips.json aggregate
+_TIPS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'tips')
+# Guards _tips_cache so concurrent cold requests parse tips.json only once
+_TIPS_LOCK = threading.Lock()
+# Categories served by get_tips_by_category; anything else (e.g. "info") is dropped
+_ALLOWED_CATEGORIES = frozenset(("scam", "transport", "culture", "place", "food", "language"))
 
 class TipLoader:
-    """Loads and serves travel tips from tips.json"""
+    """Loads and serves travel tips from tips.json and data/tips/{IATA}.json"""
     
     _tips_cache = None
     
@@ -55,38 +70,73 @@ class TipLoader:
     @staticmethod
     def load_tips() -> Dict:
         """Load tips from JSON file, with caching"""
-        if TipLoader._tips_cache is not None:
-            return TipLoader._tips_cache
+        tips = TipLoader._tips_cache
+        if tips is not None:
+            return tips
         
-        tips_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'tips.json')
+        with _TIPS_LOCK:
+            # Another thread may have loaded it while we waited
+            if TipLoader._tips_cache is not None:
+                return TipLoader._tips_cache
+            
+            try:
+                TipLoader._tips_cache = json_codec.load_file(_TIPS_PATH)
+                logger.info("[TipLoader] Loaded tips database")
+                return TipLoader._tips_cache
+            except FileNotFoundError:
+                logger.warning("[TipLoader] tips.json not found at %s", _TIPS_PATH)
+                # Cached, so sidecar files loaded into it are memoized too
+                TipLoader._tips_cache = {"version": "1.0", "destinations": {}}
+                return TipLoader._tips_cache
+            except Exception as e:
+                logger.error("[TipLoader] Error loading tips: %s", e)
+                return {"version": "1.0", "destinations": {}}
+    
+    @staticmethod
+    def load_destination(airport_code_upper: str) -> List[Dict]:
+        """Tips for one destination, from tips.json or else its sidecar file (memoized in the cache)"""
+        tips_db = TipLoader.load_tips()
+        tips = tips_db.get("destinations", {}).get(airport_code_upper)
+        if tips is not None:
+            return tips
         
         try:
-            with open(tips_path, 'r', encoding='utf-8') as f:
-                TipLoader._tips_cache = json.load(f)
-            print(f"[TipLoader] Loaded tips database")
-            return TipLoader._tips_cache
+            tips = json_codec.load_file(_sidecar_path(airport_code_upper))
         except FileNotFoundError:
-            print(f"[TipLoader] tips.json not found at {tips_path}")
-            return {"version": "1.0", "destinations": {}}
+            return []
         except Exception as e:
-            print(f"[TipLoader] Error loading tips: {e}")
-            return {"version": "1.0", "destinations": {}}
+            logger.error("[TipLoader] Error loading tips for %s: %s", airport_code_upper, e)
+            return []
+        
+        with _TIPS_LOCK:
+            # Skip it if save_tips replaced the database while we read the file
+            if TipLoader._tips_cache is tips_db:
+                tips_db.setdefault("destinations", {})[airport_code_upper] = tips
+        return tips
     
     @staticmethod
-    def save_tips(tips_data: Dict):
-        """Save tips to JSON file and clear cache"""
-        tips_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'tips.json')
+    def save_tips(tips_data, airport_code: Optional[str] = None):
+        """
+        Save tips to JSON and clear cached lookups.
         
-        try:
-            with open(tips_path, 'w', encoding='utf-8') as f:
-                json.dump(tips_data, f, indent=2, ensure_ascii=False)
-            # Clear cache so next load gets fresh data
-            TipLoader._tips_cache = None
-            print(f"[TipLoader] Saved tips database")
-            return True
-        except Exception as e:
-            print(f"[TipLoader] Error saving tips: {e}")
-            return False
+        Args:
+            tips_data: Whole tips database, or the list of tips for airport_code
+            airport_code: If given, write only that destination's sidecar file
+        """
+        if airport_code:
+            return _save_destination(airport_code.upper(), tips_data)
+        
+        with _TIPS_LOCK:
+            try:
+                json_codec.dump_file(tips_data, _TIPS_PATH)
+                # Clear caches so next load gets fresh data
+                TipLoader._tips_cache = None
+                _clear_tip_caches()
+                logger.info("[TipLoader] Saved tips database")
+                return True
+            except Exception as e:
+                logger.error("[TipLoader] Error saving tips: %s", e)
+                return False
     
     @staticmethod
     def auto_scrape_destination(airport_code: str) -> Optional[List[Dict]]:
@@ -103,14 +153,14 @@ class TipLoader:
         
         # Check if we have mapping for this airport
         if airport_code_upper not in TipLoader.AIRPORT_TO_CITY:
-            print(f"[TipLoader] No city mapping for {airport_code_upper}")
+            logger.info("[TipLoader] No city mapping for %s", airport_code_upper)
             return None
         
         city_info = TipLoader.AIRPORT_TO_CITY[airport_code_upper]
         city_name = city_info["city"]
         country_code = city_info["country"]
         
-        print(f"[TipLoader] Auto-scraping {city_name} ({airport_code_upper})...")
+        logger.info("[TipLoader] Auto-scraping %s (%s)...", city_name, airport_code_upper)
         
         try:
             from app.parsers.wikivoyage_scraper import WikiVoyageScraper
@@ -119,31 +169,25 @@ class TipLoader:
             tips = WikiVoyageScraper.scrape_city(city_name, airport_code_upper, country_code)
             
             if tips:
-                # Load existing database
-                tips_db = TipLoader.load_tips()
-                if "destinations" not in tips_db:
-                    tips_db["destinations"] = {}
-                
-                # Add new tips
-                tips_db["destinations"][airport_code_upper] = tips
-                
-                # Save to file
-                TipLoader.save_tips(tips_db)
+                # Save just this destination's file
+                TipLoader.save_tips(tips, airport_code_upper)
                 
-                print(f"[TipLoader] Auto-scraped and saved {len(tips)} tips for {airport_code_upper}")
+                logger.info("[TipLoader] Auto-scraped and saved %d tips for %s", len(tips), airport_code_upper)
                 return tips
             else:
-                print(f"[TipLoader] No tips found for {city_name}")
+                logger.debug("[TipLoader] No tips found for %s", city_name)
                 return None
                 
         except Exception as e:
-            print(f"[TipLoader] Auto-scrape failed for {airport_code_upper}: {e}")
+            logger.error("[TipLoader] Auto-scrape failed for %s: %s", airport_code_upper, e)
             return None
     
     @staticmethod
     def get_tips_for_destination(airport_code: str, auto_scrape: bool = True) -> List[Dict]:
         """
         Get tips for a specific destination airport.
+        Stored tips are memoized per airport until tips are saved; a failed
+        auto-scrape is not cached and is retried on the next call.
         
         Args:
             airport_code: IATA airport code (e.g., "LIS", "BCN")
@@ -152,26 +196,14 @@ class TipLoader:
         Returns:
             List of tip dictionaries
         """
-        tips_db = TipLoader.load_tips()
-        destinations = tips_db.get("destinations", {})
-        
-        airport_code_upper = airport_code.upper()
-        tips = destinations.get(airport_code_upper, [])
-        
-        # If no tips found and auto_scrape enabled, try scraping
-        if not tips and auto_scrape:
-            print(f"[TipLoader] No cached tips for {airport_code_upper}, attempting auto-scrape...")
-            scraped_tips = TipLoader.auto_scrape_destination(airport_code_upper)
-            if scraped_tips:
-                tips = scraped_tips
-        
-        print(f"[TipLoader] Found {len(tips)} tips for {airport_code_upper}")
-        return tips
+        return _get_tips_for_destination(airport_code.upper(), auto_scrape)
     
     @staticmethod
     def get_tips_by_category(airport_code: str, auto_scrape: bool = True) -> Dict[str, List[Dict]]:
         """
         Get tips for a destination, grouped by category.
+        Stored tips are memoized per airport until tips are saved; a failed
+        auto-scrape is not cached and is retried on the next call.
         
         Args:
             airport_code: IATA airport code
@@ -180,23 +212,76 @@ class TipLoader:
         Returns:
             Dict with categories as keys, lists of tips as values
         """
-        tips = TipLoader.get_tips_for_destination(airport_code, auto_scrape=auto_scrape)
-        
-        categorized = {
-            "scam": [],
-            "transport": [],
-            "culture": [],
-            "place": [],
-            "food": [],
-            "language": []
-        }
-        
-        for tip in tips:
-            category = tip.get("category", "info")
-            if category in categorized:
-                categorized[category].append(tip)
-        
-        # Remove empty categories
-        categorized = {k: v for k, v in categorized.items() if v}
-        
-        return categorized
+        return _get_tips_by_category(airport_code.upper(), auto_scrape)
+
+
+def _get_tips_for_destination(airport_code_upper: str, auto_scrape: bool) -> List[Dict]:
+    tips = list(_stored_tips(airport_code_upper))
+    
+    # If no tips found and auto_scrape enabled, try scraping.  Not memoized,
+    # so a failed scrape (network error, empty page) is retried next time.
+    if not tips and auto_scrape:
+        logger.debug("[TipLoader] No cached tips for %s, attempting auto-scrape...", airport_code_upper)
+        scraped_tips = TipLoader.auto_scrape_destination(airport_code_upper)
+        if scraped_tips:
+            tips = scraped_tips
+    
+    logger.debug("[TipLoader] Found %d tips for %s", len(tips), airport_code_upper)
+    return tips
+
+
+def _get_tips_by_category(airport_code_upper: str, auto_scrape: bool) -> Dict[str, List[Dict]]:
+    if _stored_tips(airport_code_upper):
+        categorized = _stored_tips_by_category(airport_code_upper)
+        return {category: list(tips) for category, tips in categorized.items()}
+    return _categorize(_get_tips_for_destination(airport_code_upper, auto_scrape))
+
+
+# Stored tips are memoized as tuples, so callers each get their own list
+@lru_cache(maxsize=256)
+def _stored_tips(airport_code_upper: str) -> Tuple[Dict, ...]:
+    return tuple(TipLoader.load_destination(airport_code_upper))
+
+
+@lru_cache(maxsize=256)
+def _stored_tips_by_category(airport_code_upper: str) -> Dict[str, Tuple[Dict, ...]]:
+    categorized = _categorize(_stored_tips(airport_code_upper))
+    return {category: tuple(tips) for category, tips in categorized.items()}
+
+
+def _categorize(tips) -> Dict[str, List[Dict]]:
+    categorized = defaultdict(list)
+    for tip in tips:
+        category = tip.get("category", "info")
+        if category in _ALLOWED_CATEGORIES:
+            categorized[category].append(tip)
+    
+    # Only categories with at least one tip are present
+    return dict(categorized)
+
+
+def _sidecar_path(airport_code_upper: str) -> str:
+    return os.path.join(_TIPS_DIR, f"{airport_code_upper}.json")
+
+
+def _save_destination(airport_code_upper: str, tips: List[Dict]) -> bool:
+    """Write one destination's sidecar file and patch it into the loaded database."""
+    with _TIPS_LOCK:
+        try:
+            os.makedirs(_TIPS_DIR, exist_ok=True)
+            json_codec.dump_file(tips, _sidecar_path(airport_code_upper))
+            # Keep the loaded database instead of re-reading tips.json
+            if TipLoader._tips_cache is not None:
+                TipLoader._tips_cache.setdefault("destinations", {})[airport_code_upper] = tips
+            _clear_tip_caches()
+            logger.info("[TipLoader] Saved tips for %s", airport_code_upper)
+            return True
+        except Exception as e:
+            logger.error("[TipLoader] Error saving tips for %s: %s", airport_code_upper, e)
+            return False
+
+
+def _clear_tip_caches():
+    """Drop memoized lookups after tips.json changes."""
+    _stored_tips.cache_clear()
+    _stored_tips_by_category.cache_clear()
@@ -1,4 +1,26 @@
-import json
+from app.parsers import json_codec
+
+# The mock data never changes, so serialize it once at import time.
+
+# Mock hourly forecast
+_WEATHER_JSON = json_codec.dumps([
+    {"hour": "10:00", "temp": 20, "condition": "Sunny"},
+    {"hour": "11:00", "temp": 22, "condition": "Cloudy"},
+    {"hour": "12:00", "temp": 19, "condition": "Rain"}
+])
+
+# Mock coordinates
+_PATH_JSON = json_codec.dumps([
+    {"lat": -23.5505, "lon": -46.6333}, # SP
+    {"lat": 40.7128, "lon": -74.0060}   # NY
+])
+
+_COMPLICATIONS_JSON = json_codec.dumps({"message": "Turbulence expected over the Atlantic."})
+
+_FOOD_JSON = json_codec.dumps({
+    "economy": ["Chicken", "Pasta"],
+    "business": ["Steak", "Salmon", "Champagne"]
+})
 
 class TripParser:
     """
@@ -8,32 +30,16 @@ class TripParser:
     
     @staticmethod
     def parse_weather() -> str:
-        # Mock hourly forecast
-        data = [
-            {"hour": "10:00", "temp": 20, "condition": "Sunny"},
-            {"hour": "11:00", "temp": 22, "condition": "Cloudy"},
-            {"hour": "12:00", "temp": 19, "condition": "Rain"}
-        ]
-        return json.dumps(data)
+        return _WEATHER_JSON
 
     @staticmethod
     def parse_path() -> str:
-        # Mock coordinates
-        data = [
-            {"lat": -23.5505, "lon": -46.6333}, # SP
-            {"lat": 40.7128, "lon": -74.0060}   # NY
-        ]
-        return json.dumps(data)
+        return _PATH_JSON
 
     @staticmethod
     def parse_complications() -> str:
-        data = {"message": "Turbulence expected over the Atlantic."}
-        return json.dumps(data)
+        return _COMPLICATIONS_JSON
 
     @staticmethod
     def parse_food() -> str:
-        data = {
-            "economy": ["Chicken", "Pasta"],
-            "business": ["Steak", "Salmon", "Champagne"]
-        }
-        return json.dumps(data)
+        return _FOOD_JSON
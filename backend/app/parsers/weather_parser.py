@@ -1,6 +1,11 @@
+import logging
 from app.models.schemas import Weather
 import random
 
+logger = logging.getLogger(__name__)
+
+_CONDITIONS = ("Sunny", "Cloudy", "Rainy")
+
 class WeatherParser:
     """
     Mock parser for Weather Information.
@@ -8,12 +13,12 @@ class WeatherParser:
     
     @staticmethod
     def parse_weather(location: str) -> Weather:
-        print(f"[PARSER] Fetching weather for: {location}")
+        logger.debug("[PARSER] Fetching weather for: %s", location)
         temp = random.randint(15, 30)
         return Weather(
             location=location,
             temperature_celsius=float(temp),
-            condition=random.choice(["Sunny", "Cloudy", "Rainy"]),
+            condition=random.choice(_CONDITIONS),
             humidity_percent=random.randint(40, 90),
             wind_speed_kmh=random.uniform(5.0, 20.0)
         )
@@ -1,8 +1,114 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+import threading
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import json
 import time
+from app.parsers import json_codec
+from app.parsers.http_session import make_session
+
+# Section IDs to scrape (WikiVoyage uses IDs like "Stay_safe")
+_SECTIONS_TO_SCRAPE = {
+    "Stay_safe": "scam",
+    "Get_around": "transport",
+    "Respect": "culture",
+    "See": "place",
+    "Do": "place",
+    "Eat": "food",
+    "Understand": "culture",
+    "Talk": "language"
+}
+
+# Compiled once so scrape_multiple_cities pays the XPath compilation cost a single time
+# Every section anchor in one document pass, in document order
+_ANCHORS_XPATH = etree.XPath(
+    "//*[" + " or ".join(f"@id='{section_id}'" for section_id in _SECTIONS_TO_SCRAPE) + "]"
+)
+_LIST_ITEMS_XPATH = etree.XPath("./li[position() <= 3]")
+
+# Severity keywords, matched anywhere in the text (so "dangerous" counts as "danger")
+_WARNING_RE = re.compile(r'scam|theft|pickpocket', re.IGNORECASE)
+_CRITICAL_RE = re.compile(r'danger|avoid|unsafe', re.IGNORECASE)
+
+
+def _parse_until_content_end(response):
+    """
+    Parse the page incrementally while it downloads, stopping as soon as the
+    main content div (mw-content-text) closes so the navigation and footer
+    tail is neither downloaded nor parsed.
+    
+    Returns (root element, whether the content div was found).
+    """
+    # MediaWiki always serves UTF-8. Comments, PIs and whitespace-only text are never
+    # read, and anchors are found by XPath, so skip building them and the ID table.
+    parser = etree.HTMLPullParser(
+        events=('start', 'end'), tag='div', encoding='utf-8',
+        remove_comments=True, remove_pis=True, remove_blank_text=True,
+        collect_ids=False, no_network=True,
+    )
+    content = None
+    try:
+        for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_BYTES):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if content is None and element.get('id') == 'mw-content-text':
+                        content = element
+                elif element is content:
+                    return parser.close(), True
+        return parser.close(), content is not None
+    finally:
+        response.close()
+
+
+def _stripped_text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return ''.join(t.strip() for t in element.itertext())
+
+
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+# At most this many concurrent requests to WikiVoyage, each followed by a short pause
+_MAX_CONCURRENT_FETCHES = 4
+_POLITE_DELAY_SECONDS = 0.25
+
+# Shared keep-alive session; the pool is sized for the concurrent city fetches
+_SESSION = make_session(
+    pool_maxsize=_MAX_CONCURRENT_FETCHES, pool_connections=1, retries=0,
+    user_agent='Mozilla/5.0 BugsByte Travel Companion (Educational Project)',
+)
+
+# On-disk cache of {url: entry} so re-runs can revalidate with ETag / Last-Modified
+# and reuse the parsed tips on 304. Missing pages (404) are remembered for a day.
+_HTTP_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'wikivoyage_cache.json')
+_HTTP_CACHE_LOCK = threading.Lock()
+_NOT_FOUND_TTL_SECONDS = 24 * 60 * 60
+_http_cache = None
+
+
+def _get_cached_page(url: str) -> Optional[Dict]:
+    global _http_cache
+    with _HTTP_CACHE_LOCK:
+        if _http_cache is None:
+            try:
+                _http_cache = json_codec.load_file(_HTTP_CACHE_PATH)
+            except FileNotFoundError:
+                _http_cache = {}
+            except Exception as e:
+                print(f"[WikiVoyageScraper] Ignoring unreadable HTTP cache: {e}")
+                _http_cache = {}
+        return _http_cache.get(url)
+
+
+def _cache_page(url: str, entry: Dict):
+    with _HTTP_CACHE_LOCK:
+        _http_cache[url] = entry
+        try:
+            json_codec.dump_file(_http_cache, _HTTP_CACHE_PATH)
+        except Exception as e:
+            print(f"[WikiVoyageScraper] Could not save HTTP cache: {e}")
 
 class WikiVoyageScraper:
     """
@@ -41,67 +147,77 @@ class WikiVoyageScraper:
         print(f"[WikiVoyageScraper] Fetching {url}...")
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 BugsByte Travel Companion (Educational Project)'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
+            cached = _get_cached_page(url)
+            headers = {}
+            if cached and cached["status"] == 404:
+                if time.time() - cached["fetched_at"] < _NOT_FOUND_TTL_SECONDS:
+                    print(f"[WikiVoyageScraper] Skipping {city_name}: cached HTTP 404")
+                    return []
+            elif cached:
+                if cached.get("etag"):
+                    headers['If-None-Match'] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers['If-Modified-Since'] = cached["last_modified"]
+            
+            response = _SESSION.get(url, headers=headers, timeout=10, stream=True)
+            
+            if response.status_code == 304 and headers:
+                response.close()
+                print(f"[WikiVoyageScraper] {city_name} not modified, reusing cached tips")
+                return [
+                    {**tip, "location_code": airport_code, "country_code": country_code}
+                    for tip in cached["tips"]
+                ]
             
             if response.status_code != 200:
+                response.close()
                 print(f"[WikiVoyageScraper] Failed: HTTP {response.status_code}")
+                if response.status_code == 404:
+                    _cache_page(url, {"status": 404, "fetched_at": time.time()})
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            tree, has_content = _parse_until_content_end(response)
             tips = []
             
             # Find main content
-            content_div = soup.find('div', {'id': 'mw-content-text'})
-            if not content_div:
+            if not has_content:
                 print(f"[WikiVoyageScraper] No content found for {city_name}")
                 return []
             
-            # Section IDs to scrape (WikiVoyage uses IDs like "Stay_safe")
-            sections_to_scrape = {
-                "Stay_safe": "scam",
-                "Get_around": "transport",
-                "Respect": "culture",
-                "See": "place",
-                "Do": "place",
-                "Eat": "food",
-                "Understand": "culture",
-                "Talk": "language"
-            }
+            # First anchor for each section ID
+            anchors = {}
+            for element in _ANCHORS_XPATH(tree):
+                anchors.setdefault(element.get('id'), element)
             
-            for section_id, category in sections_to_scrape.items():
-                section_anchor = soup.find(id=section_id)
-                if not section_anchor:
+            for section_id, category in _SECTIONS_TO_SCRAPE.items():
+                section_anchor = anchors.get(section_id)
+                if section_anchor is None:
                     continue
                 
-                section_name = section_anchor.get_text(strip=True)
+                section_name = _stripped_text(section_anchor)
                 print(f"[WikiVoyageScraper] Processing section: {section_name} → {category}")
                 
                 # Get the parent div and then find sibling content
-                parent = section_anchor.parent
-                if not parent:
+                parent = section_anchor.getparent()
+                if parent is None:
                     continue
                 
                 # Collect content until next section
                 content_parts = []
-                current = parent.find_next_sibling()
                 
-                while current and current.name not in ['section'] and len(content_parts) < 7:
-                    if current.name == 'p':
-                        text = current.get_text(strip=True)
+                for current in parent.itersiblings(tag=etree.Element):
+                    if current.tag == 'section' or len(content_parts) >= 7:
+                        break
+                    if current.tag == 'p':
+                        text = _stripped_text(current)
                         if text and len(text) > 30:  # Ignore very short paragraphs
                             content_parts.append(text)
-                    elif current.name == 'ul':
+                    elif current.tag == 'ul':
                         # Extract list items
-                        items = current.find_all('li', recursive=False)
-                        for item in items[:3]:  # Limit list items
-                            text = item.get_text(strip=True)
+                        for item in _LIST_ITEMS_XPATH(current):  # Limit list items
+                            text = _stripped_text(item)
                             if text and len(text) > 20:
                                 content_parts.append(f"• {text}")
-                    
-                    current = current.find_next_sibling()
                 
                 # Create tips from content
                 for i, content_text in enumerate(content_parts[:5]):  # Limit to 5 tips per section
@@ -109,12 +225,12 @@ class WikiVoyageScraper:
                     content_text = content_text.replace('[edit]', '').strip()
                     
                     # Determine severity
-                    severity = "info"
-                    content_lower = content_text.lower()
-                    if category == "scam" or "scam" in content_lower or "theft" in content_lower or "pickpocket" in content_lower:
-                        severity = "warning"
-                    if "danger" in content_lower or "avoid" in content_lower or "unsafe" in content_lower:
+                    if _CRITICAL_RE.search(content_text):
                         severity = "critical"
+                    elif category == "scam" or _WARNING_RE.search(content_text):
+                        severity = "warning"
+                    else:
+                        severity = "info"
                     
                     # Create a more specific title for the first tip in each section
                     if i == 0:
@@ -135,6 +251,16 @@ class WikiVoyageScraper:
                     tips.append(tip)
             
             print(f"[WikiVoyageScraper] Extracted {len(tips)} tips for {city_name}")
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                _cache_page(url, {
+                    "status": 200,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "tips": tips,
+                })
             return tips
             
         except Exception as e:
@@ -142,29 +268,30 @@ class WikiVoyageScraper:
             return []
     
     @staticmethod
-    def scrape_multiple_cities(city_mapping: Dict[str, Dict]) -> Dict:
+    def scrape_multiple_cities(city_mapping: Dict[str, Dict],
+                               max_workers: int = _MAX_CONCURRENT_FETCHES) -> Dict:
         """
-        Scrape multiple cities and return aggregated tips.
+        Scrape multiple cities concurrently and return aggregated tips.
         
         Args:
             city_mapping: Dict like {"LIS": {"city": "Lisbon", "country": "PT"}}
+            max_workers: Maximum number of cities fetched at the same time
         
         Returns:
-            Dict with all tips organized by airport code
+            Dict with all tips organized by airport code, in city_mapping order
         """
-        all_tips = {}
+        if not city_mapping:
+            return {}
         
-        for airport_code, info in city_mapping.items():
-            city_name = info["city"]
-            country_code = info["country"]
-            
-            tips = WikiVoyageScraper.scrape_city(city_name, airport_code, country_code)
-            all_tips[airport_code] = tips
-            
+        def scrape(item):
+            airport_code, info = item
+            tips = WikiVoyageScraper.scrape_city(info["city"], airport_code, info["country"])
             # Be polite to WikiVoyage servers
-            time.sleep(1)
+            time.sleep(_POLITE_DELAY_SECONDS)
+            return airport_code, tips
         
-        return all_tips
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(city_mapping))) as pool:
+            return dict(pool.map(scrape, city_mapping.items()))
     
     @staticmethod
     def save_tips_to_json(tips_data: Dict, output_path: str):
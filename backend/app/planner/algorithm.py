@@ -10,16 +10,22 @@ Contains all pure-computation functions:
   - Time-budget validation
   - Trip-segment generation
   - Hotel proximity
+  - Per-plan distance cache
+  - Column (SoA) place table for scoring
 """
 
 from __future__ import annotations
 
 import math
 import random
+from dataclasses import dataclass, field
 from typing import Sequence
 
+import numpy as np
+
+from app.jit import HAVE_NUMBA as _HAVE_NUMBA, njit
 from app.planner.models import (
-    Place, TripSegment, TransportMode,
+    Place, TripSegment, TransportMode, tags_to_mask,
 )
 
 
@@ -35,6 +41,8 @@ DINNER_WINDOW = (19 * 60, 20 * 60 + 30)   # not used for insertion (day may end
 RESTAURANT_DURATION = 60             # time allocated for a meal
 DAY_START_HOUR = 9                   # assume tours start at 09:00
 
+_WALK_MINUTES_PER_METER = 60 / (WALK_SPEED_KM_H * 1_000)
+
 
 # ─── HAVERSINE ───────────────────────────────────────────────────────────────
 
@@ -57,29 +65,116 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return EARTH_RADIUS_METERS * c
 
 
+def haversine_places(a: Place, b: Place) -> float:
+    """
+    Haversine between two places from their cached radians and cos(lat).
+    Same operations as haversine(), so the result is identical.
+    """
+    dlat = b.lat_r - a.lat_r
+    dlon = b.lon_r - a.lon_r
+
+    h = (math.sin(dlat / 2) ** 2
+         + a.cos_lat * b.cos_lat * math.sin(dlon / 2) ** 2)
+    c = 2 * math.atan2(math.sqrt(h), math.sqrt(1 - h))
+
+    return EARTH_RADIUS_METERS * c
+
+
+# Native-code twin of haversine, callable from other @njit kernels.  Eager
+# signatures here and on the kernels compile (or load from cache) at import,
+# so the first plan request doesn't pay for JIT compilation.
+_haversine_jit = njit("float64(float64, float64, float64, float64)", cache=True)(haversine)
+
+
+def haversine_vec(
+    lat: float | np.ndarray,
+    lon: float | np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorised Haversine: distances in **metres** from (lat, lon) to every
+    point in (lats, lons).  All arguments broadcast like NumPy ufuncs.
+    """
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    lats_r, lons_r = np.radians(lats), np.radians(lons)
+
+    a = (np.sin((lats_r - lat_r) / 2) ** 2
+         + np.cos(lat_r) * np.cos(lats_r) * np.sin((lons_r - lon_r) / 2) ** 2)
+    # Clip guards against rounding pushing a just past 1 for antipodal points.
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _coordinates(places: Sequence[Place]) -> tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude columns of *places* as float64 arrays."""
+    n = len(places)
+    lats = np.fromiter((p.latitude for p in places), dtype=np.float64, count=n)
+    lons = np.fromiter((p.longitude for p in places), dtype=np.float64, count=n)
+    return lats, lons
+
+
 def walk_time_minutes(distance_meters: float) -> float:
     """Estimated walking time in minutes for a given distance."""
-    return (distance_meters / 1_000) / WALK_SPEED_KM_H * 60
+    return distance_meters * _WALK_MINUTES_PER_METER
 
 
 # ─── DISTANCE MATRIX ────────────────────────────────────────────────────────
 
-def compute_distance_matrix(places: Sequence[Place]) -> list[list[float]]:
+def compute_distance_matrix(places: Sequence[Place]) -> np.ndarray:
     """
     Return NxN matrix where entry [i][j] is the Haversine distance in metres
     between places[i] and places[j].
+
+    Built in one broadcast over all pairs; ``m[i][j]`` indexing still works.
     """
-    n = len(places)
-    matrix: list[list[float]] = [[0.0] * n for _ in range(n)]
-    for i in range(n):
-        for j in range(i + 1, n):
-            d = haversine(
-                places[i].latitude, places[i].longitude,
-                places[j].latitude, places[j].longitude,
-            )
-            matrix[i][j] = d
-            matrix[j][i] = d
-    return matrix
+    lats, lons = _coordinates(places)
+    return haversine_vec(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+@dataclass
+class DistanceCache:
+    """
+    Pairwise distances for a fixed set of places, built once per plan so the
+    routing, insertion and budgeting steps index a matrix instead of
+    recomputing Haversine for the same pairs.
+    """
+    place_ids: np.ndarray
+    matrix: np.ndarray
+    index: dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, places: Sequence[Place]) -> DistanceCache:
+        unique = list({p.id: p for p in places}.values())
+        return cls(
+            place_ids=np.fromiter((p.id for p in unique), dtype=np.int64, count=len(unique)),
+            matrix=compute_distance_matrix(unique),
+            index={p.id: i for i, p in enumerate(unique)},
+        )
+
+    def distance(self, a: Place, b: Place) -> float:
+        """Distance in metres between *a* and *b*; falls back to Haversine for unknown places."""
+        i, j = self.index.get(a.id), self.index.get(b.id)
+        if i is None or j is None:
+            return haversine_places(a, b)
+        return float(self.matrix[i, j])
+
+
+def _distance(a: Place, b: Place, cache: DistanceCache | None) -> float:
+    if cache is not None:
+        return cache.distance(a, b)
+    return haversine_places(a, b)
+
+
+def _leg_distances(ordered_places: Sequence[Place], cache: DistanceCache | None) -> list[float]:
+    """Distance of each consecutive hop along *ordered_places*, in one array operation."""
+    if len(ordered_places) < 2:
+        return []
+    if cache is not None and all(p.id in cache.index for p in ordered_places):
+        idx = np.fromiter((cache.index[p.id] for p in ordered_places), dtype=np.int64,
+                          count=len(ordered_places))
+        return cache.matrix[idx[:-1], idx[1:]].tolist()
+    lats, lons = _coordinates(ordered_places)
+    return haversine_vec(lats[:-1], lons[:-1], lats[1:], lons[1:]).tolist()
 
 
 # ─── SCORING ─────────────────────────────────────────────────────────────────
@@ -91,6 +186,51 @@ W_DIV = 0.15        # type-diversity bonus
 W_DIST = 0.15       # geographic centrality bonus
 
 
+@dataclass
+class PlaceTable:
+    """
+    Column-oriented (structure-of-arrays) view of a list of places, so the
+    scoring maths runs as NumPy array operations instead of attribute reads.
+    """
+    places: list[Place]
+    lat: np.ndarray
+    lon: np.ndarray
+    pop: np.ndarray
+    type_idx: np.ndarray       # index into the distinct types, in first-seen order
+    tag_bits: list[int]        # Place.tag_mask; the vocabulary is wider than 64 bits
+    # Derived trig columns, computed once since places never move.
+    lat_r: np.ndarray = field(init=False, repr=False)
+    lon_r: np.ndarray = field(init=False, repr=False)
+    cos_lat: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.lat_r = np.radians(self.lat)
+        self.lon_r = np.radians(self.lon)
+        self.cos_lat = np.cos(self.lat_r)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+
+def build_place_table(places: Sequence[Place]) -> PlaceTable:
+    """Pack *places* into a PlaceTable."""
+    places = list(places)
+    n = len(places)
+    lats, lons = _coordinates(places)
+    type_ids: dict[str, int] = {}
+    return PlaceTable(
+        places=places,
+        lat=lats,
+        lon=lons,
+        pop=np.fromiter((p.popularity for p in places), dtype=np.float64, count=n),
+        type_idx=np.fromiter(
+            (type_ids.setdefault(p.type, len(type_ids)) for p in places),
+            dtype=np.int64, count=n,
+        ),
+        tag_bits=[p.tag_mask for p in places],
+    )
+
+
 def score_places(
     places: list[Place],
     target_tags: list[str],
@@ -111,86 +251,129 @@ def score_places(
     if not places:
         return []
 
+    table = build_place_table(places)
     tag_set = set(t.lower() for t in target_tags)
 
     # Pre-compute centroid of candidates (if not provided).
     if centre_lat is None or centre_lon is None:
-        centre_lat = sum(p.latitude for p in places) / len(places)
-        centre_lon = sum(p.longitude for p in places) / len(places)
-
-    # Maximum distance from centroid (for normalisation).
-    max_dist = max(
-        haversine(p.latitude, p.longitude, centre_lat, centre_lon)
-        for p in places
-    ) or 1.0
-
-    # Count type occurrences for diversity scoring.
-    type_counts: dict[str, int] = {}
-    for p in places:
-        type_counts[p.type] = type_counts.get(p.type, 0) + 1
-    max_type_count = max(type_counts.values()) if type_counts else 1
-
-    scored: list[tuple[Place, float]] = []
-    for p in places:
-        # 1. Tag match (0–1)
-        place_tags = set(t.lower() for t in p.tags)
-        tag_score = len(tag_set & place_tags) / len(tag_set) if tag_set else 0.0
-
-        # 2. Popularity (0–1)
-        pop_score = p.popularity
+        centre_lat = sum(table.lat.tolist()) / len(table)
+        centre_lon = sum(table.lon.tolist()) / len(table)
+
+    # 1. Tag match (0–1) — overlap is a popcount of the AND of two tag masks
+    if tag_set:
+        target_mask = tags_to_mask(tag_set)
+        tag_score = np.fromiter(
+            ((bits & target_mask).bit_count() for bits in table.tag_bits),
+            dtype=np.float64, count=len(table),
+        ) / len(tag_set)
+    else:
+        tag_score = np.zeros(len(table))
+
+    # 2. Popularity (0–1)
+    pop_score = table.pop
+
+    # 3. Diversity — rarer types score higher
+    type_counts = np.bincount(table.type_idx)
+    div_score = 1.0 - type_counts[table.type_idx] / type_counts.max()
+
+    # 4. Distance — closer to centroid is better
+    centre_dists = haversine_vec(centre_lat, centre_lon, table.lat, table.lon)
+    max_dist = centre_dists.max() or 1.0
+    dist_score = 1.0 - centre_dists / max_dist
+
+    totals = (W_TAG * tag_score
+              + W_POP * pop_score
+              + W_DIV * div_score
+              + W_DIST * dist_score)
+
+    # Stable sort on the negated scores keeps ties in input order, like list.sort(reverse=True).
+    order = np.argsort(-totals, kind="stable")
+    totals_list = totals.tolist()
+    return [(table.places[i], totals_list[i]) for i in order.tolist()]
 
-        # 3. Diversity — rarer types score higher
-        div_score = 1.0 - (type_counts[p.type] / max_type_count)
 
-        # 4. Distance — closer to centroid is better
-        dist = haversine(p.latitude, p.longitude, centre_lat, centre_lon)
-        dist_score = 1.0 - (dist / max_dist)
-
-        total = (W_TAG * tag_score
-                 + W_POP * pop_score
-                 + W_DIV * div_score
-                 + W_DIST * dist_score)
-        scored.append((p, total))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return scored
+# ─── K-MEANS GEOGRAPHIC CLUSTERING ──────────────────────────────────────────
 
+@njit("int64[:](float64[:], float64[:], float64[:], float64[:])", cache=True)
+def _assign_clusters_jit(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    clats: np.ndarray,
+    clons: np.ndarray,
+) -> np.ndarray:
+    """Index of the nearest centroid for every point (first one wins on ties)."""
+    labels = np.zeros(lats.shape[0], dtype=np.int64)
+    for i in range(lats.shape[0]):
+        best_dist = np.inf
+        for ci in range(clats.shape[0]):
+            d = _haversine_jit(lats[i], lons[i], clats[ci], clons[ci])
+            if d < best_dist:
+                best_dist = d
+                labels[i] = ci
+    return labels
+
+
+def _assign_clusters(table: PlaceTable, centroids: np.ndarray) -> np.ndarray:
+    """
+    Label each place with its nearest centroid (a ``(K, 2)`` lat/lon array).
 
-# ─── K-MEANS GEOGRAPHIC CLUSTERING ──────────────────────────────────────────
+    Uses the JIT kernel when Numba is installed.  Otherwise takes one argmin
+    over the ``(N, K)`` Haversine "a" term — distance grows monotonically
+    with it, so the arcsin/sqrt are skipped — reusing the table's trig columns.
+    """
+    clats = np.ascontiguousarray(centroids[:, 0])
+    clons = np.ascontiguousarray(centroids[:, 1])
+    if _HAVE_NUMBA:
+        return _assign_clusters_jit(table.lat, table.lon, clats, clons)
 
-def _assign_clusters(
-    places: list[Place],
-    centroids: list[tuple[float, float]],
-) -> list[list[Place]]:
-    """Assign each place to the nearest centroid."""
-    k = len(centroids)
-    clusters: list[list[Place]] = [[] for _ in range(k)]
-    for p in places:
-        best_idx = 0
-        best_dist = float("inf")
-        for ci, (clat, clon) in enumerate(centroids):
-            d = haversine(p.latitude, p.longitude, clat, clon)
-            best_dist_cmp = d
-            if best_dist_cmp < best_dist:
-                best_dist = best_dist_cmp
-                best_idx = ci
-        clusters[best_idx].append(p)
-    return clusters
+    clats_r, clons_r = np.radians(clats), np.radians(clons)
+    a = np.sin((clats_r[None, :] - table.lat_r[:, None]) / 2) ** 2
+    a += (np.einsum('i,j->ij', table.cos_lat, np.cos(clats_r))
+          * np.sin((clons_r[None, :] - table.lon_r[:, None]) / 2) ** 2)
+    return a.argmin(axis=1)
 
 
 def _recompute_centroids(
-    clusters: list[list[Place]],
-) -> list[tuple[float, float]]:
-    """Mean latitude / longitude per cluster."""
-    centroids: list[tuple[float, float]] = []
-    for cluster in clusters:
-        if not cluster:
-            centroids.append((0.0, 0.0))
+    lats: np.ndarray,
+    lons: np.ndarray,
+    labels: np.ndarray,
+    k: int,
+) -> np.ndarray:
+    """Mean latitude / longitude per cluster; (0, 0) for an empty cluster."""
+    counts = np.zeros(k)
+    sums = np.zeros((k, 2))
+    np.add.at(counts, labels, 1)
+    np.add.at(sums[:, 0], labels, lats)
+    np.add.at(sums[:, 1], labels, lons)
+    occupied = counts > 0
+    sums[occupied] /= counts[occupied, None]
+    return sums
+
+
+def _kmeans_plus_plus(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    k: int,
+    rng: random.Random,
+) -> np.ndarray:
+    """
+    k-means++ seeding: each next centroid is a point drawn with probability
+    proportional to its squared distance from the nearest centroid so far.
+    Spread-out seeds let Lloyd's iterations converge in a handful of passes.
+    """
+    n = len(lats)
+    chosen = [rng.randrange(n)]
+    nearest = haversine_vec(lats[chosen[0]], lons[chosen[0]], lats, lons)
+    while len(chosen) < k:
+        weights = (nearest ** 2).tolist()
+        if sum(weights) > 0:
+            idx = rng.choices(range(n), weights=weights)[0]
         else:
-            lat = sum(p.latitude for p in cluster) / len(cluster)
-            lon = sum(p.longitude for p in cluster) / len(cluster)
-            centroids.append((lat, lon))
-    return centroids
+            # Every point sits on a centroid already — pick any unused one.
+            idx = rng.choice([i for i in range(n) if i not in chosen])
+        chosen.append(idx)
+        nearest = np.minimum(nearest, haversine_vec(lats[idx], lons[idx], lats, lons))
+    return np.column_stack([lats[chosen], lons[chosen]])
 
 
 def cluster_into_days(
@@ -201,7 +384,7 @@ def cluster_into_days(
 ) -> list[list[Place]]:
     """
     Split *places* into *n_days* geographically coherent groups using a
-    simple K-means algorithm on (latitude, longitude).
+    K-means algorithm (k-means++ seeding) on (latitude, longitude).
 
     Returns a list of n_days lists of Place objects.
     Guarantees every cluster is non-empty by redistributing from the largest
@@ -214,65 +397,101 @@ def cluster_into_days(
             clusters[i % n_days].append(p)
         return clusters
 
+    table = build_place_table(places)
+    lats, lons = table.lat, table.lon
     rng = random.Random(seed)
-    # Initialise centroids with K random places.
-    init_places = rng.sample(places, k=min(n_days, len(places)))
-    centroids = [(p.latitude, p.longitude) for p in init_places]
+    centroids = _kmeans_plus_plus(lats, lons, n_days, rng)
 
     for _ in range(max_iterations):
-        clusters = _assign_clusters(places, centroids)
+        labels = _assign_clusters(table, centroids)
 
-        # Fix empty clusters by stealing from the largest cluster.
+        # Fix empty clusters (rare with k-means++ seeding) by moving the last
+        # member of the largest cluster.
+        counts = np.bincount(labels, minlength=n_days)
         for ci in range(n_days):
-            if not clusters[ci]:
-                largest_idx = max(range(n_days), key=lambda x: len(clusters[x]))
-                if len(clusters[largest_idx]) > 1:
-                    stolen = clusters[largest_idx].pop()
-                    clusters[ci].append(stolen)
-
-        new_centroids = _recompute_centroids(clusters)
-        if new_centroids == centroids:
+            if counts[ci] == 0:
+                largest_idx = int(counts.argmax())
+                if counts[largest_idx] > 1:
+                    stolen = np.flatnonzero(labels == largest_idx)[-1]
+                    labels[stolen] = ci
+                    counts[largest_idx] -= 1
+                    counts[ci] += 1
+
+        new_centroids = _recompute_centroids(lats, lons, labels, n_days)
+        if np.max(np.abs(new_centroids - centroids)) < 1e-6:
             break  # Converged
         centroids = new_centroids
 
+    clusters = [[] for _ in range(n_days)]
+    for p, label in zip(places, labels.tolist()):
+        clusters[label].append(p)
     return clusters
 
 
 # ─── NEAREST-NEIGHBOUR ROUTE OPTIMISATION ────────────────────────────────────
 
-def optimize_day_route(places: list[Place]) -> list[Place]:
+def _two_opt(order: list[int], dist: list[list[float]]) -> list[int]:
+    """
+    Improve an open path with 2-opt: reverse any stretch ``order[i..j]`` that
+    shortens the walk, until no reversal helps.  The first stop stays fixed.
+    """
+    n = len(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                before = dist[order[i - 1]][order[i]]
+                after = dist[order[i - 1]][order[j]]
+                if j + 1 < n:
+                    before += dist[order[j]][order[j + 1]]
+                    after += dist[order[i]][order[j + 1]]
+                if after < before - 1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    improved = True
+    return order
+
+
+def optimize_day_route(
+    places: list[Place],
+    *,
+    cache: DistanceCache | None = None,
+) -> list[Place]:
     """
     Order *places* using a nearest-neighbour heuristic starting from the
     place closest to the geographic centroid of the cluster, then greedily
-    picking the nearest unvisited place.
+    picking the nearest unvisited place.  A 2-opt pass then removes any
+    crossings the greedy walk left behind.
 
     This gives a reasonable walk-minimising order without full TSP cost.
     """
     if len(places) <= 1:
         return list(places)
 
+    if cache is not None and all(p.id in cache.index for p in places):
+        idx = [cache.index[p.id] for p in places]
+        dist = cache.matrix[np.ix_(idx, idx)]
+    else:
+        dist = compute_distance_matrix(places)
+
     # Start from the place nearest the centroid.
+    lats, lons = _coordinates(places)
     clat = sum(p.latitude for p in places) / len(places)
     clon = sum(p.longitude for p in places) / len(places)
-    start = min(places, key=lambda p: haversine(p.latitude, p.longitude, clat, clon))
-
-    ordered = [start]
-    remaining = set(p.id for p in places) - {start.id}
-    id_to_place = {p.id: p for p in places}
-
-    while remaining:
-        last = ordered[-1]
-        nearest_id = min(
-            remaining,
-            key=lambda pid: haversine(
-                last.latitude, last.longitude,
-                id_to_place[pid].latitude, id_to_place[pid].longitude,
-            ),
-        )
-        ordered.append(id_to_place[nearest_id])
-        remaining.remove(nearest_id)
+    current = int(np.argmin(haversine_vec(clat, clon, lats, lons)))
 
-    return ordered
+    # Visited places are struck out as whole columns of one working copy,
+    # so each step is a single row argmin.
+    remaining = dist.copy()
+    remaining[:, current] = np.inf
+    order = [current]
+
+    for _ in range(len(places) - 1):
+        current = int(remaining[current].argmin())
+        order.append(current)
+        remaining[:, current] = np.inf
+
+    return [places[i] for i in _two_opt(order, dist.tolist())]
 
 
 # ─── RESTAURANT INSERTION ────────────────────────────────────────────────────
@@ -282,6 +501,7 @@ def insert_restaurants(
     all_restaurants: list[Place],
     *,
     already_used_ids: set[int] | None = None,
+    cache: DistanceCache | None = None,
 ) -> list[Place]:
     """
     Insert a restaurant around lunchtime into *day_places*.
@@ -302,105 +522,129 @@ def insert_restaurants(
     used_ids = already_used_ids or set()
     result = list(day_places)
 
+    # The itinerary only changes on insertion, so the candidates are fixed up front.
+    current_ids = {p.id for p in result}
+    candidates = [
+        r for r in all_restaurants
+        if r.id not in used_ids and r.id not in current_ids
+    ]
+    if not candidates:
+        return result
+
     # Accumulate time to find the lunch-insertion point.
     elapsed = 0.0  # minutes from DAY_START_HOUR (09:00)
-    lunch_inserted = False
 
     for idx in range(len(result)):
         elapsed += result[idx].visit_duration_minutes
         if idx > 0:
-            d = haversine(
-                result[idx - 1].latitude, result[idx - 1].longitude,
-                result[idx].latitude, result[idx].longitude,
-            )
+            d = _distance(result[idx - 1], result[idx], cache)
             elapsed += walk_time_minutes(d)
 
         # Lunch window: 180–270 minutes from 09:00 (i.e. 12:00–13:30)
-        if not lunch_inserted and 180 <= elapsed <= 330:
+        if 180 <= elapsed <= 330:
             # Find nearest restaurant to current place.
             current = result[idx]
-            candidates = [
-                r for r in all_restaurants
-                if r.id not in used_ids and r.id not in {p.id for p in result}
-            ]
-            if candidates:
-                nearest_rest = min(
-                    candidates,
-                    key=lambda r: haversine(
-                        current.latitude, current.longitude,
-                        r.latitude, r.longitude,
-                    ),
-                )
-                result.insert(idx + 1, nearest_rest)
-                lunch_inserted = True
+            nearest_rest = min(
+                candidates,
+                key=lambda r: _distance(current, r, cache),
+            )
+            result.insert(idx + 1, nearest_rest)
+            break  # Only one lunch per day.
 
     return result
 
 
 # ─── TIME-BUDGET VALIDATION ─────────────────────────────────────────────────
 
-def compute_day_time(ordered_places: list[Place]) -> tuple[float, float, float]:
+def compute_day_time(
+    ordered_places: list[Place],
+    *,
+    cache: DistanceCache | None = None,
+) -> tuple[float, float, float]:
     """
     Compute totals for an ordered daily itinerary.
 
     Returns (total_visit_minutes, total_walk_minutes, total_distance_meters).
     """
     visit = sum(p.visit_duration_minutes for p in ordered_places)
-    walk = 0.0
-    dist = 0.0
-    for i in range(len(ordered_places) - 1):
-        d = haversine(
-            ordered_places[i].latitude, ordered_places[i].longitude,
-            ordered_places[i + 1].latitude, ordered_places[i + 1].longitude,
-        )
-        dist += d
-        walk += walk_time_minutes(d)
-    return visit, walk, dist
+    dist = sum(_leg_distances(ordered_places, cache), 0.0)
+    return visit, dist * _WALK_MINUTES_PER_METER, dist
 
 
 def trim_day_to_budget(
     ordered_places: list[Place],
     max_minutes: float = MAX_DAY_MINUTES,
+    *,
+    cache: DistanceCache | None = None,
 ) -> list[Place]:
     """
     Remove trailing places until total time (visit + walk) fits the budget.
     Preserves the original order; never removes restaurants if avoidable.
+
+    Runs in O(N): the total is updated per removal instead of recomputed.
     """
     result = list(ordered_places)
-    while len(result) > 1:
-        visit, walk, _ = compute_day_time(result)
-        if visit + walk <= max_minutes:
+    n = len(result)
+    if n <= 1:
+        return result
+
+    def walk(i: int, j: int) -> float:
+        return _distance(result[i], result[j], cache) * _WALK_MINUTES_PER_METER
+
+    legs = _leg_distances(result, cache)
+    total = (sum(p.visit_duration_minutes for p in result)
+             + sum(legs, 0.0) * _WALK_MINUTES_PER_METER)
+
+    # Removal order: non-restaurants from the back, then (only if all of those
+    # are gone) restaurants from the back.  Each removal patches the running
+    # total with the detour it leaves behind — no full recomputation per step.
+    is_restaurant = [p.type in ("restaurant", "café") for p in result]
+    removal_order = ([i for i in range(n - 1, -1, -1) if not is_restaurant[i]]
+                     + [i for i in range(n - 1, -1, -1) if is_restaurant[i]])
+    prev = list(range(-1, n - 1))
+    nxt = list(range(1, n + 1))
+    kept = [True] * n
+    remaining = n
+
+    for i in removal_order:
+        if remaining <= 1 or total <= max_minutes:
             break
-        # Try to remove the last non-restaurant place.
-        removed = False
-        for i in range(len(result) - 1, -1, -1):
-            if result[i].type not in ("restaurant", "café"):
-                result.pop(i)
-                removed = True
-                break
-        if not removed:
-            # All remaining are restaurants — pop the last one.
-            result.pop()
-    return result
+        before, after = prev[i], nxt[i]
+        total -= result[i].visit_duration_minutes
+        if before >= 0:
+            total -= walk(before, i)
+            nxt[before] = after
+        if after < n:
+            total -= walk(i, after)
+            prev[after] = before
+        if before >= 0 and after < n:
+            total += walk(before, after)
+        kept[i] = False
+        remaining -= 1
+
+    return [p for p, keep in zip(result, kept) if keep]
 
 
 # ─── TRIP SEGMENT GENERATION ────────────────────────────────────────────────
 
-def build_trip_segments(ordered_places: list[Place]) -> list[TripSegment]:
+def build_trip_segments(
+    ordered_places: list[Place],
+    *,
+    cache: DistanceCache | None = None,
+) -> list[TripSegment]:
     """
     Generate TripSegment objects for consecutive pairs in the route.
     """
     segments: list[TripSegment] = []
-    for i in range(len(ordered_places) - 1):
+    for i, d in enumerate(_leg_distances(ordered_places, cache)):
         a, b = ordered_places[i], ordered_places[i + 1]
-        d = haversine(a.latitude, a.longitude, b.latitude, b.longitude)
         segments.append(TripSegment(
             from_place_id=a.id,
             to_place_id=b.id,
             from_place_name=a.name,
             to_place_name=b.name,
             distance_meters=round(d, 1),
-            estimated_walk_time_minutes=round(walk_time_minutes(d), 1),
+            estimated_walk_time_minutes=round(d * _WALK_MINUTES_PER_METER, 1),
             transport_mode=TransportMode.WALK,
             order_index=i,
         ))
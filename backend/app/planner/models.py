@@ -6,11 +6,12 @@ Plain dataclasses for internal logic; Pydantic schemas for API serialisation.
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 # ─── ENUMS ───────────────────────────────────────────────────────────────────
@@ -72,9 +73,38 @@ TOUR_TAG_MAP: dict[TourType, list[str]] = {
 }
 
 
+# ─── TAG VOCABULARY ──────────────────────────────────────────────────────────
+# Every known tag owns one bit, so a tag set is an int and overlap is a popcount.
+# Grows as places are defined (at import time); queries never add tags.
+
+TAG_VOCAB: dict[str, int] = {}
+
+
+def tags_to_mask(tags: Iterable[str], *, extend: bool = False) -> int:
+    """
+    Bitmask of *tags* (case-insensitive).  Tags missing from TAG_VOCAB are
+    skipped — no place can have them — unless *extend* adds them.
+    """
+    mask = 0
+    for tag in tags:
+        tag = tag.lower()
+        bit = TAG_VOCAB.get(tag)
+        if bit is None:
+            if not extend:
+                continue
+            bit = TAG_VOCAB.setdefault(tag, len(TAG_VOCAB))
+        mask |= 1 << bit
+    return mask
+
+
+for _tags in TOUR_TAG_MAP.values():
+    tags_to_mask(_tags, extend=True)
+
+
 # ─── INTERNAL DATACLASSES ────────────────────────────────────────────────────
+# Places and segments are read-only once built; day and trip plans are filled in.
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Place:
     """A visitable location in Porto."""
     id: int
@@ -89,12 +119,21 @@ class Place:
     indoor: bool                       # True = indoor, False = outdoor
     intensity: Intensity
     popularity: float = 0.8           # 0–1 inherent popularity score
+    tag_mask: int = field(default=0, init=False, repr=False, compare=False)
+    # Per-point Haversine terms, so pairwise distances skip radians() and one cos()
+    lat_r: float = field(default=0.0, init=False, repr=False, compare=False)
+    lon_r: float = field(default=0.0, init=False, repr=False, compare=False)
+    cos_lat: float = field(default=0.0, init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tag_mask", tags_to_mask(self.tags, extend=True))
+        lat_r = math.radians(self.latitude)
+        object.__setattr__(self, "lat_r", lat_r)
+        object.__setattr__(self, "lon_r", math.radians(self.longitude))
+        object.__setattr__(self, "cos_lat", math.cos(lat_r))
 
 
-
-
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TripSegment:
     """One movement from place A → place B."""
     from_place_id: int
@@ -107,7 +146,7 @@ class TripSegment:
     order_index: int
 
 
-@dataclass
+@dataclass(slots=True)
 class DayPlan:
     """One day of the itinerary."""
     day_number: int                    # 1, 2, or 3
@@ -123,7 +162,7 @@ class DayPlan:
         return self.total_visit_minutes + self.total_walk_minutes
 
 
-@dataclass
+@dataclass(slots=True)
 class TravelPlan:
     """Complete 3-day travel plan."""
     tour_type: TourType
@@ -135,8 +174,12 @@ class TravelPlan:
 
 
 # ─── PYDANTIC SCHEMAS (API layer) ───────────────────────────────────────────
+# from_attributes lets TravelPlanSchema validate a whole TravelPlan dataclass
+# tree in one call; str fields accept the str-valued enums as plain strings.
 
 class PlaceSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     latitude: float
@@ -155,6 +198,8 @@ class PlaceSchema(BaseModel):
 
 
 class TripSegmentSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     from_place_id: int
     to_place_id: int
     from_place_name: str
@@ -166,6 +211,8 @@ class TripSegmentSchema(BaseModel):
 
 
 class DayPlanSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     day_number: int
     places: List[PlaceSchema]
     segments: List[TripSegmentSchema]
@@ -176,6 +223,8 @@ class DayPlanSchema(BaseModel):
 
 
 class TravelPlanSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     tour_type: str
     tags_used: List[str]
     days: List[DayPlanSchema]
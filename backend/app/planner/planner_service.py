@@ -23,7 +23,7 @@ from typing import Optional
 
 from app.planner.models import (
     CostLevel, DayPlan, Intensity, Place, TourType,
-    TravelPlan, TripSegment, TOUR_TAG_MAP,
+    TravelPlan, TripSegment, TOUR_TAG_MAP, tags_to_mask,
 )
 from app.planner.porto_dataset import (
     PORTO_PLACES,
@@ -31,6 +31,7 @@ from app.planner.porto_dataset import (
 )
 from app.planner.algorithm import (
     MAX_DAY_MINUTES,
+    DistanceCache,
     build_trip_segments,
     cluster_into_days,
     compute_day_time,
@@ -48,6 +49,18 @@ _MIN_CANDIDATES = 9
 # Maximum number of places we select into the plan (before restaurant insertion).
 _MAX_SELECTED = 18
 
+# Widely-applicable tags added, in this order, when a search is too restrictive.
+_GENERIC_TAGS = (
+    "historical", "cultural", "architecture", "scenic",
+    "heritage", "landmark", "art", "panoramic",
+)
+
+
+# Restaurants are inserted separately (step 8), so they never join the candidate pool.
+_NON_RESTAURANT_PLACES = [
+    p for p in PORTO_PLACES if p.type not in ("restaurant", "café")
+]
+
 
 # ─── HELPERS ─────────────────────────────────────────────────────────────────
 
@@ -59,10 +72,13 @@ def _filter_by_tags(
     """
     Return places that share at least *min_overlap* tags with *tags*.
     """
-    tag_set = set(t.lower() for t in tags)
+    mask = tags_to_mask(tags)
+    if min_overlap == 1:
+        # Any shared bit will do — skip the popcount
+        return [p for p in places if p.tag_mask & mask]
     return [
         p for p in places
-        if len(set(t.lower() for t in p.tags) & tag_set) >= min_overlap
+        if (p.tag_mask & mask).bit_count() >= min_overlap
     ]
 
 
@@ -74,20 +90,48 @@ def _broaden_tags(tags: list[str]) -> list[str]:
     filter returns more candidates while still maintaining thematic
     relevance.
     """
-    generic = [
-        "historical", "cultural", "architecture", "scenic",
-        "heritage", "landmark", "art", "panoramic",
-    ]
     existing = set(t.lower() for t in tags)
-    broadened = list(tags)
-    for g in generic:
-        if g not in existing:
-            broadened.append(g)
-    return broadened
+    return list(tags) + [g for g in _GENERIC_TAGS if g not in existing]
 
 
 # ─── MAIN ENTRY POINT ───────────────────────────────────────────────────────
 
+def _resolve_candidates(tags: list[str]) -> tuple[list[str], list[Place]]:
+    """
+    Filter the non-restaurant places by *tags*, broadening the tags up to
+    three times if too few match.  Returns the final tags and candidates.
+    """
+    candidates = _filter_by_tags(_NON_RESTAURANT_PLACES, tags)
+    logger.info("[PLANNER] Initial candidates: %d", len(candidates))
+
+    attempts = 0
+    while len(candidates) < _MIN_CANDIDATES and attempts < 3:
+        broadened = _broaden_tags(tags)
+        if len(broadened) == len(tags):
+            # Every generic tag is already in; filtering again can't add places.
+            break
+        tags = broadened
+        candidates = _filter_by_tags(_NON_RESTAURANT_PLACES, tags)
+        attempts += 1
+        logger.info("[PLANNER] Broadened tags (attempt %d) → %d candidates", attempts, len(candidates))
+
+    # Ultimate fallback: use all non-restaurant places.
+    if len(candidates) < _MIN_CANDIDATES:
+        logger.warning("[PLANNER] Using ALL non-restaurant places as fallback")
+        candidates = list(_NON_RESTAURANT_PLACES)
+
+    return tags, candidates
+
+
+# Preset tours always resolve the same tags against the same fixed catalogue,
+# so their candidate pools are computed once here instead of per request.
+_CANDIDATES_BY_TOUR: dict[TourType, tuple[list[str], list[Place]]] = {
+    tour: _resolve_candidates(list(TOUR_TAG_MAP[tour]))
+    for tour in TourType
+    if tour != TourType.CUSTOM and tour in TOUR_TAG_MAP
+}
+
+
 def generate_plan(
     tour_type: TourType | str = TourType.BEAUTIFUL,
     custom_tags: list[str] | None = None,
@@ -127,26 +171,13 @@ def generate_plan(
 
     logger.info("[PLANNER] Tour type: %s | Tags: %s", tour_type.value, tags)
 
-    # ── 2. Filter candidates ─────────────────────────────────────────────────
-    # Exclude restaurants from the "main" candidate pool — they get inserted separately.
-    non_restaurant_places = [
-        p for p in PORTO_PLACES if p.type not in ("restaurant", "café")
-    ]
-    candidates = _filter_by_tags(non_restaurant_places, tags)
-    logger.info("[PLANNER] Initial candidates: %d", len(candidates))
-
-    # ── 3. Fallback: broaden if too few candidates ───────────────────────────
-    attempts = 0
-    while len(candidates) < _MIN_CANDIDATES and attempts < 3:
-        tags = _broaden_tags(tags)
-        candidates = _filter_by_tags(non_restaurant_places, tags)
-        attempts += 1
-        logger.info("[PLANNER] Broadened tags (attempt %d) → %d candidates", attempts, len(candidates))
-
-    # Ultimate fallback: use all non-restaurant places.
-    if len(candidates) < _MIN_CANDIDATES:
-        logger.warning("[PLANNER] Using ALL non-restaurant places as fallback")
-        candidates = list(non_restaurant_places)
+    # ── 2–3. Filter candidates, broadening if too few ────────────────────────
+    cached = _CANDIDATES_BY_TOUR.get(tour_type)
+    if cached is not None:
+        tags, candidates = list(cached[0]), list(cached[1])
+        logger.info("[PLANNER] Preset candidates: %d", len(candidates))
+    else:
+        tags, candidates = _resolve_candidates(tags)
 
     # ── 4. Score & rank ──────────────────────────────────────────────────────
     scored = score_places(candidates, tags)
@@ -163,16 +194,18 @@ def generate_plan(
 
     # ── 7–9. Optimise, insert restaurants, and trim each day ─────────────────
     all_restaurants = get_all_restaurants()
+    # Every distance below is between selected places and restaurants — compute them once.
+    cache = DistanceCache.build(selected + all_restaurants)
     used_ids: set[int] = set()  # Track used restaurant IDs across days.
     days: list[DayPlan] = []
 
     for day_num, cluster in enumerate(day_clusters, start=1):
         # 7. Route optimisation.
-        ordered = optimize_day_route(cluster)
+        ordered = optimize_day_route(cluster, cache=cache)
 
         # 8. Restaurant insertion.
         ordered = insert_restaurants(
-            ordered, all_restaurants, already_used_ids=used_ids,
+            ordered, all_restaurants, already_used_ids=used_ids, cache=cache,
         )
         # Mark inserted restaurant IDs as used.
         for p in ordered:
@@ -180,11 +213,11 @@ def generate_plan(
                 used_ids.add(p.id)
 
         # 9. Trim to time budget.
-        ordered = trim_day_to_budget(ordered, max_minutes=MAX_DAY_MINUTES)
+        ordered = trim_day_to_budget(ordered, max_minutes=MAX_DAY_MINUTES, cache=cache)
 
         # Compute day totals.
-        visit, walk, dist = compute_day_time(ordered)
-        segments = build_trip_segments(ordered)
+        visit, walk, dist = compute_day_time(ordered, cache=cache)
+        segments = build_trip_segments(ordered, cache=cache)
 
         days.append(DayPlan(
             day_number=day_num,
@@ -8,7 +8,8 @@ Endpoints:
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 
 from app.planner.models import (
@@ -16,9 +17,6 @@ from app.planner.models import (
     TourType,
     TourTypeInfo,
     TravelPlanSchema,
-    PlaceSchema,
-    TripSegmentSchema,
-    DayPlanSchema,
     TOUR_TAG_MAP,
 )
 from app.planner.planner_service import generate_plan
@@ -28,61 +26,24 @@ router = APIRouter(prefix="/planner", tags=["planner"])
 
 # ─── SERIALISATION HELPERS ───────────────────────────────────────────────────
 
-def _travel_plan_to_schema(plan) -> dict:
+def _travel_plan_to_schema(plan) -> TravelPlanSchema:
     """
-    Convert internal TravelPlan dataclass → dict compatible with
-    TravelPlanSchema for JSON serialisation.
+    Convert internal TravelPlan dataclass → TravelPlanSchema.
+
+    Validated straight from the dataclass attributes in a single pass.
     """
-    days = []
-    for d in plan.days:
-        places = [
-            PlaceSchema(
-                id=p.id,
-                name=p.name,
-                latitude=p.latitude,
-                longitude=p.longitude,
-                type=p.type,
-                visit_duration_minutes=p.visit_duration_minutes,
-                tags=p.tags,
-                description=p.description,
-                cost_level=p.cost_level.value,
-                indoor=p.indoor,
-                intensity=p.intensity.value,
-                popularity=p.popularity,
-            )
-            for p in d.places
-        ]
-        segments = [
-            TripSegmentSchema(
-                from_place_id=s.from_place_id,
-                to_place_id=s.to_place_id,
-                from_place_name=s.from_place_name,
-                to_place_name=s.to_place_name,
-                distance_meters=s.distance_meters,
-                estimated_walk_time_minutes=s.estimated_walk_time_minutes,
-                transport_mode=s.transport_mode.value,
-                order_index=s.order_index,
-            )
-            for s in d.segments
-        ]
-        days.append(DayPlanSchema(
-            day_number=d.day_number,
-            places=places,
-            segments=segments,
-            total_visit_minutes=d.total_visit_minutes,
-            total_walk_minutes=d.total_walk_minutes,
-            total_distance_meters=d.total_distance_meters,
-            total_time_minutes=d.total_time_minutes,
-        ))
+    return TravelPlanSchema.model_validate(plan)
+
 
-    return TravelPlanSchema(
-        tour_type=plan.tour_type.value,
-        tags_used=plan.tags_used,
-        days=days,
-        total_places=plan.total_places,
-        total_distance_meters=plan.total_distance_meters,
-        total_time_minutes=plan.total_time_minutes,
+def _generate_plan_json(req: GeneratePlanRequest) -> str:
+    """Plan and serialise in one synchronous call, for the threadpool."""
+    plan = generate_plan(
+        tour_type=req.tour_type,
+        custom_tags=req.custom_tags,
+        days=req.days,
     )
+    # Already validated — hand FastAPI the JSON so it isn't validated again.
+    return _travel_plan_to_schema(plan).model_dump_json()
 
 
 # ─── ROUTES ──────────────────────────────────────────────────────────────────
@@ -98,12 +59,9 @@ async def generate_travel_plan(req: GeneratePlanRequest):
       - days: number of days (1-7, default 3)
     """
     try:
-        plan = generate_plan(
-            tour_type=req.tour_type,
-            custom_tags=req.custom_tags,
-            days=req.days,
-        )
-        return _travel_plan_to_schema(plan)
+        # Planning is CPU-bound; keep it off the event loop.
+        content = await run_in_threadpool(_generate_plan_json, req)
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,7 +2,7 @@
 Transport database connection — isolated from the main bugsbyte.db pool.
 
 Provides a lightweight connection factory with read-only pragmas tuned
-for the 2.7 GB transport.db (WAL mode, limited cache).
+for the 2.7 GB transport.db (WAL mode, limited cache, memory-mapped reads).
 """
 
 import os
@@ -22,6 +22,11 @@ def _make_connection() -> sqlite3.Connection:
     conn.execute("PRAGMA synchronous = NORMAL;")
     # Cap memory: ~32 MB page cache (negative = KB)
     conn.execute("PRAGMA cache_size = -32768;")
+    # Map up to 256 MB of the file: hot pages are read straight from the OS
+    # page cache instead of being copied through read() calls
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    # Sorts and temp indexes (ORDER BY, DISTINCT) stay in RAM
+    conn.execute("PRAGMA temp_store = MEMORY;")
     conn.execute("PRAGMA query_only = ON;")
     return conn
 
@@ -45,10 +50,16 @@ def get_transport_db() -> sqlite3.Connection:
 
 
 @contextmanager
-def transport_cursor() -> Generator[sqlite3.Cursor, None, None]:
-    """Context manager yielding a cursor on the transport DB."""
+def transport_cursor(raw_rows: bool = False) -> Generator[sqlite3.Cursor, None, None]:
+    """Context manager yielding a cursor on the transport DB.
+
+    With *raw_rows*, rows come back as plain tuples instead of
+    sqlite3.Row — cheaper for bulk reads that index columns by position.
+    """
     conn = get_transport_db()
     cursor = conn.cursor()
+    if raw_rows:
+        cursor.row_factory = None
     try:
         yield cursor
     finally:
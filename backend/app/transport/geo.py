@@ -12,15 +12,21 @@ haversine_meters   — accurate distance between two points
 
 from __future__ import annotations
 
+import logging
 import math
-from typing import List, Tuple
+import threading
+from collections import defaultdict
+from typing import Iterable, List, Sequence, Tuple
 
 import numpy as np
 from scipy.spatial import KDTree
 
+from app.jit import njit
 from app.transport.connection import transport_cursor
 from app.transport.models import Stop
 
+logger = logging.getLogger(__name__)
+
 # ─── Constants ───────────────────────────────────────────────────────────────
 
 EARTH_RADIUS_M = 6_371_000
@@ -29,9 +35,16 @@ EARTH_RADIUS_M = 6_371_000
 _LISBON_BOX = (38.65, 38.85, -9.25, -9.05)   # lat_min, lat_max, lon_min, lon_max
 _PORTO_BOX  = (41.10, 41.20, -8.70, -8.55)
 
+# Stop ID prefix (see tools/transportdata.py) → small integer agency ID.
+# 0 means an unknown agency.
+_AGENCY_IDS = {"cp_": 1, "flix_": 2, "cmet_": 3, "stcp_": 4}
+
 
 # ─── Haversine ───────────────────────────────────────────────────────────────
 
+# Eager float64 signature: compiled (or loaded from cache) at import, never
+# per request, and int arguments are widened at the call boundary.
+@njit("float64(float64, float64, float64, float64)", cache=True)
 def haversine_meters(lat1: float, lon1: float,
                      lat2: float, lon2: float) -> float:
     """Return distance in metres between two WGS-84 points."""
@@ -58,6 +71,48 @@ def _lat_lon_to_cartesian(lat: float, lon: float) -> Tuple[float, float, float]:
             math.sin(rlat))
 
 
+def _unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Vectorised _lat_lon_to_cartesian: (n, 3) unit vectors for degree arrays."""
+    rlat, rlon = np.radians(lats), np.radians(lons)
+    cos_lat = np.cos(rlat)
+    return np.column_stack(
+        (cos_lat * np.cos(rlon), cos_lat * np.sin(rlon), np.sin(rlat))
+    )
+
+
+def _chord_to_meters(chord: np.ndarray) -> np.ndarray:
+    """Convert unit-sphere chord lengths (KDTree distances) to great-circle metres.
+
+    Exact for any separation: the arc is 2·asin(chord / 2), so candidates
+    never need their lat/lon re-read for a haversine.
+    """
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.minimum(chord / 2.0, 1.0))
+
+
+def _max_chord(max_distance_m: float) -> float:
+    """Chord length on the unit sphere spanning *max_distance_m* of arc."""
+    return 2.0 * math.sin(max_distance_m / (2.0 * EARTH_RADIUS_M))
+
+
+def _prefix_to_id(agency_prefix: str) -> int:
+    """Agency ID for a Stop.agency_prefix."""
+    return _AGENCY_IDS.get(agency_prefix, 0)
+
+
+def _trigrams(text: str) -> set[str]:
+    """All 3-character slices of *text*."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _build_trigram_index(names: List[str]) -> dict[str, List[int]]:
+    """Map each trigram to the ascending positions of the names containing it."""
+    index: defaultdict[str, List[int]] = defaultdict(list)
+    for i, name in enumerate(names):
+        for gram in _trigrams(name):
+            index[gram].append(i)
+    return dict(index)
+
+
 # ─── StopIndex ───────────────────────────────────────────────────────────────
 
 class StopIndex:
@@ -69,49 +124,115 @@ class StopIndex:
     def __init__(self) -> None:
         self._stops: List[Stop] = []
         self._stop_map: dict[str, Stop] = {}
+        self._stop_pos: dict[str, int] = {}     # stop_id → row in the arrays below
+        self._names_lower: List[str] = []
+        self._trigram_index: dict[str, List[int]] = {}   # trigram → ascending rows
         self._tree: KDTree | None = None
+        # Unit-sphere Cartesian coordinates, aligned with self._stops
+        self._xyz = np.empty((0, 3))
+        self._agency_ids = np.empty(0, dtype=np.int8)
         self._loaded = False
+        self._load_lock = threading.Lock()
+        self._load_done = threading.Event()   # set once a load succeeds or fails
+        # Per-thread query buffer: requests may run on several threadpool workers
+        self._scratch = threading.local()
 
     # ── lifecycle ────────────────────────────────────────────────────────
 
     def load(self) -> None:
         """Load all locations from the database into the KDTree."""
-        if self._loaded:
-            return
-
-        with transport_cursor() as cur:
-            # Updated to read from 'locations' table
-            cur.execute("SELECT search_id, name, lat, lon, provider FROM locations")
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                self._build()
+                self._loaded = True
+            finally:
+                self._load_done.set()
+
+    def preload(self) -> threading.Thread:
+        """Start :meth:`load` on a daemon thread, so startup doesn't wait for it.
+
+        Failures are logged; :meth:`wait_ready` then reports False.
+        """
+        def run() -> None:
+            try:
+                self.load()
+                logger.info("[TRANSPORT] Stop index ready — %d stops indexed", self.size)
+            except Exception:
+                logger.exception("[TRANSPORT] Stop index load failed")
+
+        thread = threading.Thread(target=run, name="stop-index-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until a load has finished; True if the index is usable."""
+        self._load_done.wait(timeout)
+        return self._loaded
+
+    def _build(self) -> None:
+        """Read the locations table and build the lookups and KDTree."""
+        with transport_cursor(raw_rows=True) as cur:
+            # Updated to read from 'locations' table; rowid order is a
+            # sequential scan of the table's pages
+            cur.execute("SELECT search_id, name, lat, lon FROM locations ORDER BY rowid")
             rows = cur.fetchall()
 
+        # Column-wise: ids and coordinates are pulled out once, then the
+        # Stop objects and the Cartesian array are built from the columns.
+        n = len(rows)
+        ids = [r[0] for r in rows]
+        lats = np.fromiter((r[2] for r in rows), np.float64, n)
+        lons = np.fromiter((r[3] for r in rows), np.float64, n)
+
         self._stops = [
-            Stop(stop_id=r["search_id"], stop_name=r["name"],
-                 lat=float(r["lat"]), lon=float(r["lon"]))
-            for r in rows
+            Stop(stop_id=stop_id, stop_name=r[1], lat=lat, lon=lon)
+            for stop_id, r, lat, lon in zip(ids, rows, lats.tolist(), lons.tolist())
         ]
-        self._stop_map = {s.stop_id: s for s in self._stops}
+        self._stop_map = dict(zip(ids, self._stops))
+        self._stop_pos = {stop_id: i for i, stop_id in enumerate(ids)}
+        self._agency_ids = np.fromiter(
+            (_prefix_to_id(s.agency_prefix) for s in self._stops), np.int8, n
+        )
+        self._names_lower = [s.stop_name.lower() for s in self._stops]
+        self._trigram_index = _build_trigram_index(self._names_lower)
 
         # Build KDTree on unit-sphere Cartesian coordinates
-        coords = np.array([
-            _lat_lon_to_cartesian(s.lat, s.lon) for s in self._stops
-        ])
-        if len(coords) > 0:
-            self._tree = KDTree(coords)
+        self._xyz = _unit_vectors(lats, lons)
+        if n > 0:
+            self._tree = KDTree(self._xyz)
         else:
             self._tree = None
-        
-        self._loaded = True
 
     @property
     def size(self) -> int:
         return len(self._stops)
 
+    @property
+    def stops(self) -> List[Stop]:
+        """All stops in row order (read-only).  A stop's row is its integer id."""
+        return self._stops
+
+    @property
+    def stop_positions(self) -> dict[str, int]:
+        """stop_id → row in `stops` (read-only), for callers that key arrays by stop."""
+        return self._stop_pos
+
     def get_stop(self, stop_id: str) -> Stop | None:
         """Look up a stop by ID.  O(1)."""
         return self._stop_map.get(stop_id)
 
     # ── spatial queries ──────────────────────────────────────────────────
 
+    def _query_point(self, lat: float, lon: float) -> np.ndarray:
+        """Write (lat, lon) as a unit vector into this thread's reusable buffer."""
+        point = getattr(self._scratch, "point", None)
+        if point is None:
+            point = self._scratch.point = np.empty(3)
+        point[0], point[1], point[2] = _lat_lon_to_cartesian(lat, lon)
+        return point
+
     def find_nearest(self, lat: float, lon: float,
                      k: int = 10,
                      max_distance_m: float = 2000) -> List[Tuple[Stop, float]]:
@@ -120,27 +241,106 @@ class StopIndex:
         if not self._tree:
             return []
 
-        point = np.array(_lat_lon_to_cartesian(lat, lon))
-        max_chord = 2.0 * math.sin(max_distance_m / (2.0 * EARTH_RADIUS_M))
+        point = self._query_point(lat, lon)
 
-        dists, idxs = self._tree.query(point, k=min(k * 3, len(self._stops)),
-                                       distance_upper_bound=max_chord)
+        chords, idxs = self._tree.query(point, k=min(k * 3, len(self._stops)),
+                                        distance_upper_bound=_max_chord(max_distance_m))
+        return self._rank_hits(np.atleast_1d(chords), np.atleast_1d(idxs),
+                               k, max_distance_m)
 
-        results: List[Tuple[Stop, float]] = []
-        if not isinstance(dists, np.ndarray): # Handle single result case
-             dists = [dists]
-             idxs = [idxs]
+    def find_nearest_batch(self, lats: Sequence[float], lons: Sequence[float],
+                           k: int = 10,
+                           max_distance_m: float = 2000,
+                           workers: int = -1) -> List[List[Tuple[Stop, float]]]:
+        """:meth:`find_nearest` for many points in one KDTree query.
 
-        for d, i in zip(dists, idxs):
-            if i >= len(self._stops):   # KDTree fills with inf for < k hits
-                continue
-            stop = self._stops[i]
-            dist_m = haversine_meters(lat, lon, stop.lat, stop.lon)
-            if dist_m <= max_distance_m:
-                results.append((stop, dist_m))
+        The query runs in C without the GIL, split over *workers*
+        threads (-1 = all cores).  Returns one result list per point.
+        """
+        assert self._loaded, "Call .load() first"
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if not self._tree or len(lats) == 0:
+            return [[] for _ in range(len(lats))]
+
+        n_hits = min(k * 3, len(self._stops))
+        chords, idxs = self._tree.query(_unit_vectors(lats, lons), k=n_hits,
+                                        distance_upper_bound=_max_chord(max_distance_m),
+                                        workers=workers)
+        chords = chords.reshape(len(lats), n_hits)
+        idxs = idxs.reshape(len(lats), n_hits)
+        return [self._rank_hits(row_chords, row_idxs, k, max_distance_m)
+                for row_chords, row_idxs in zip(chords, idxs)]
+
+    def _rank_hits(self, chords: np.ndarray, idxs: np.ndarray,
+                   k: int, max_distance_m: float) -> List[Tuple[Stop, float]]:
+        """Turn one point's KDTree hits into (Stop, metres), closest first."""
+        # KDTree pads with index == len(stops) when fewer than k hits.
+        # Hits arrive sorted by chord, hence already sorted by arc length.
+        found = idxs < len(self._stops)
+        dist_m = _chord_to_meters(chords[found])
+        within = dist_m <= max_distance_m
+        idxs, dist_m = idxs[found][within], dist_m[within]
+
+        return [(self._stops[i], d)
+                for i, d in zip(idxs[:k].tolist(), dist_m[:k].tolist())]
+
+    def find_transfers(self, stop_id: str,
+                       max_distance_m: float = 300,
+                       exclude_same_agency: bool = False) -> List[Tuple[Stop, float]]:
+        """Stops within walking distance of *stop_id*, closest first.
+
+        The stop itself is excluded; unknown IDs yield no transfers.
+        With *exclude_same_agency*, only stops of other agencies are kept.
+        """
+        assert self._loaded, "Call .load() first"
+        pos = self._stop_pos.get(stop_id)
+        if pos is None or not self._tree:
+            return []
+
+        hits = self._tree.query_ball_point(self._xyz[pos], r=_max_chord(max_distance_m))
+        return self._rank_transfers(pos, hits, max_distance_m, exclude_same_agency)
+
+    def find_transfers_batch(self, stop_ids: Sequence[str],
+                             max_distance_m: float = 300,
+                             workers: int = -1) -> List[List[Tuple[Stop, float]]]:
+        """:meth:`find_transfers` for many stops in one KDTree query.
 
-        results.sort(key=lambda x: x[1])
-        return results[:k]
+        Like :meth:`find_nearest_batch`, the ball queries run in C split
+        over *workers* threads.  Returns one result list per stop.
+        """
+        assert self._loaded, "Call .load() first"
+        positions = [self._stop_pos.get(stop_id) for stop_id in stop_ids]
+        known = [pos for pos in positions if pos is not None]
+        if not known or not self._tree:
+            return [[] for _ in positions]
+
+        all_hits = iter(self._tree.query_ball_point(
+            self._xyz[known], r=_max_chord(max_distance_m), workers=workers))
+        return [self._rank_transfers(pos, next(all_hits), max_distance_m)
+                if pos is not None else []
+                for pos in positions]
+
+    def _rank_transfers(self, pos: int, hits: Sequence[int],
+                        max_distance_m: float,
+                        exclude_same_agency: bool = False) -> List[Tuple[Stop, float]]:
+        """Turn the ball-query hits around row *pos* into (Stop, metres), closest first."""
+        idxs = np.asarray(hits, dtype=np.intp)
+        dist_m = _chord_to_meters(np.linalg.norm(self._xyz[idxs] - self._xyz[pos], axis=1))
+
+        keep = (dist_m <= max_distance_m) & (idxs != pos)
+        if exclude_same_agency:
+            keep &= self._agency_ids[idxs] != self._agency_ids[pos]
+        idxs, dist_m = idxs[keep], dist_m[keep]
+        order = np.argsort(dist_m, kind="stable")
+
+        return [(self._stops[i], d)
+                for i, d in zip(idxs[order].tolist(), dist_m[order].tolist())]
+
+    def find_cross_agency_transfers(self, stop_id: str,
+                                    max_distance_m: float = 300) -> List[Tuple[Stop, float]]:
+        """Walkable stops run by a different agency than *stop_id* (e.g. bus → train)."""
+        return self.find_transfers(stop_id, max_distance_m, exclude_same_agency=True)
 
     # ── text search ─────────────────────────────────────────────────────
 
@@ -154,14 +354,29 @@ class StopIndex:
         if not q:
             return []
 
+        # Any name containing q contains all of q's trigrams, so only names
+        # in every posting list need the substring check.  Shorter queries
+        # have no trigram and scan everything.
+        candidates: Iterable[int]
+        if len(q) >= 3:
+            postings = sorted((self._trigram_index.get(g, []) for g in _trigrams(q)), key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                if not matches:
+                    break
+                matches.intersection_update(posting)
+            candidates = sorted(matches)
+        else:
+            candidates = range(len(self._stops))
+
         seen: set[str] = set()
         results: List[Stop] = []
-        for stop in self._stops:
-            name_lower = stop.stop_name.lower()
+        for i in candidates:
+            name_lower = self._names_lower[i]
             if q in name_lower:
                 if name_lower not in seen:
                     seen.add(name_lower)
-                    results.append(stop)
+                    results.append(self._stops[i])
                     if len(results) >= limit:
                         break
         return results
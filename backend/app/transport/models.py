@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -49,8 +50,13 @@ _ROUTE_TYPE_MAP = {
 }
 
 
+@lru_cache(maxsize=None)
 def route_type_to_mode(route_type: int | str | None) -> LegMode:
-    """Convert a GTFS route_type integer to a LegMode."""
+    """Convert a GTFS route_type integer to a LegMode.
+
+    Memoised: the router asks for every departure it expands, but a feed
+    only uses a handful of distinct route types.
+    """
     try:
         return _ROUTE_TYPE_MAP.get(int(route_type), LegMode.BUS)
     except (ValueError, TypeError):
@@ -66,10 +72,11 @@ class Stop:
     stop_name: str
     lat: float
     lon: float
+    # ID prefix naming the agency, e.g. "cp_"; parsed once at construction
+    agency_prefix: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def agency_prefix(self) -> str:
-        return self.stop_id.split("_")[0] + "_"
+    def __post_init__(self) -> None:
+        self.agency_prefix = self.stop_id.split("_")[0] + "_"
 
 
 @dataclass(slots=True)
@@ -166,3 +173,43 @@ class NearbyStopSchema(BaseModel):
     lat: float
     lon: float
     distance_meters: float
+
+
+# ─── CONVERTERS (engine → API) ──────────────────────────────────────────────
+# The engine's dataclasses already hold well-typed values, so the schemas
+# are filled with model_construct and skip field validation.
+
+def stop_to_schema(stop: Stop) -> StopSchema:
+    """Wrap an engine Stop for the API."""
+    return StopSchema.model_construct(
+        stop_id=stop.stop_id, stop_name=stop.stop_name,
+        lat=stop.lat, lon=stop.lon,
+    )
+
+
+def to_schema(result: RouteResult) -> RouteResultSchema:
+    """Wrap a RouteResult from the router for the API."""
+    return RouteResultSchema.model_construct(
+        legs=[
+            RouteLegSchema.model_construct(
+                mode=leg.mode.value,
+                from_stop=stop_to_schema(leg.from_stop),
+                to_stop=stop_to_schema(leg.to_stop),
+                departure_time=leg.departure_time,
+                arrival_time=leg.arrival_time,
+                duration_minutes=leg.duration_minutes,
+                agency=leg.agency,
+                trip_headsign=leg.trip_headsign,
+                route_name=leg.route_name,
+                instructions=leg.instructions,
+            )
+            for leg in result.legs
+        ],
+        total_duration_minutes=result.total_duration_minutes,
+        total_transfers=result.total_transfers,
+        departure_time=result.departure_time,
+        arrival_time=result.arrival_time,
+        origin_name=result.origin_name,
+        destination_name=result.destination_name,
+        summary=result.summary,
+    )
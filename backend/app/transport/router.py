@@ -10,6 +10,12 @@ Algorithm
 Modified Dijkstra on states (stop_id, arrival_time, num_transfers).
 Cost function:  elapsed_time  +  num_transfers × TRANSFER_PENALTY
 
+The queue is ordered A*-style by cost plus a lower bound on the time
+still needed: the straight-line gap to the destination cluster at
+MAX_TRANSIT_KMH.  The bound never overestimates, so the route found is
+the same one plain Dijkstra would pick, with far fewer states explored
+on long trips.
+
 Expansion rules from state (stop, time, transfers):
   1. BOARD — find departures from this stop after `time`
   2. RIDE  — ride a boarded trip forward to each subsequent stop
@@ -25,13 +31,19 @@ from __future__ import annotations
 import datetime
 import heapq
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+import math
+from array import array
+from bisect import bisect_right
+from itertools import chain, repeat
+from typing import Dict, List, Optional, Tuple
 
 from app.transport.geo import StopIndex, haversine_meters
 from app.transport.models import (
-    Departure, LegMode, RouteLeg, RouteResult, Stop, route_type_to_mode,
+    LegMode, RouteLeg, RouteResult, Stop, route_type_to_mode,
+)
+from app.transport.schedule import (
+    LRUCache, ScheduleService, format_time, parse_gtfs_time,
 )
-from app.transport.schedule import ScheduleService, format_time, parse_gtfs_time
 
 logger = logging.getLogger(__name__)
 
@@ -46,29 +58,105 @@ MAX_SEARCH_MINUTES = 480        # abort search after 8 hours
 MAX_DEPARTURES_PER_STOP = 15    # limit branching factor
 MAX_STATES_EXPLORED = 50_000    # hard cap on states explored
 DEST_CLUSTER_RADIUS_M = 400     # "arrival zone" around destination
+MAX_TRANSIT_KMH = 250           # above any scheduled service (Alfa Pendular: 220)
+TRIP_COLUMNS_CACHE_SIZE = 20_000    # trips kept ready to ride
+OVERNIGHT_CACHE_SIZE = 2_000        # (stop, date) early-morning lists
+
+# Minutes per metre walked, and at MAX_TRANSIT_KMH for the A* lower bound
+_WALK_MIN_PER_M = 60.0 / (WALK_SPEED_KMH * 1000.0)
+_MIN_PER_M_TRANSIT = 60.0 / (MAX_TRANSIT_KMH * 1000.0)
 
 
 # ─── Internal Types ──────────────────────────────────────────────────────────
 
-# Priority queue entry: (cost, arrival_minutes, stop_id, num_transfers, parent_key, leg_info)
-# parent_key is (stop_id, trip_id) of the predecessor, or None for root
-# leg_info is the RouteLeg that got us here, or None
+class _StateBuffer:
+    """Dijkstra states stored column-wise, addressed by integer index.
 
+    Each state is one slot across parallel arrays rather than its own
+    object, so a push costs a few appends and the heap only holds
+    ``(cost, idx)`` pairs.  Indices grow monotonically, which also makes
+    ``idx`` a stable tie-breaker between equal costs.  ``parent`` is -1
+    for states seeded from the origin.  ``stop`` is the stop's row in the
+    StopIndex, or -1 for the destination point itself.
 
-class _State:
-    """A state in the Dijkstra search."""
-    __slots__ = ("stop_id", "arrival_min", "transfers", "cost",
-                 "parent", "leg")
+    ``leg`` holds the raw leg that reached the state; see _materialize_leg.
+    """
+    __slots__ = ("stop", "arrival", "transfers", "cost", "parent", "leg")
+
+    def __init__(self) -> None:
+        self.stop = array("i")
+        self.arrival = array("d")
+        self.transfers = array("i")
+        self.cost = array("d")
+        self.parent = array("i")
+        self.leg: List[Optional[tuple]] = []
+
+    def add(self, stop: int, arrival_min: float, transfers: int,
+            cost: float, parent: int, leg: Optional[tuple]) -> int:
+        """Append a state and return its index."""
+        self.stop.append(stop)
+        self.arrival.append(arrival_min)
+        self.transfers.append(transfers)
+        self.cost.append(cost)
+        self.parent.append(parent)
+        self.leg.append(leg)
+        return len(self.cost) - 1
+
+
+# Display name of each mode in ride instructions ("Bus", "Train", ...)
+_MODE_CAP: Dict[LegMode, str] = {m: m.value.capitalize() for m in LegMode}
+
+
+def _materialize_leg(leg: tuple) -> RouteLeg:
+    """Build the RouteLeg for a raw leg tuple stored during the search.
+
+    Ride legs are ``(mode, from_stop, to_stop, dep_min, arr_min, departure)``
+    and walk legs ``(WALK, from_stop, to_stop, dep_min, arr_min, dist_m)``.
+    Formatting is deferred to here because most legs pushed during the
+    search belong to dominated states and are never shown.
+    """
+    mode, from_stop, to_stop, dep_min, arr_min, extra = leg
+    if mode == LegMode.WALK:
+        dist_m = extra
+        walk_min = dist_m * _WALK_MIN_PER_M
+        if from_stop.stop_id == "__origin__":
+            agency_hint = to_stop.agency_prefix.rstrip('_').upper()
+            instructions = (f"Walk {dist_m:.0f}m to {to_stop.stop_name} "
+                            f"station ({agency_hint})")
+        elif to_stop.stop_id == "__dest__":
+            instructions = f"Walk {dist_m:.0f}m to your destination"
+        else:
+            instructions = (f"Walk {dist_m:.0f}m to {to_stop.stop_name} "
+                            f"({to_stop.agency_prefix.rstrip('_')})")
+        return RouteLeg(
+            mode=LegMode.WALK,
+            from_stop=from_stop,
+            to_stop=to_stop,
+            departure_time=format_time(dep_min),
+            arrival_time=format_time(arr_min),
+            duration_minutes=round(walk_min, 1),
+            instructions=instructions,
+        )
 
-    def __init__(self, stop_id: str, arrival_min: float, transfers: int,
-                 cost: float, parent: Optional[_State],
-                 leg: Optional[RouteLeg]):
-        self.stop_id = stop_id
-        self.arrival_min = arrival_min
-        self.transfers = transfers
-        self.cost = cost
-        self.parent = parent
-        self.leg = leg
+    dep = extra
+    ride_min = arr_min - dep_min
+    return RouteLeg(
+        mode=mode,
+        from_stop=from_stop,
+        to_stop=to_stop,
+        departure_time=format_time(dep_min),
+        arrival_time=format_time(arr_min),
+        duration_minutes=round(ride_min, 1),
+        agency=dep.agency_id,
+        trip_id=dep.trip_id,
+        trip_headsign=dep.trip_headsign,
+        route_name=dep.route_id,
+        instructions=(
+            f"Take {_MODE_CAP[mode]} ({dep.agency_id}) "
+            f"towards {dep.trip_headsign or 'destination'} — "
+            f"ride {ride_min:.0f} min to {to_stop.stop_name}"
+        ),
+    )
 
 
 # ─── Router ──────────────────────────────────────────────────────────────────
@@ -88,6 +176,24 @@ class TransportRouter:
                  schedule: ScheduleService | None = None) -> None:
         self._geo = stop_index
         self._sched = schedule or ScheduleService()
+        # (stop_id, date) → that stop's departures before 06:00 on the
+        # date, paired with the +24h offset that places them after the
+        # previous evening's.  Each stop
+        # is expanded once per search, so reuse comes from the route()
+        # retries and from later requests.  Bounded, as new dates keep
+        # arriving for as long as the server runs.
+        self._overnight_cache: LRUCache = LRUCache(OVERNIGHT_CACHE_SIZE)
+        # trip_id → (stop sequences, arrival minutes, stop rows) of the
+        # trip's stops that are in the StopIndex, in sequence order.
+        # Bounded like the schedule's trip stops, which it mirrors.
+        self._trip_columns: LRUCache = LRUCache(TRIP_COLUMNS_CACHE_SIZE)
+        # Stop row → (row, stop, metres, minutes) of each stop within
+        # MAX_WALK_RADIUS_M, closest first.  The index doesn't change
+        # once loaded, so these are kept across searches; there is at
+        # most one entry per indexed stop.
+        self._walk_transfers: Dict[
+            int, List[Tuple[int, Stop, float, float]]
+        ] = {}
 
     # ── public ───────────────────────────────────────────────────────────
 
@@ -163,7 +269,7 @@ class TransportRouter:
         start_min: float,
         travel_date: datetime.date,
     ) -> RouteResult:
-        """Run a single Dijkstra search from the given start time."""
+        """Run a single A* search from the given start time."""
         # 1. Find start and destination stop clusters
         origin_stops = self._geo.find_nearest(
             origin_lat, origin_lon, k=8, max_distance_m=MAX_ORIGIN_RADIUS_M
@@ -176,249 +282,320 @@ class TransportRouter:
             logger.warning("No stops found near origin or destination")
             return RouteResult()
 
-        dest_ids: Set[str] = {s.stop_id for s, _ in dest_stops}
-        # Also include stops within DEST_CLUSTER_RADIUS of each dest stop
-        dest_cluster: Set[str] = set(dest_ids)
+        # Per-search state is kept in arrays indexed by each stop's row in
+        # the StopIndex, so the loop tests stops without hashing their ids
+        stops = self._geo.stops
+        stop_pos = self._geo.stop_positions
+        n_stops = len(stops)
+
+        # Also include stops within DEST_CLUSTER_RADIUS of each dest stop.
+        # Neighbouring dest stops share most of these, so keep each once.
+        nearby_goal: Dict[str, Stop] = {}
+        for transfers in self._geo.find_transfers_batch(
+                [stop.stop_id for stop, _ in dest_stops], DEST_CLUSTER_RADIUS_M):
+            nearby_goal.update((nearby.stop_id, nearby) for nearby, _ in transfers)
+        is_goal = bytearray(n_stops)
         for stop, _ in dest_stops:
-            for nearby, _ in self._geo.find_transfers(stop.stop_id,
-                                                       DEST_CLUSTER_RADIUS_M):
-                dest_cluster.add(nearby.stop_id)
+            is_goal[stop_pos[stop.stop_id]] = 1
+        for stop_id in nearby_goal:
+            is_goal[stop_pos[stop_id]] = 1
+        # Farthest any goal stop lies from the destination point
+        goal_radius_m = max(d for _, d in dest_stops)
+        for nearby in nearby_goal.values():
+            goal_radius_m = max(goal_radius_m, haversine_meters(
+                nearby.lat, nearby.lon, dest_lat, dest_lon))
+
+        # A* lower bound on the minutes from a stop to any goal stop,
+        # cached per stop (-1 = not computed yet).  Zero for every stop in
+        # the goal cluster.
+        remaining_min = array("d", [-1.0]) * n_stops
+
+        def min_remaining(pos: int) -> float:
+            h = remaining_min[pos]
+            if h < 0.0:
+                stop = stops[pos]
+                gap_m = haversine_meters(
+                    stop.lat, stop.lon, dest_lat, dest_lon) - goal_radius_m
+                h = remaining_min[pos] = max(gap_m, 0.0) * _MIN_PER_M_TRANSIT
+            return h
 
         # 2. Initialise Dijkstra
-        # best_cost[stop_id] = lowest cost seen
-        best_cost: Dict[str, float] = {}
-        # Priority queue: (cost, counter, state)
-        pq: list = []
-        counter = 0
+        # best_cost[stop] = lowest cost seen
+        best_cost = array("d", [math.inf]) * n_stops
+        # Priority queue of (cost + lower bound, state index into `states`);
+        # the plain cost is read back from `states`.  A monotone
+        # bucket queue (Dial) pops in the same order, but in pure Python it
+        # measured slower than the C-level heapq at these queue sizes.
+        states = _StateBuffer()
+        pq: List[Tuple[float, int]] = []
+
+        # The loop below runs tens of thousands of times per search, so
+        # attribute lookups it repeats are bound to locals once here
+        push, pop = heapq.heappush, heapq.heappop
+        WALK, walk_min_per_m = LegMode.WALK, _WALK_MIN_PER_M
+        walk_transfers_get = self._walk_transfers.get
+        load_walk_transfers = self._load_walk_transfers
+        get_departures = self._sched.get_departures
+        trip_columns_get = self._trip_columns.get
+        load_trip_columns = self._load_trip_columns
+        add_state = states.add
+        state_stop, state_cost = states.stop, states.cost
+        state_arrival, state_transfers = states.arrival, states.transfers
+        state_parent, state_leg = states.parent, states.leg
+
+        next_day = travel_date + datetime.timedelta(days=1)
+        overnight_cache = self._overnight_cache
 
         # Seed with walking from origin to each nearby stop
+        origin_stop = Stop(
+            stop_id="__origin__",
+            stop_name="Your location",
+            lat=origin_lat, lon=origin_lon,
+        )
         for stop, dist_m in origin_stops:
-            walk_min = (dist_m / 1000.0) / WALK_SPEED_KMH * 60.0
+            walk_min = dist_m * walk_min_per_m
             arrival = start_min + walk_min
             cost = walk_min  # no transfers yet
 
-            origin_stop = Stop(
-                stop_id="__origin__",
-                stop_name="Your location",
-                lat=origin_lat, lon=origin_lon,
-            )
-            agency_hint = stop.agency_prefix.rstrip('_').upper()
-            leg = RouteLeg(
-                mode=LegMode.WALK,
-                from_stop=origin_stop,
-                to_stop=stop,
-                departure_time=format_time(start_min),
-                arrival_time=format_time(arrival),
-                duration_minutes=round(walk_min, 1),
-                instructions=(
-                    f"Walk {dist_m:.0f}m to {stop.stop_name} "
-                    f"station ({agency_hint})"
-                ),
-            )
-            state = _State(stop.stop_id, arrival, 0, cost, None, leg)
-            heapq.heappush(pq, (cost, counter, state))
-            counter += 1
+            leg = (WALK, origin_stop, stop, start_min, arrival, dist_m)
+            pos = stop_pos[stop.stop_id]
+            idx = add_state(pos, arrival, 0, cost, -1, leg)
+            push(pq, (cost + min_remaining(pos), idx))
 
         # 3. Dijkstra main loop
-        goal_state: Optional[_State] = None
+        goal_idx = -1
         explored = 0
+        # Cost of the cheapest goal state pushed so far.  The bound is zero
+        # on goal stops, so that state pops before anything whose cost plus
+        # bound reaches this, and such candidates are never pushed.
+        goal_cost = math.inf
+        max_arrival = start_min + MAX_SEARCH_MINUTES
 
         while pq and explored < MAX_STATES_EXPLORED:
-            cost, _, state = heapq.heappop(pq)
+            _, idx = pop(pq)
+            pos = state_stop[idx]
+            cost = state_cost[idx]
 
             # Skip if we already found a better path to this stop
-            if state.stop_id in best_cost and best_cost[state.stop_id] <= cost:
+            if best_cost[pos] <= cost:
                 continue
-            best_cost[state.stop_id] = cost
+            best_cost[pos] = cost
             explored += 1
 
             # Check if we reached the destination cluster
-            if state.stop_id in dest_cluster:
-                goal_state = state
+            if is_goal[pos]:
+                goal_idx = idx
                 break
 
+            arrival_min = state_arrival[idx]
+            transfers_so_far = state_transfers[idx]
+            prev_leg = state_leg[idx]
+
             # Time budget exceeded?
-            elapsed = state.arrival_min - start_min
+            elapsed = arrival_min - start_min
             if elapsed > MAX_SEARCH_MINUTES:
                 continue
 
+            # Both expansions below leave from this stop
+            from_stop = stops[pos]
+            stop_id = from_stop.stop_id
+
             # ── Expand: BOARD + RIDE ─────────────────────────────────────
-            departures = self._sched.get_departures(
-                state.stop_id, state.arrival_min,
+            departures = get_departures(
+                stop_id, arrival_min,
                 limit=MAX_DEPARTURES_PER_STOP,
                 date=travel_date,
             )
 
+            # Each boarding is (departure, minutes added to the trip's
+            # times); today's departures are taken as they are.
+            boardings = zip(departures, repeat(0.0))
+
             # Overnight support: if current time is ≥ 22:00, also look
             # for early-morning departures (00:00–06:00 on the next day).
             # GTFS uses times >24:00 for overnight, but some agencies
             # encode them as 00:xx–06:xx on the next day's service.
-            if state.arrival_min >= 1320:  # 22:00
-                import datetime as _dt
-                next_day = travel_date + _dt.timedelta(days=1)
-                early_morning_deps = self._sched.get_departures(
-                    state.stop_id,
-                    after_minutes=0.0,  # from midnight
-                    limit=MAX_DEPARTURES_PER_STOP,
-                    date=next_day,
-                )
-                # Adjust times: add 1440 min (24h) so they sort after today's
-                for d in early_morning_deps:
-                    if d.departure_minutes < 360:  # only up to 06:00
-                        adjusted = Departure(
-                            trip_id=d.trip_id,
-                            stop_id=d.stop_id,
-                            departure_time=d.departure_time,
-                            departure_minutes=d.departure_minutes + 1440,
-                            stop_sequence=d.stop_sequence,
-                            route_id=d.route_id,
-                            agency_id=d.agency_id,
-                            trip_headsign=d.trip_headsign,
-                            route_type=d.route_type,
-                        )
-                        departures.append(adjusted)
-
-            for dep in departures:
+            if arrival_min >= 1320:  # 22:00
+                early = overnight_cache.get((stop_id, next_day))
+                if early is None:
+                    early_morning_deps = get_departures(
+                        stop_id,
+                        after_minutes=0.0,  # from midnight
+                        limit=MAX_DEPARTURES_PER_STOP,
+                        date=next_day,
+                    )
+                    # Offset by 1440 min (24h) so they sort after today's;
+                    # the shared Departure objects are left untouched
+                    early = [(d, 1440.0) for d in early_morning_deps
+                             if d.departure_minutes < 360]  # only up to 06:00
+                    overnight_cache[(stop_id, next_day)] = early
+                boardings = chain(boardings, early)
+
+            for dep, offset in boardings:
+                dep_min = dep.departure_minutes + offset
                 # Wait time at the stop
-                wait = dep.departure_minutes - state.arrival_min
+                wait = dep_min - arrival_min
                 if wait < 0:
                     continue
 
-                # Ride the trip forward — get all subsequent stops
-                trip_stops = self._sched.get_trip_stops_after(
-                    dep.trip_id, dep.stop_sequence
-                )
+                # Ride the trip forward — every stop after this one
+                columns = trip_columns_get(dep.trip_id)
+                if columns is None:
+                    columns = load_trip_columns(dep.trip_id)
+                seqs, arrivals, positions = columns
+                after = bisect_right(seqs, dep.stop_sequence)
 
                 mode = route_type_to_mode(dep.route_type)
-                from_stop = self._geo.get_stop(state.stop_id)
-                if from_stop is None:
-                    continue
 
-                for ts in trip_stops:
-                    to_stop = self._geo.get_stop(ts.stop_id)
-                    if to_stop is None:
-                        continue
+                # Count this as a new transfer if the agency changed.  It
+                # depends only on the trip boarded, so every stop reached
+                # on it shares the same penalty.
+                is_new_transfer = (
+                    prev_leg is not None
+                    and prev_leg[0] != WALK
+                    and prev_leg[5].trip_id != dep.trip_id
+                )
+                new_transfers = transfers_so_far + (1 if is_new_transfer else 0)
+                penalty = new_transfers * TRANSFER_PENALTY_MIN
+                elapsed_at_dep = dep_min - start_min
 
-                    ride_min = ts.arrival_minutes - dep.departure_minutes
+                for arr, to_pos in zip(arrivals[after:], positions[after:]):
+                    arr_min = arr + offset
+                    ride_min = arr_min - dep_min
                     if ride_min < 0:
                         continue
 
-                    total_elapsed = (dep.departure_minutes - start_min) + ride_min
-                    # Count this as a new transfer if the agency changed
-                    is_new_transfer = (
-                        state.leg is not None
-                        and state.leg.mode != LegMode.WALK
-                        and state.leg.trip_id != dep.trip_id
-                    )
-                    new_transfers = state.transfers + (1 if is_new_transfer else 0)
-                    new_cost = total_elapsed + (new_transfers * TRANSFER_PENALTY_MIN)
-
-                    if ts.stop_id in best_cost and best_cost[ts.stop_id] <= new_cost:
+                    new_cost = (elapsed_at_dep + ride_min) + penalty
+                    if best_cost[to_pos] <= new_cost:
+                        continue
+                    # Over budget: only worth keeping if it arrives
+                    if arr_min > max_arrival and not is_goal[to_pos]:
+                        continue
+                    f = new_cost + min_remaining(to_pos)
+                    if f >= goal_cost:
                         continue
 
-                    leg = RouteLeg(
-                        mode=mode,
-                        from_stop=from_stop,
-                        to_stop=to_stop,
-                        departure_time=format_time(dep.departure_minutes),
-                        arrival_time=format_time(ts.arrival_minutes),
-                        duration_minutes=round(ride_min, 1),
-                        agency=dep.agency_id,
-                        trip_id=dep.trip_id,
-                        trip_headsign=dep.trip_headsign,
-                        route_name=dep.route_id,
-                        instructions=(
-                            f"Take {mode.value.capitalize()} ({dep.agency_id}) "
-                            f"towards {dep.trip_headsign or 'destination'} — "
-                            f"ride {ride_min:.0f} min to {to_stop.stop_name}"
-                        ),
-                    )
-                    new_state = _State(
-                        ts.stop_id, ts.arrival_minutes, new_transfers,
-                        new_cost, state, leg,
+                    leg = (mode, from_stop, stops[to_pos], dep_min, arr_min, dep)
+                    new_idx = add_state(
+                        to_pos, arr_min, new_transfers,
+                        new_cost, idx, leg,
                     )
-                    heapq.heappush(pq, (new_cost, counter, new_state))
-                    counter += 1
+                    push(pq, (f, new_idx))
+                    if is_goal[to_pos]:
+                        goal_cost = new_cost
 
             # ── Expand: WALK transfer ────────────────────────────────────
-            transfers = self._geo.find_transfers(
-                state.stop_id, MAX_WALK_RADIUS_M
-            )
-            from_stop = self._geo.get_stop(state.stop_id)
-            if from_stop is None:
+            # Never chain a second transfer walk: anything it would reach
+            # from here is MAX_WALK_RADIUS_M from the stop walked from
+            # and reachable from there directly, or out of range by design.
+            # States seeded from the origin may still walk on, since only
+            # the nearest few stops are seeded.
+            if (prev_leg is not None and prev_leg[0] == WALK
+                    and state_parent[idx] >= 0):
                 continue
 
-            for nearby_stop, dist_m in transfers:
-                walk_min = (dist_m / 1000.0) / WALK_SPEED_KMH * 60.0
-                new_arrival = state.arrival_min + walk_min
-                new_cost = (new_arrival - start_min) + (state.transfers * TRANSFER_PENALTY_MIN)
+            walks = walk_transfers_get(pos)
+            if walks is None:
+                walks = load_walk_transfers(pos)
+            penalty = transfers_so_far * TRANSFER_PENALTY_MIN
+            for to_pos, nearby_stop, dist_m, walk_min in walks:
+                new_arrival = arrival_min + walk_min
+                new_cost = (new_arrival - start_min) + penalty
 
-                if nearby_stop.stop_id in best_cost and best_cost[nearby_stop.stop_id] <= new_cost:
+                if best_cost[to_pos] <= new_cost:
+                    continue
+                if new_arrival > max_arrival and not is_goal[to_pos]:
+                    continue
+                f = new_cost + min_remaining(to_pos)
+                if f >= goal_cost:
                     continue
 
-                leg = RouteLeg(
-                    mode=LegMode.WALK,
-                    from_stop=from_stop,
-                    to_stop=nearby_stop,
-                    departure_time=format_time(state.arrival_min),
-                    arrival_time=format_time(new_arrival),
-                    duration_minutes=round(walk_min, 1),
-                    instructions=(
-                        f"Walk {dist_m:.0f}m to {nearby_stop.stop_name} "
-                        f"({nearby_stop.agency_prefix.rstrip('_')})"
-                    ),
+                leg = (WALK, from_stop, nearby_stop,
+                       arrival_min, new_arrival, dist_m)
+                new_idx = add_state(
+                    to_pos, new_arrival, transfers_so_far,
+                    new_cost, idx, leg,
                 )
-                new_state = _State(
-                    nearby_stop.stop_id, new_arrival, state.transfers,
-                    new_cost, state, leg,
-                )
-                heapq.heappush(pq, (new_cost, counter, new_state))
-                counter += 1
+                push(pq, (f, new_idx))
+                if is_goal[to_pos]:
+                    goal_cost = new_cost
 
-        logger.info(f"Dijkstra explored {explored} states")
+        logger.info(f"A* explored {explored} states")
+        logger.debug("Schedule cache (hits, misses, size): %s",
+                     self._sched.cache_info())
 
         # 4. Reconstruct path
-        if goal_state is None:
+        if goal_idx < 0:
             logger.warning("No route found")
             return RouteResult()
 
         # Add final walk to exact destination if needed
-        final_stop = self._geo.get_stop(goal_state.stop_id)
+        goal_arrival = states.arrival[goal_idx]
+        final_stop = stops[states.stop[goal_idx]]
         if final_stop:
             dest_dist = haversine_meters(
                 final_stop.lat, final_stop.lon, dest_lat, dest_lon
             )
             if dest_dist > 50:  # only add if > 50m
-                walk_min = (dest_dist / 1000.0) / WALK_SPEED_KMH * 60.0
+                walk_min = dest_dist * walk_min_per_m
                 dest_stop = Stop("__dest__", "Destination", dest_lat, dest_lon)
-                final_leg = RouteLeg(
-                    mode=LegMode.WALK,
-                    from_stop=final_stop,
-                    to_stop=dest_stop,
-                    departure_time=format_time(goal_state.arrival_min),
-                    arrival_time=format_time(goal_state.arrival_min + walk_min),
-                    duration_minutes=round(walk_min, 1),
-                    instructions=f"Walk {dest_dist:.0f}m to your destination",
-                )
-                goal_state = _State(
-                    "__dest__", goal_state.arrival_min + walk_min,
-                    goal_state.transfers, goal_state.cost,
-                    goal_state, final_leg,
+                final_leg = (LegMode.WALK, final_stop, dest_stop,
+                             goal_arrival, goal_arrival + walk_min, dest_dist)
+                goal_idx = states.add(
+                    -1, goal_arrival + walk_min,
+                    states.transfers[goal_idx], states.cost[goal_idx],
+                    goal_idx, final_leg,
                 )
 
-        return self._reconstruct(goal_state, start_min)
+        return self._reconstruct(states, goal_idx, start_min)
 
     # ── private ──────────────────────────────────────────────────────────
 
+    def _load_walk_transfers(
+        self, pos: int,
+    ) -> List[Tuple[int, Stop, float, float]]:
+        """Cache the transfer walks from the stop at row *pos*."""
+        stop_pos = self._geo.stop_positions
+        walks = self._walk_transfers[pos] = [
+            (stop_pos[stop.stop_id], stop, dist_m, dist_m * _WALK_MIN_PER_M)
+            for stop, dist_m in self._geo.find_transfers(
+                self._geo.stops[pos].stop_id, MAX_WALK_RADIUS_M)
+        ]
+        return walks
+
+    def _load_trip_columns(
+        self, trip_id: str,
+    ) -> Tuple[List[int], List[float], List[int]]:
+        """Cache a trip's stops as parallel columns for riding it forward.
+
+        Stops missing from the StopIndex can't be routed through, so
+        they are left out here rather than skipped on every ride.
+        """
+        stop_pos = self._geo.stop_positions
+        seqs: List[int] = []
+        arrivals: List[float] = []
+        positions: List[int] = []
+        # Sequence -1 asks for all of the trip's stops
+        for ts in self._sched.get_trip_stops_after(trip_id, -1):
+            pos = stop_pos.get(ts.stop_id)
+            if pos is not None:
+                seqs.append(ts.stop_sequence)
+                arrivals.append(ts.arrival_minutes)
+                positions.append(pos)
+        columns = self._trip_columns[trip_id] = (seqs, arrivals, positions)
+        return columns
+
     @staticmethod
-    def _reconstruct(goal: _State, start_min: float) -> RouteResult:
+    def _reconstruct(states: _StateBuffer, goal_idx: int,
+                     start_min: float) -> RouteResult:
         """Walk the parent chain back to the origin and build a RouteResult."""
         legs: List[RouteLeg] = []
-        state: Optional[_State] = goal
-        while state is not None:
-            if state.leg is not None:
-                legs.append(state.leg)
-            state = state.parent
+        idx = goal_idx
+        while idx >= 0:
+            leg = states.leg[idx]
+            if leg is not None:
+                legs.append(_materialize_leg(leg))
+            idx = states.parent[idx]
 
         legs.reverse()
 
@@ -431,7 +608,7 @@ class TransportRouter:
 
         result = RouteResult(
             legs=merged,
-            total_duration_minutes=round(goal.arrival_min - start_min, 1),
+            total_duration_minutes=round(states.arrival[goal_idx] - start_min, 1),
             total_transfers=transfers,
             departure_time=merged[0].departure_time if merged else "",
             arrival_time=merged[-1].arrival_time if merged else "",
@@ -442,27 +619,30 @@ class TransportRouter:
 
 
 def _merge_walks(legs: List[RouteLeg]) -> List[RouteLeg]:
-    """Merge consecutive WALK legs into one."""
-    if not legs:
-        return legs
-
-    merged: List[RouteLeg] = [legs[0]]
-    for leg in legs[1:]:
-        prev = merged[-1]
-        if prev.mode == LegMode.WALK and leg.mode == LegMode.WALK:
-            # Merge
-            merged[-1] = RouteLeg(
+    """Merge each run of consecutive WALK legs into one."""
+    merged: List[RouteLeg] = []
+    i, n = 0, len(legs)
+    while i < n:
+        leg = legs[i]
+        j = i + 1
+        if leg.mode == LegMode.WALK:
+            while j < n and legs[j].mode == LegMode.WALK:
+                j += 1
+        if j - i == 1:
+            merged.append(leg)
+        else:
+            last = legs[j - 1]
+            walk_min = sum(w.duration_minutes for w in legs[i:j])
+            merged.append(RouteLeg(
                 mode=LegMode.WALK,
-                from_stop=prev.from_stop,
-                to_stop=leg.to_stop,
-                departure_time=prev.departure_time,
-                arrival_time=leg.arrival_time,
-                duration_minutes=round(prev.duration_minutes + leg.duration_minutes, 1),
+                from_stop=leg.from_stop,
+                to_stop=last.to_stop,
+                departure_time=leg.departure_time,
+                arrival_time=last.arrival_time,
+                duration_minutes=round(walk_min, 1),
                 instructions=(
-                    f"Walk {prev.duration_minutes + leg.duration_minutes:.0f} min "
-                    f"to {leg.to_stop.stop_name}"
+                    f"Walk {walk_min:.0f} min to {last.to_stop.stop_name}"
                 ),
-            )
-        else:
-            merged.append(leg)
+            ))
+        i = j
     return merged
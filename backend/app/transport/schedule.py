@@ -4,14 +4,20 @@ Schedule query layer — timetable lookups against the transport DB.
 All time handling uses "minutes since midnight" internally for fast
 comparison. GTFS times > 24:00 (overnight services) are supported.
 
+Times are read from the precomputed (REAL) departure_min / arrival_min
+columns when the transport DB has them (see tools/transportdata.py), and
+parsed from the HH:MM:SS strings otherwise.  REAL because seconds are
+kept as fractions of a minute, matching parse_gtfs_time.
+
 Date filtering:
     - Uses calendar table (day-of-week rules + date ranges)
     - Uses calendar_dates for exceptions (added/removed services)
-    - Valid service IDs are cached per date (one query per date)
+    - Both tables are read once; valid service IDs are cached per date
 
 Public API
 ----------
 ScheduleService  — query object with caching
+LRUCache         — size-bounded dict used for its caches
 parse_gtfs_time  — convert "HH:MM:SS" → minutes since midnight
 format_time      — convert minutes → "HH:MM"
 """
@@ -19,14 +25,29 @@ format_time      — convert minutes → "HH:MM"
 from __future__ import annotations
 
 import datetime
-from typing import Dict, List, Optional, Set, Tuple
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
 
 from app.transport.connection import transport_cursor
 from app.transport.models import Departure, TripStopEntry
 
+logger = logging.getLogger(__name__)
+
 
 # ─── Time Utilities ──────────────────────────────────────────────────────────
 
+# Zero-padded "HH:MM" → minutes and "SS" → seconds, covering every
+# canonical GTFS time up to 99:59:59 with two dict lookups
+_HHMM_MINUTES = {f"{h:02d}:{m:02d}": h * 60 + m for h in range(100) for m in range(60)}
+_SS_SECONDS = {f"{s:02d}": s for s in range(60)}
+
+
 def parse_gtfs_time(time_str: str) -> float:
     """Convert GTFS time string "HH:MM:SS" to minutes since midnight.
 
@@ -35,6 +56,12 @@ def parse_gtfs_time(time_str: str) -> float:
     """
     if not time_str:
         return -1.0
+    # Fast path: the canonical layout, without splitting or int()
+    if len(time_str) == 8 and time_str[5] == ":":
+        minutes = _HHMM_MINUTES.get(time_str[:5])
+        seconds = _SS_SECONDS.get(time_str[6:])
+        if minutes is not None and seconds is not None:
+            return minutes + seconds / 60.0
     try:
         parts = time_str.strip().split(":")
         h = int(parts[0])
@@ -62,6 +89,9 @@ def _minutes_to_time_str(minutes: float) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
+# Trips per IN (...) query, under SQLite's default 999 bound parameters
+_TRIP_META_BATCH = 900
+
 # Day-of-week column names matching calendar table
 _DOW_COLUMNS = [
     "monday", "tuesday", "wednesday", "thursday",
@@ -69,6 +99,63 @@ _DOW_COLUMNS = [
 ]
 
 
+@dataclass(slots=True)
+class _CalendarTable:
+    """The calendar table as columns, so a date is checked against every
+    service in a few vectorised comparisons."""
+    service_ids: np.ndarray   # object
+    weekdays: np.ndarray      # bool, one row per service, Monday first
+    start_dates: np.ndarray   # "YYYYMMDD" strings, compared as text like SQL
+    end_dates: np.ndarray
+
+
+# ─── LRU cache ───────────────────────────────────────────────────────────────
+
+class LRUCache(OrderedDict):
+    """Dict holding at most *maxsize* entries, dropping the least recently used.
+
+    Reads through ``get()`` or ``[]`` count as a use and ``get()`` tallies
+    hits and misses; ``in`` neither refreshes an entry nor counts.  Reads
+    and writes hold a lock, since routes are served from a threadpool and
+    another request could evict a key between the lookup and the reorder.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = super().__getitem__(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.move_to_end(key)
+            return value
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            if len(self) > self.maxsize:
+                self.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+
+
 # ─── ScheduleService ─────────────────────────────────────────────────────────
 
 class ScheduleService:
@@ -78,21 +165,45 @@ class ScheduleService:
     - Valid service IDs per date (calendar + exceptions)
     - Trip metadata (route, agency, headsign)
     - Trip stop sequences  
+    - Each stop's departures for a date, sorted by time
     """
 
     MAX_DEPARTURES = 15
 
+    # Cache bounds, so a long-running server doesn't keep every trip,
+    # stop and date it has ever been asked about
+    TRIP_META_CACHE_SIZE = 10_000
+    TRIP_STOPS_CACHE_SIZE = 20_000
+    VALID_SERVICES_CACHE_SIZE = 64          # dates
+    STOP_DEPARTURES_CACHE_SIZE = 2_000      # (stop, date) pairs
+
     def __init__(self) -> None:
-        # Cache: trip_id → (route_id, agency_id, trip_headsign, route_type)
-        self._trip_meta: Dict[str, Tuple[str, str, str, int]] = {}
+        # Cache: trip_id → (route_id, agency_id, trip_headsign, route_type,
+        #                   interned service id; see _service_id)
+        self._trip_meta: LRUCache = LRUCache(self.TRIP_META_CACHE_SIZE)
         # Cache: trip_id → full list of TripStopEntry
-        self._trip_stops: Dict[str, List[TripStopEntry]] = {}
-        # Cache: trip_id → service_id
-        self._trip_service: Dict[str, str] = {}
+        self._trip_stops: LRUCache = LRUCache(self.TRIP_STOPS_CACHE_SIZE)
+        # service_id → small int, so per-row service checks hash ints;
+        # 0 stands for a trip with no service_id, which always runs
+        self._service_ids: Dict[str, int] = {"": 0}
+        # Held while assigning a new id, so two threads can't give two
+        # services the same one
+        self._service_ids_lock = threading.Lock()
         # Cache: date_str → set of valid service_ids
-        self._valid_services: Dict[str, Set[str]] = {}
+        self._valid_services: LRUCache = LRUCache(self.VALID_SERVICES_CACHE_SIZE)
+        # Cache: date_str → the same set, as interned ids
+        self._valid_service_ids: LRUCache = LRUCache(self.VALID_SERVICES_CACHE_SIZE)
         # Services that have NO calendar data at all → always allowed
         self._uncalendared: Optional[Set[str]] = None
+        # The calendar table as columns, and calendar_dates as
+        # date_str → [(service_id, exception_type)], loaded on first use
+        self._calendar: Optional[_CalendarTable] = None
+        self._calendar_exceptions: Dict[str, List[Tuple[str, int]]] = {}
+        # Cache: (stop_id, date_str) → (departure minutes, departures),
+        # both sorted by time; date_str is "" when no date filter applies
+        self._stop_departures: LRUCache = LRUCache(self.STOP_DEPARTURES_CACHE_SIZE)
+        # Whether stop_times has precomputed minute columns (None = unchecked)
+        self._minute_columns: Optional[bool] = None
 
     # ── date / service filtering ────────────────────────────────────────
 
@@ -115,6 +226,51 @@ class ScheduleService:
 
         return self._uncalendared
 
+    def _load_calendar(self) -> None:
+        """Read the calendar and calendar_dates tables into memory, once.
+
+        Both are small next to stop_times, and holding them lets every
+        new date be resolved without a query.
+        """
+        if self._calendar is not None:
+            return
+
+        rows: List[Tuple[str, List[bool], str, str]] = []
+        exceptions: Dict[str, List[Tuple[str, int]]] = {}
+        with transport_cursor() as cur:
+            cur.execute(f"""
+                SELECT service_id, {", ".join(_DOW_COLUMNS)}, start_date, end_date
+                FROM calendar
+            """)
+            for row in cur:
+                # A missing bound never matched the old per-date query either
+                if row["start_date"] is None or row["end_date"] is None:
+                    continue
+                rows.append((
+                    row["service_id"],
+                    # int() so flags stored as TEXT '1' still count, as
+                    # they did under the old SQL comparison's affinity
+                    [int(row[col] or 0) == 1 for col in _DOW_COLUMNS],
+                    row["start_date"], row["end_date"],
+                ))
+
+            cur.execute("SELECT service_id, date, exception_type FROM calendar_dates")
+            for row in cur:
+                # Keyed as text: an INTEGER date column must still match
+                # the "%Y%m%d" lookup key
+                exceptions.setdefault(str(row["date"]), []).append(
+                    (row["service_id"], int(row["exception_type"])))
+
+        service_ids, weekdays, start_dates, end_dates = (
+            zip(*rows) if rows else ((), (), (), ()))
+        self._calendar_exceptions = exceptions
+        self._calendar = _CalendarTable(
+            service_ids=np.array(service_ids, dtype=object),
+            weekdays=np.array(weekdays, dtype=bool).reshape(len(rows), 7),
+            start_dates=np.array(start_dates, dtype=str),
+            end_dates=np.array(end_dates, dtype=str),
+        )
+
     def get_valid_services(self, date: datetime.date) -> Set[str]:
         """Get the set of service_ids that run on a given date.
 
@@ -125,37 +281,26 @@ class ScheduleService:
         """
         date_key = date.strftime("%Y%m%d")
 
-        if date_key in self._valid_services:
-            return self._valid_services[date_key]
+        cached = self._valid_services.get(date_key)
+        if cached is not None:
+            return cached
 
+        self._load_calendar()
         dow = date.weekday()  # 0 = Monday ... 6 = Sunday
-        dow_col = _DOW_COLUMNS[dow]
-        date_str = date.strftime("%Y%m%d")
 
-        valid: Set[str] = set()
+        # 1. Regular calendar: service runs on this weekday within date range
+        cal = self._calendar
+        active = (cal.weekdays[:, dow]
+                  & (cal.start_dates <= date_key)
+                  & (cal.end_dates >= date_key))
+        valid: Set[str] = set(cal.service_ids[active].tolist())
 
-        with transport_cursor() as cur:
-            # 1. Regular calendar: service runs on this weekday within date range
-            cur.execute(f"""
-                SELECT service_id FROM calendar
-                WHERE {dow_col} = 1
-                  AND start_date <= ?
-                  AND end_date   >= ?
-            """, (date_str, date_str))
-            for row in cur:
-                valid.add(row["service_id"])
-
-            # 2. Calendar exceptions: type 1 = added, type 2 = removed
-            cur.execute("""
-                SELECT service_id, exception_type FROM calendar_dates
-                WHERE date = ?
-            """, (date_str,))
-            for row in cur:
-                sid = row["service_id"]
-                if int(row["exception_type"]) == 1:
-                    valid.add(sid)        # service added for this date
-                elif int(row["exception_type"]) == 2:
-                    valid.discard(sid)    # service removed for this date
+        # 2. Calendar exceptions: type 1 = added, type 2 = removed
+        for sid, exception_type in self._calendar_exceptions.get(date_key, ()):
+            if exception_type == 1:
+                valid.add(sid)        # service added for this date
+            elif exception_type == 2:
+                valid.discard(sid)    # service removed for this date
 
         # 3. Services with no calendar data at all → always valid
         valid |= self._get_uncalendared_services()
@@ -163,6 +308,26 @@ class ScheduleService:
         self._valid_services[date_key] = valid
         return valid
 
+    def _service_id(self, service_id: str) -> int:
+        """Intern a service_id as a small int, stable for this service's life."""
+        sid = self._service_ids.get(service_id)
+        if sid is None:
+            with self._service_ids_lock:
+                # Another thread may have interned it while we waited
+                sid = self._service_ids.get(service_id)
+                if sid is None:
+                    sid = self._service_ids[service_id] = len(self._service_ids)
+        return sid
+
+    def _get_valid_service_ids(self, date: datetime.date) -> FrozenSet[int]:
+        """:meth:`get_valid_services` as interned ids, cached per date."""
+        date_key = date.strftime("%Y%m%d")
+        ids = self._valid_service_ids.get(date_key)
+        if ids is None:
+            ids = self._valid_service_ids[date_key] = frozenset(
+                map(self._service_id, self.get_valid_services(date)))
+        return ids
+
     def get_data_date_range(self) -> Tuple[str, str]:
         """Return (earliest_date, latest_date) covered by the schedule data."""
         with transport_cursor() as cur:
@@ -172,114 +337,183 @@ class ScheduleService:
                 return (row["MIN(start_date)"], row["MAX(end_date)"])
         return ("unknown", "unknown")
 
+    def _has_minute_columns(self) -> bool:
+        """True if stop_times carries the departure_min / arrival_min columns."""
+        if self._minute_columns is None:
+            with transport_cursor() as cur:
+                cur.execute("PRAGMA table_info(stop_times)")
+                columns = {row["name"] for row in cur}
+            self._minute_columns = {"departure_min", "arrival_min"} <= columns
+        return self._minute_columns
+
     # ── trip metadata (cached) ──────────────────────────────────────────
 
     def _get_trip_meta(self, trip_id: str) -> Tuple[str, str, str, int]:
         """Get (route_id, agency_id, trip_headsign, route_type) for a trip."""
-        if trip_id in self._trip_meta:
-            return self._trip_meta[trip_id]
+        return self._prefetch_trip_meta((trip_id,))[trip_id][:4]
 
-        with transport_cursor() as cur:
-            cur.execute("""
-                SELECT
-                    COALESCE(t.route_id, '')      AS route_id,
-                    COALESCE(t.agency_id, '')     AS agency_id,
-                    COALESCE(t.trip_headsign, '') AS trip_headsign,
-                    COALESCE(t.service_id, '')    AS service_id,
-                    COALESCE(r.route_type, 3)     AS route_type
-                FROM trips t
-                LEFT JOIN routes r ON t.route_id = r.route_id
-                WHERE t.trip_id = ?
-            """, (trip_id,))
-            row = cur.fetchone()
+    def _prefetch_trip_meta(
+        self, trip_ids: Iterable[str],
+    ) -> Dict[str, Tuple[str, str, str, int, int]]:
+        """Get metadata and service for many trips, fetching uncached ones in bulk.
 
-        if row:
-            meta = (row["route_id"], row["agency_id"],
-                    row["trip_headsign"], int(row["route_type"] or 3))
-            self._trip_service[trip_id] = row["service_id"]
-        else:
-            meta = ("", "", "", 3)
-            self._trip_service[trip_id] = ""
+        One IN query per _TRIP_META_BATCH trips rather than one per trip.
+        Trips missing from the trips table get empty metadata.  The
+        result holds every requested trip even if the cache evicted it.
+        """
+        found: Dict[str, Tuple[str, str, str, int, int]] = {}
+        needed: List[str] = []
+        for trip_id in set(trip_ids):
+            meta = self._trip_meta.get(trip_id)
+            if meta is None:
+                needed.append(trip_id)
+            else:
+                found[trip_id] = meta
+        if not needed:
+            return found
+
+        with transport_cursor() as cur:
+            for start in range(0, len(needed), _TRIP_META_BATCH):
+                batch = needed[start:start + _TRIP_META_BATCH]
+                cur.execute(f"""
+                    SELECT
+                        t.trip_id,
+                        COALESCE(t.route_id, '')      AS route_id,
+                        COALESCE(t.agency_id, '')     AS agency_id,
+                        COALESCE(t.trip_headsign, '') AS trip_headsign,
+                        COALESCE(t.service_id, '')    AS service_id,
+                        COALESCE(r.route_type, 3)     AS route_type
+                    FROM trips t
+                    LEFT JOIN routes r ON t.route_id = r.route_id
+                    WHERE t.trip_id IN ({",".join("?" * len(batch))})
+                """, batch)
+                for row in cur:
+                    found[row["trip_id"]] = (
+                        row["route_id"], row["agency_id"],
+                        row["trip_headsign"], int(row["route_type"] or 3),
+                        self._service_id(row["service_id"]),
+                    )
 
-        self._trip_meta[trip_id] = meta
-        return meta
+        for trip_id in needed:
+            meta = found.setdefault(trip_id, ("", "", "", 3, 0))
+            self._trip_meta[trip_id] = meta
+        return found
 
-    def _get_trip_service(self, trip_id: str) -> str:
-        """Get the service_id for a trip (cached alongside metadata)."""
-        if trip_id not in self._trip_service:
-            self._get_trip_meta(trip_id)  # populates _trip_service
-        return self._trip_service.get(trip_id, "")
+    def _get_trip_service(self, trip_id: str) -> int:
+        """Get the interned service id for a trip (cached alongside metadata)."""
+        return self._prefetch_trip_meta((trip_id,))[trip_id][4]
 
     # ── departures from a stop ──────────────────────────────────────────
 
-    def get_departures(self, stop_id: str,
-                       after_minutes: float,
-                       limit: int | None = None,
-                       date: datetime.date | None = None) -> List[Departure]:
-        """Get upcoming departures from a stop after a given time.
+    def _get_stop_departures(
+        self, stop_id: str, date: datetime.date | None,
+    ) -> Tuple[List[float], List[Departure]]:
+        """Get every departure from a stop that runs on `date`, by time.
 
-        If `date` is provided, only returns trips whose service runs
-        on that date (checked against calendar + calendar_dates).
+        Loaded with one query per (stop, date) and cached, so later
+        lookups at other times of day only bisect the cached times.
         """
-        limit = limit or self.MAX_DEPARTURES
-        after_str = _minutes_to_time_str(after_minutes)
-        window_end_str = _minutes_to_time_str(after_minutes + 120)
+        key = (stop_id, date.strftime("%Y%m%d") if date is not None else "")
+        cached = self._stop_departures.get(key)
+        if cached is not None:
+            return cached
 
-        # Pre-compute valid services for this date
-        valid_services: Optional[Set[str]] = None
+        valid_services: Optional[FrozenSet[int]] = None
         if date is not None:
-            valid_services = self.get_valid_services(date)
+            valid_services = self._get_valid_service_ids(date)
+
+        # Precomputed minutes skip parsing every row; NULL means "parse it"
+        if self._has_minute_columns():
+            minutes_col, order_col = "st.departure_min", "st.departure_min"
+        else:
+            minutes_col, order_col = "NULL", "st.departure_time"
 
+        # The trip's service comes with each row, so trips that don't run
+        # that day are dropped before their metadata is fetched or cached
         with transport_cursor() as cur:
-            cur.execute("""
-                SELECT trip_id, stop_id, departure_time, stop_sequence
-                FROM stop_times
-                WHERE stop_id = ?
-                  AND departure_time >= ?
-                  AND departure_time <= ?
-                ORDER BY departure_time
-                LIMIT ?
-            """, (stop_id, after_str, window_end_str, limit * 5))
-            # Fetch extra rows (limit*5) because some will be filtered by date
-
-            results: List[Departure] = []
-            seen_trips: set = set()
+            cur.execute(f"""
+                SELECT st.trip_id, st.stop_id, st.departure_time, st.stop_sequence,
+                       {minutes_col} AS departure_min,
+                       COALESCE(t.service_id, '') AS service_id
+                FROM stop_times st
+                LEFT JOIN trips t ON t.trip_id = st.trip_id
+                WHERE st.stop_id = ?
+                ORDER BY {order_col}
+            """, (stop_id,))
+            rows = cur.fetchall()
+
+        if valid_services is not None:
+            # Trips without a service_id (or trip row) always run
+            rows = [row for row in rows
+                    if not row["service_id"]
+                    or self._service_id(row["service_id"]) in valid_services]
+
+        # Metadata for every running trip not seen yet, before walking the rows
+        trip_meta = self._prefetch_trip_meta(row["trip_id"] for row in rows)
+
+        departures: List[Departure] = []
+        for row in rows:
+            trip_id = row["trip_id"]
+            route_id, agency_id, headsign, route_type, _ = trip_meta[trip_id]
+
+            dep_min = row["departure_min"]
+            if dep_min is None:
+                dep_min = parse_gtfs_time(row["departure_time"])
+            if dep_min < 0:
+                continue
+
+            departures.append(Departure(
+                trip_id=trip_id,
+                stop_id=row["stop_id"],
+                departure_time=row["departure_time"],
+                departure_minutes=dep_min,
+                stop_sequence=int(row["stop_sequence"] or 0),
+                route_id=route_id,
+                agency_id=agency_id,
+                trip_headsign=headsign,
+                route_type=route_type,
+            ))
+
+        # Stable, so equal times keep the query's order
+        departures.sort(key=lambda d: d.departure_minutes)
+        cached = ([d.departure_minutes for d in departures], departures)
+        self._stop_departures[key] = cached
+        return cached
 
-            for row in cur:
-                trip_id = row["trip_id"]
-                if trip_id in seen_trips:
-                    continue
-                seen_trips.add(trip_id)
+    def get_departures(self, stop_id: str,
+                       after_minutes: float,
+                       limit: int | None = None,
+                       date: datetime.date | None = None) -> List[Departure]:
+        """Get upcoming departures from a stop after a given time.
 
-                # Date filter: check if this trip's service runs today
-                if valid_services is not None:
-                    service_id = self._get_trip_service(trip_id)
-                    if service_id and service_id not in valid_services:
-                        continue
+        Only departures within two hours of `after_minutes` are returned,
+        one per trip.  If `date` is provided, only returns trips whose
+        service runs on that date (checked against calendar +
+        calendar_dates).  The returned Departures are shared with the
+        cache and must not be modified.
+        """
+        limit = limit or self.MAX_DEPARTURES
+        times, departures = self._get_stop_departures(stop_id, date)
 
-                dep_min = parse_gtfs_time(row["departure_time"])
-                if dep_min < 0:
-                    continue
+        # Window bounds in whole seconds, as the timetable stores them
+        window_start = parse_gtfs_time(_minutes_to_time_str(after_minutes))
+        window_end = parse_gtfs_time(_minutes_to_time_str(after_minutes + 120))
 
-                route_id, agency_id, headsign, route_type = \
-                    self._get_trip_meta(trip_id)
-
-                results.append(Departure(
-                    trip_id=trip_id,
-                    stop_id=row["stop_id"],
-                    departure_time=row["departure_time"],
-                    departure_minutes=dep_min,
-                    stop_sequence=int(row["stop_sequence"] or 0),
-                    route_id=route_id,
-                    agency_id=agency_id,
-                    trip_headsign=headsign,
-                    route_type=route_type,
-                ))
+        results: List[Departure] = []
+        seen_trips: set = set()
+        for i in range(bisect_left(times, window_start), len(times)):
+            if times[i] > window_end:
+                break
+            dep = departures[i]
+            if dep.trip_id in seen_trips:
+                continue
+            seen_trips.add(dep.trip_id)
 
-                if len(results) >= limit:
-                    break
+            results.append(dep)
+            if len(results) >= limit:
+                break
 
-            return results
+        return results
 
     # ── ride a trip forward (cached) ────────────────────────────────────
 
@@ -289,33 +523,59 @@ class ScheduleService:
 
         Results are cached per trip_id.
         """
-        if trip_id not in self._trip_stops:
+        entries = self._trip_stops.get(trip_id)
+        if entries is None:
+            minutes_col = ("arrival_min" if self._has_minute_columns()
+                           else "NULL")
+            entries = []
             with transport_cursor() as cur:
-                cur.execute("""
-                    SELECT stop_id, arrival_time, stop_sequence
+                cur.execute(f"""
+                    SELECT stop_id, arrival_time, stop_sequence,
+                           {minutes_col} AS arrival_min
                     FROM stop_times
                     WHERE trip_id = ?
                     ORDER BY stop_sequence
                 """, (trip_id,))
 
-                self._trip_stops[trip_id] = [
-                    TripStopEntry(
+                for row in cur:
+                    arr_min = row["arrival_min"]
+                    if arr_min is None:
+                        arr_min = parse_gtfs_time(row["arrival_time"])
+                    if arr_min < 0:
+                        continue
+                    entries.append(TripStopEntry(
                         stop_id=row["stop_id"],
                         arrival_time=row["arrival_time"],
-                        arrival_minutes=parse_gtfs_time(row["arrival_time"]),
+                        arrival_minutes=arr_min,
                         stop_sequence=int(row["stop_sequence"]),
-                    )
-                    for row in cur
-                    if parse_gtfs_time(row["arrival_time"]) >= 0
-                ]
+                    ))
+            self._trip_stops[trip_id] = entries
 
-        return [ts for ts in self._trip_stops[trip_id]
+        return [ts for ts in entries
                 if ts.stop_sequence > after_sequence]
 
+    def cache_info(self) -> Dict[str, Tuple[int, int, int]]:
+        """Return (hits, misses, size) for each bounded cache."""
+        return {
+            name: (cache.hits, cache.misses, len(cache))
+            for name, cache in (
+                ("trip_meta", self._trip_meta),
+                ("trip_stops", self._trip_stops),
+                ("valid_services", self._valid_services),
+                ("valid_service_ids", self._valid_service_ids),
+                ("stop_departures", self._stop_departures),
+            )
+        }
+
     def clear_cache(self) -> None:
         """Clear all caches."""
         self._trip_meta.clear()
         self._trip_stops.clear()
-        self._trip_service.clear()
         self._valid_services.clear()
+        self._valid_service_ids.clear()
+        self._service_ids = {"": 0}
         self._uncalendared = None
+        self._calendar = None
+        self._calendar_exceptions = {}
+        self._stop_departures.clear()
+        self._minute_columns = None
@@ -26,14 +26,17 @@ async def lifespan(app: FastAPI):
 
     # Initialize transport router
     try:
+        from app.transport.connection import get_transport_db
         from app.transport.geo import StopIndex
         from app.transport.router import TransportRouter
         from app.transport.schedule import ScheduleService
 
+        get_transport_db()  # fail fast here if transport.db is missing
         _stop_index = StopIndex()
-        _stop_index.load()
+        # The KDTree builds in the background; early requests wait for it
+        _stop_index.preload()
         _transport_router = TransportRouter(_stop_index, ScheduleService())
-        print(f"[TRANSPORT] Router initialized — {_stop_index.size:,} stops indexed")
+        print("[TRANSPORT] Router initialized — stop index loading in background")
     except FileNotFoundError as e:
         print(f"[TRANSPORT] ⚠  Skipping router init: {e}")
     except Exception as e:
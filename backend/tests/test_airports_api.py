@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+from main import app
+from app.database.airport_repository import AirportRepository
+from app.parsers.openflights_loader import OpenFlightsLoader
+
+client = TestClient(app)
+
+
+def test_airport_lists_match_repository(db_conn):
+    """Test the pre-encoded airport lists carry the same JSON as the repository rows."""
+    AirportRepository.bulk_insert_airports(OpenFlightsLoader.get_sample_airports())
+    airports = AirportRepository.get_all_airports()
+
+    response = client.get("/api/airports")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"airports": airports, "count": len(airports)}
+
+    found = client.get("/api/airports/search", params={"q": "Paulo"}).json()
+    assert [a["iata"] for a in found["airports"]] == ["GRU"]
+    assert found["count"] == 1
@@ -0,0 +1,55 @@
+import pytest
+from app.database.airline_repository import AirlineRepository
+from app.database.flight_schedule_repository import FlightScheduleRepository
+from app.database.models import AirlineDB, FlightScheduleDB
+
+@pytest.fixture
+def airlines(db_conn):
+    AirlineRepository.bulk_insert_airlines([
+        AirlineDB(icao="RYR", iata="FR", name="Ryanair"),
+        AirlineDB(icao="TAP", iata="TP", name="TAP Air Portugal"),
+    ])
+
+def test_bulk_insert_airlines_skips_existing(db_conn):
+    """Test that airlines already in the DB are ignored and not counted."""
+    AirlineRepository.create_airline(AirlineDB(icao="RYR", iata="FR", name="Ryanair"))
+
+    inserted = AirlineRepository.bulk_insert_airlines([
+        AirlineDB(icao="RYR", iata="FR", name="Ryanair (dup)"),
+        AirlineDB(icao="TAP", iata="TP", name="TAP Air Portugal"),
+    ])
+
+    assert inserted == 1
+    assert AirlineRepository.get_by_icao("RYR").name == "Ryanair"
+    assert AirlineRepository.get_by_icao("TAP") is not None
+
+def test_bulk_upsert_inserts_and_updates(db_conn, airlines):
+    """Test that bulk_upsert updates existing schedules and inserts new ones."""
+    existing = FlightScheduleRepository.create_or_update(
+        FlightScheduleDB(flight_number="FR2160", airline_icao="RYR", aircraft_type=None)
+    )
+
+    written = FlightScheduleRepository.bulk_upsert([
+        FlightScheduleDB(flight_number="FR2160", airline_icao="RYR",
+                         aircraft_type="Boeing 737 MAX 8", origin_airport="OPO", destination_airport="TSF"),
+        FlightScheduleDB(flight_number="TP1713", airline_icao="TAP", aircraft_type="Airbus A320"),
+    ])
+
+    assert written == 2
+    updated = FlightScheduleRepository.get_by_flight_number("FR2160")
+    assert updated.id == existing.id
+    assert updated.aircraft_type == "Boeing 737 MAX 8"
+    assert updated.destination_airport == "TSF"
+    assert FlightScheduleRepository.get_by_flight_number("TP1713").aircraft_type == "Airbus A320"
+
+def test_bulk_upsert_duplicate_input_last_wins(db_conn, airlines):
+    """Test that duplicate keys in one call produce a single row with the last values."""
+    FlightScheduleRepository.bulk_upsert([
+        FlightScheduleDB(flight_number="TP1713", airline_icao="TAP", aircraft_type="Airbus A320"),
+        FlightScheduleDB(flight_number="TP1713", airline_icao="TAP", aircraft_type="Airbus A321"),
+    ])
+
+    rows = db_conn.execute(
+        "SELECT aircraft_type FROM flight_schedules WHERE flight_number = 'TP1713'"
+    ).fetchall()
+    assert [r["aircraft_type"] for r in rows] == ["Airbus A321"]
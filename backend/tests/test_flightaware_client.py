@@ -0,0 +1,55 @@
+from app.parsers.flightaware_client import FlightAwareClient
+
+
+def test_parse_response_full_flight():
+    data = {
+        "flights": [{
+            "operator": "TAP",
+            "aircraft_type": "A320",
+            "status": "Scheduled",
+            "origin": {"code_iata": "LIS", "code": "LPPT", "name": "Lisbon", "city": "Lisbon",
+                       "timezone": "Europe/Lisbon"},
+            "destination": {"code": "LPMA", "name": "Madeira", "city": "Funchal",
+                            "timezone": "Atlantic/Madeira"},
+            "gate_origin": "A12",
+            "terminal_destination": "1",
+            "scheduled_off": "2026-12-27T07:00:00Z",
+            "scheduled_in": "2026-12-27T08:40:00Z",
+            "route_distance": 535,
+        }]
+    }
+
+    info = FlightAwareClient._parse_response("TP1713", data)
+
+    assert info.flight_number == "TP1713"
+    assert info.origin.code == "LIS"
+    assert info.origin.gate == "A12"
+    assert info.destination.code == "LPMA"  # falls back to ICAO code
+    assert info.destination.terminal == "1"
+    assert info.scheduled_departure == info.dep_time == "2026-12-27T07:00:00Z"
+    assert info.scheduled_arrival == info.arr_time == "2026-12-27T08:40:00Z"
+    assert info.route_distance == "535"
+    assert info.dep_timezone == "Europe/Lisbon"
+    assert info.arr_timezone == "Atlantic/Madeira"
+
+
+def test_parse_response_sparse_airports():
+    """Airports without a code or name are dropped, but their timezone is still used."""
+    data = {
+        "flights": [{
+            "origin": {"city": "Lisbon", "timezone": "Europe/Lisbon"},
+            "destination": None,
+        }]
+    }
+
+    info = FlightAwareClient._parse_response("TP1713", data)
+
+    assert info.origin is None
+    assert info.destination is None
+    assert info.dep_timezone == "Europe/Lisbon"
+    assert info.arr_timezone is None
+    assert info.route_distance is None
+
+
+def test_parse_response_no_flights():
+    assert FlightAwareClient._parse_response("TP1713", {"flights": []}) is None
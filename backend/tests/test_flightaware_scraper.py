@@ -0,0 +1,117 @@
+import pytest
+from lxml import html as lxml_html
+from app.parsers import flightaware_scraper
+from app.parsers.flightaware_scraper import FlightAwareScraper
+from app.database.airline_repository import AirlineRepository
+from app.database.flight_schedule_repository import FlightScheduleRepository
+from app.database.models import AirlineDB
+
+ELEMENT_PAGE = """<html><head><title>FR2160 Ryanair</title></head><body>
+<h1 class="flightPageSummaryAirports">OPO to <span>TSF</span></h1>
+<div class="flightPageDataLabel">Aircraft</div>
+<span class="flightPageData aircraft-type"> Boeing 737 MAX 8 </span>
+<a href="/live/fleet/RYR">Ryanair</a>
+</body></html>"""
+
+TEXT_ONLY_PAGE = """<html><body>
+<p>Operated with an Airbus A320-200 today</p>
+</body></html>"""
+
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.content = text.encode()
+        self.status_code = status_code
+
+@pytest.fixture
+def ryanair(db_conn):
+    AirlineRepository.create_airline(AirlineDB(icao="RYR", iata="FR", name="Ryanair"))
+
+def fake_page(monkeypatch, text, status_code=200):
+    monkeypatch.setattr(flightaware_scraper._SESSION, "get",
+                        lambda *a, **kw: FakeResponse(text, status_code))
+
+def test_scrape_flight_from_elements(ryanair, monkeypatch):
+    """Test aircraft and route are read from their page elements."""
+    fake_page(monkeypatch, ELEMENT_PAGE)
+
+    schedule = FlightAwareScraper.scrape_flight("FR2160")
+
+    assert schedule.flight_number == "FR2160"
+    assert schedule.airline_icao == "RYR"
+    assert schedule.aircraft_type == "Boeing 737 MAX 8"
+    assert (schedule.origin_airport, schedule.destination_airport) == ("OPO", "TSF")
+
+def test_scrape_flight_fast_path_skips_dom(ryanair, monkeypatch):
+    """Test plain-text elements are read from the raw HTML without parsing a tree."""
+    page = ('<h1 class="flightPageSummaryAirports">OPO to TSF</h1>'
+            '<div class="flightPageAircraftText">Boeing 737-800</div>'
+            '<div class="x flightPageAirlineText">Ryan &amp; Co</div>')
+    fake_page(monkeypatch, page)
+    monkeypatch.setattr(flightaware_scraper.lxml_html, "fromstring",
+                        lambda *a, **kw: pytest.fail("DOM should not be built"))
+
+    schedule = FlightAwareScraper._fetch_and_parse("FR2160")
+
+    assert schedule.aircraft_type == "Boeing 737-800"
+    assert (schedule.origin_airport, schedule.destination_airport) == ("OPO", "TSF")
+    assert flightaware_scraper._element_text(flightaware_scraper._AIRLINE_EL_RES, page) == "Ryan & Co"
+
+def test_fast_path_keeps_priority_order():
+    """Test a fallback element earlier in the raw HTML doesn't beat the preferred one."""
+    page = ('<a href="/live/fleet/TAP">TAP Air Portugal</a>'
+            '<div class="flightPageAircraftText">Airbus A320</div>'
+            '<div class="flightPageAirlineText">TAP Portugal</div>'
+            '<span class="aircraft-type">Airbus <b>A321neo</b></span>')
+
+    assert flightaware_scraper._element_text(flightaware_scraper._AIRLINE_EL_RES, page) == "TAP Portugal"
+    # The span holds markup, so it is left to the DOM rather than skipped
+    assert flightaware_scraper._element_text(flightaware_scraper._AIRCRAFT_EL_RES, page) is None
+
+def test_scrape_flight_text_fallback(ryanair, monkeypatch):
+    """Test the aircraft falls back to a manufacturer search when no element exists."""
+    fake_page(monkeypatch, TEXT_ONLY_PAGE)
+
+    schedule = FlightAwareScraper.scrape_flight("FR2160")
+
+    assert schedule.aircraft_type == "Airbus A320-200"
+    assert schedule.origin_airport is None
+
+def test_scrape_flight_http_error(monkeypatch):
+    """Test non-200 responses yield no schedule."""
+    fake_page(monkeypatch, "", status_code=404)
+
+    assert FlightAwareScraper.scrape_flight("FR2160") is None
+
+def test_airline_matches_fleet_link():
+    """Test the airline falls back to any anchor whose href contains /live/fleet/."""
+    tree = lxml_html.fromstring(
+        '<html><body><a href="/about">About</a>'
+        '<a href="https://flightaware.com/live/fleet/TAP">TAP Air Portugal</a></body></html>'
+    )
+
+    assert flightaware_scraper._find_text(flightaware_scraper._AIRLINE_XPATHS, tree) == "TAP Air Portugal"
+
+def test_element_lookups_keep_priority_order():
+    """Test the preferred element wins even when a fallback comes first in the page."""
+    tree = lxml_html.fromstring(
+        '<html><body><a href="/live/fleet/TAP">TAP Air Portugal</a>'
+        '<div class="flightPageAircraftText">Airbus A320</div>'
+        '<div class="flightPageAirlineText"><b>TAP</b> Portugal</div>'
+        '<span class="aircraft-type">Airbus <b>A321neo</b></span></body></html>'
+    )
+
+    assert flightaware_scraper._find_text(flightaware_scraper._AIRCRAFT_XPATHS, tree) == "AirbusA321neo"
+    assert flightaware_scraper._find_text(flightaware_scraper._AIRLINE_XPATHS, tree) == "TAPPortugal"
+
+def test_scrape_flights_batch(ryanair, monkeypatch):
+    """Test a batch scrape returns found flights only and saves them."""
+    pages = {"FR2160": ELEMENT_PAGE, "FR1926": TEXT_ONLY_PAGE, "FR0000": "<html></html>"}
+    monkeypatch.setattr(flightaware_scraper._SESSION, "get",
+                        lambda url, **kw: FakeResponse(pages[url.rsplit("/", 1)[-1]]))
+
+    schedules = FlightAwareScraper.scrape_flights(["FR2160", "FR1926", "FR0000"])
+
+    assert [s.flight_number for s in schedules] == ["FR2160", "FR1926"]
+    saved = FlightScheduleRepository.get_by_flight_number("FR1926")
+    assert saved.aircraft_type == "Airbus A320-200"
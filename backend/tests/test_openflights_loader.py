@@ -0,0 +1,62 @@
+import pytest
+from app.parsers import openflights_loader
+from app.parsers.openflights_loader import OpenFlightsLoader, AirportTable
+
+AIRPORTS_DAT = [
+    b'1,"Goroka Airport","Goroka","Papua New Guinea","GKA","AYGA",-6.081689834590001,145.391998291,5282,10,"U","Pacific/Port_Moresby","airport","OurAirports"',
+    b'2,"No IATA Strip","Nowhere","Nowhere","\\N","XXXX",1.0,2.0,3,0,"U","\\N","airport","OurAirports"',
+    b'3,"Porto, Francisco Sa Carneiro","Porto","Portugal","OPO","LPPR",41.2481002808,-8.68138980865,228,0,"E","Europe/Lisbon","airport","OurAirports"',
+    b'4,"Unknown Alt","\\N","Nowhere","UNK","\\N",10.5,20.5,\\N,\\N,\\N,\\N,"airport","OurAirports"',
+    b'5,"Broken Row","City","Country","BRK","BRKN",not-a-number,1.0,0,0,"E","Europe/Lisbon","airport","OurAirports"',
+    b'short,row',
+]
+
+class FakeResponse:
+    def __init__(self, lines):
+        self._lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    monkeypatch.setattr(openflights_loader._SESSION, "get", lambda *a, **kw: FakeResponse(AIRPORTS_DAT))
+
+def test_download_and_parse_columns(fake_download):
+    """Test that rows are parsed into columns, skipping rows without IATA or with bad numbers."""
+    airports = OpenFlightsLoader.download_and_parse()
+
+    assert isinstance(airports, AirportTable)
+    assert list(airports.iata) == ["GKA", "OPO", "UNK"]
+    assert airports.latitude.dtype.kind == "f"
+    assert airports.altitude.tolist() == [5282, 228, 0]
+
+def test_download_and_parse_rows(fake_download):
+    """Test that indexing yields the same dicts as before, including quoted commas and \\N defaults."""
+    airports = OpenFlightsLoader.download_and_parse()
+
+    assert airports[1]["name"] == "Porto, Francisco Sa Carneiro"
+    assert airports[1]["timezone_name"] == "Europe/Lisbon"
+    assert airports[2] == {
+        "name": "Unknown Alt", "city": "", "country": "Nowhere", "iata": "UNK", "icao": "",
+        "latitude": 10.5, "longitude": 20.5, "altitude": 0, "timezone_offset": 0.0,
+        "dst": "U", "timezone_name": "",
+    }
+    assert [a["iata"] for a in airports] == ["GKA", "OPO", "UNK"]
+
+def test_sample_airports_table():
+    """Test that the sample fallback is an AirportTable too."""
+    airports = OpenFlightsLoader.get_sample_airports()
+
+    assert len(airports) == 5
+    assert airports[0]["iata"] == "LHR"
+    assert type(airports[0]["altitude"]) is int
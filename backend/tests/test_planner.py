@@ -12,17 +12,26 @@ Tests:
   6. Edge cases (single day, restaurant insertion)
 """
 
+import numpy as np
 import pytest
-from app.planner.models import TourType, Place, CostLevel, Intensity
+from app.planner.models import (
+    TourType, Place, CostLevel, Intensity, TAG_VOCAB, TOUR_TAG_MAP, TravelPlanSchema,
+    tags_to_mask,
+)
 from app.planner.porto_dataset import (
     PORTO_PLACES,
     get_place_by_id, get_all_restaurants,
 )
+from app.planner import algorithm
 from app.planner.algorithm import (
     haversine,
+    haversine_places,
+    haversine_vec,
     walk_time_minutes,
     compute_distance_matrix,
+    DistanceCache,
     score_places,
+    build_place_table,
     cluster_into_days,
     optimize_day_route,
     insert_restaurants,
@@ -30,8 +39,10 @@ from app.planner.algorithm import (
     trim_day_to_budget,
     build_trip_segments,
     MAX_DAY_MINUTES,
+    _assign_clusters_jit,
 )
-from app.planner.planner_service import generate_plan
+from app.planner import planner_service
+from app.planner.planner_service import generate_plan, _filter_by_tags
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -106,6 +117,93 @@ class TestHaversine:
         d = haversine(41.1458, -8.6139, 41.1405, -8.6130)
         assert 400 < d < 800, f"Expected ~600m, got {d:.0f}m"
 
+    def test_cached_terms_match_scalar(self):
+        a, b = PORTO_PLACES[0], PORTO_PLACES[7]
+        assert haversine_places(a, b) == haversine(a.latitude, a.longitude, b.latitude, b.longitude)
+        assert haversine_places(a, a) == 0.0
+
+    def test_vectorised_matches_scalar(self):
+        places = PORTO_PLACES[:10]
+        d = haversine_vec(
+            places[0].latitude, places[0].longitude,
+            [p.latitude for p in places], [p.longitude for p in places],
+        )
+        for p, dist in zip(places, d):
+            expected = haversine(places[0].latitude, places[0].longitude, p.latitude, p.longitude)
+            assert dist == pytest.approx(expected, abs=1e-6)
+
+    def test_distance_matrix(self):
+        places = PORTO_PLACES[:8]
+        m = compute_distance_matrix(places)
+        assert m.shape == (8, 8)
+        assert (m.diagonal() == 0).all()
+        assert (m == m.T).all()
+        assert m[2][5] == pytest.approx(haversine(
+            places[2].latitude, places[2].longitude,
+            places[5].latitude, places[5].longitude,
+        ), abs=1e-6)
+
+
+class TestDistanceCache:
+    """Test the per-plan distance cache."""
+
+    def test_cached_totals_match_uncached(self):
+        places = optimize_day_route(PORTO_PLACES[:6])
+        cache = DistanceCache.build(PORTO_PLACES[:6])
+        assert compute_day_time(places, cache=cache) == pytest.approx(compute_day_time(places))
+        assert optimize_day_route(PORTO_PLACES[:6], cache=cache) == places
+
+    def test_unknown_place_falls_back_to_haversine(self):
+        a, b = PORTO_PLACES[0], PORTO_PLACES[1]
+        cache = DistanceCache.build([a])
+        assert cache.distance(a, b) == haversine(a.latitude, a.longitude, b.latitude, b.longitude)
+
+
+class TestScoring:
+    """Test multi-factor place scoring."""
+
+    def test_place_table_columns(self):
+        places = PORTO_PLACES[:5]
+        table = build_place_table(places)
+        assert len(table) == 5
+        assert list(table.lat) == [p.latitude for p in places]
+        distinct_types = list(dict.fromkeys(p.type for p in places))
+        assert table.type_idx.tolist() == [distinct_types.index(p.type) for p in places]
+
+    def test_tag_masks(self):
+        p = PORTO_PLACES[0]
+        assert p.tag_mask.bit_count() == len({t.lower() for t in p.tags})
+        assert tags_to_mask([p.tags[0].upper()]) & p.tag_mask
+        vocab_size = len(TAG_VOCAB)
+        assert tags_to_mask(["no-such-tag"]) == 0
+        assert len(TAG_VOCAB) == vocab_size
+
+    def test_scores_sorted_descending(self):
+        scored = score_places(PORTO_PLACES, ["museum", "art"])
+        scores = [s for _, s in scored]
+        assert scores == sorted(scores, reverse=True)
+        assert all(isinstance(s, float) for s in scores)
+        assert {"museum", "art"} & {t.lower() for t in scored[0][0].tags}
+
+    def test_filter_by_tags_overlap(self):
+        tags = ["Museum", "art"]
+        wanted = {"museum", "art"}
+        overlap = lambda p: len(wanted & {t.lower() for t in p.tags})
+        for min_overlap in (1, 2):
+            filtered = _filter_by_tags(PORTO_PLACES, tags, min_overlap)
+            assert filtered == [p for p in PORTO_PLACES if overlap(p) >= min_overlap]
+
+    def test_preset_candidates_match_live_resolution(self):
+        for tour, (tags, candidates) in planner_service._CANDIDATES_BY_TOUR.items():
+            live = planner_service._resolve_candidates(list(TOUR_TAG_MAP[tour]))
+            assert (tags, candidates) == live
+        assert TourType.CUSTOM not in planner_service._CANDIDATES_BY_TOUR
+
+    def test_preset_candidates_share_catalogue_objects(self):
+        catalogue = {id(p) for p in PORTO_PLACES}
+        for _tags, candidates in planner_service._CANDIDATES_BY_TOUR.values():
+            assert all(id(p) in catalogue for p in candidates)
+
 
 class TestClustering:
     """Test K-means geographic clustering."""
@@ -114,6 +212,25 @@ class TestClustering:
         clusters = cluster_into_days(PORTO_PLACES[:15], n_days=3)
         assert len(clusters) == 3
 
+    def test_assignment_kernel_matches_pure_python(self):
+        """The (optionally JIT-compiled) kernel agrees with its plain-Python body."""
+        lats = np.array([p.latitude for p in PORTO_PLACES[:15]])
+        lons = np.array([p.longitude for p in PORTO_PLACES[:15]])
+        clats, clons = lats[:3].copy(), lons[:3].copy()
+        python_kernel = getattr(_assign_clusters_jit, "py_func", _assign_clusters_jit)
+        assert (_assign_clusters_jit(lats, lons, clats, clons)
+                == python_kernel(lats, lons, clats, clons)).all()
+        assert list(_assign_clusters_jit(lats, lons, clats, clons)[:3]) == [0, 1, 2]
+
+    def test_vectorised_assignment_matches_kernel(self, monkeypatch):
+        """The NumPy argmin path labels points like the kernel does."""
+        table = build_place_table(PORTO_PLACES[:15])
+        lats, lons = table.lat, table.lon
+        centroids = np.column_stack([lats[:3], lons[:3]])
+        monkeypatch.setattr(algorithm, "_HAVE_NUMBA", False)
+        assert (algorithm._assign_clusters(table, centroids)
+                == _assign_clusters_jit(lats, lons, lats[:3].copy(), lons[:3].copy())).all()
+
     def test_degenerate_case_single_day(self):
         """If n_days=1, clustering should return single list."""
         clusters = cluster_into_days(PORTO_PLACES[:5], n_days=1)
@@ -137,6 +254,12 @@ class TestRouteOptimization:
         assert len(ordered) == len(places)
         assert set(p.id for p in ordered) == set(p.id for p in places)
 
+    def test_two_opt_uncrosses_path(self):
+        """2-opt straightens a zig-zag along a line, keeping the start."""
+        xs = [0.0, 1.0, 2.0, 3.0]
+        dist = [[abs(a - b) for b in xs] for a in xs]
+        assert algorithm._two_opt([0, 2, 1, 3], dist) == [0, 1, 2, 3]
+
 
 class TestRestaurantInsertion:
     """Test restaurant injection logic."""
@@ -158,6 +281,16 @@ class TestTimeBudget:
         visit, walk, _ = compute_day_time(trimmed)
         assert visit + walk <= MAX_DAY_MINUTES + 1
 
+    def test_trim_keeps_restaurants_and_order(self):
+        sights = [p for p in PORTO_PLACES if p.type not in ("restaurant", "café")][:8]
+        restaurant = get_all_restaurants()[0]
+        ordered = sights[:2] + [restaurant] + sights[2:]
+        trimmed = trim_day_to_budget(ordered, max_minutes=240)
+        assert restaurant in trimmed
+        assert trimmed == [p for p in ordered if p in trimmed]
+        visit, walk, _ = compute_day_time(trimmed)
+        assert visit + walk <= 240 + 1e-9
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  3. TOUR SIMULATIONS
@@ -218,6 +351,28 @@ class TestTourSimulations:
         self._validate_and_print(plan, "Custom Architecture (1 day)")
         assert len(plan.days) == 1
 
+    def test_plan_schema_from_dataclass(self):
+        """The API schema validates straight from the plan dataclasses."""
+        plan = generate_plan(tour_type=TourType.FOOD, days=2)
+        schema = TravelPlanSchema.model_validate(plan)
+        assert schema.tour_type == "food"
+        assert schema.days[0].total_time_minutes == plan.days[0].total_time_minutes
+        place = schema.days[0].places[0]
+        assert type(place.cost_level) is str and place.cost_level == plan.days[0].places[0].cost_level.value
+        assert schema.days[0].segments[0].transport_mode == "walk"
+
+    def test_generate_route_serialises_schema(self):
+        """POST /api/planner/generate returns the validated schema as JSON."""
+        from fastapi.testclient import TestClient
+        from main import app
+
+        response = TestClient(app).post(
+            "/api/planner/generate", json={"tour_type": "history", "days": 2},
+        )
+        assert response.status_code == 200
+        expected = TravelPlanSchema.model_validate(generate_plan(tour_type="history", days=2))
+        assert response.json() == expected.model_dump(mode="json")
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  4. STRESS TESTS
@@ -238,6 +393,17 @@ class TestStressAndEdgeCases:
         assert len(plan.days) == 2
         assert plan.total_places > 0
 
+    def test_broadening_adds_generic_tags_once(self, monkeypatch):
+        """Broadening stops once every generic tag is in — later passes can't add places."""
+        calls = []
+        real_filter = planner_service._filter_by_tags
+        monkeypatch.setattr(planner_service, "_filter_by_tags",
+                            lambda places, tags: calls.append(tags) or real_filter(places, tags)[:1])
+        tags, candidates = planner_service._resolve_candidates(["mars"])
+        assert tags == ["mars", *planner_service._GENERIC_TAGS]
+        assert len(calls) == 2
+        assert candidates == planner_service._NON_RESTAURANT_PLACES
+
     def test_very_long_trip(self):
         """7 days (max) request."""
         plan = generate_plan(tour_type=TourType.HISTORY, days=7)
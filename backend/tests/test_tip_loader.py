@@ -0,0 +1,110 @@
+import copy
+import pytest
+from app.parsers import tip_loader
+from app.parsers.tip_loader import TipLoader
+
+SAMPLE_TIPS = {
+    "version": "1.0",
+    "destinations": {
+        "LIS": [
+            {"category": "food", "title": "Pastel de nata"},
+            {"category": "scam", "title": "Fake sunglasses sellers"},
+            {"category": "food", "title": "Bifana"},
+            {"category": "info", "title": "Uncategorized"},
+            {"title": "No category"},
+        ],
+    },
+}
+
+@pytest.fixture
+def sample_tips(monkeypatch):
+    """Serve SAMPLE_TIPS from the in-memory cache without touching tips.json."""
+    monkeypatch.setattr(TipLoader, "_tips_cache", copy.deepcopy(SAMPLE_TIPS))
+    tip_loader._clear_tip_caches()
+    yield SAMPLE_TIPS
+    tip_loader._clear_tip_caches()
+
+def test_get_tips_for_destination(sample_tips):
+    """Test lookup is case-insensitive and unknown codes return no tips."""
+    assert len(TipLoader.get_tips_for_destination("lis", auto_scrape=False)) == 5
+    assert TipLoader.get_tips_for_destination("XXX", auto_scrape=False) == []
+
+def test_get_tips_by_category(sample_tips):
+    """Test tips are grouped into known categories only, dropping empty ones."""
+    categorized = TipLoader.get_tips_by_category("LIS", auto_scrape=False)
+
+    assert set(categorized) == {"food", "scam"}
+    assert [t["title"] for t in categorized["food"]] == ["Pastel de nata", "Bifana"]
+
+def test_tips_memoized_until_save(sample_tips, monkeypatch):
+    """Test repeated lookups are served from cache and save_tips invalidates it."""
+    loads = []
+    load_destination = TipLoader.load_destination
+    monkeypatch.setattr(TipLoader, "load_destination",
+                        lambda code: loads.append(code) or load_destination(code))
+
+    first = TipLoader.get_tips_by_category("LIS", auto_scrape=False)
+    first["food"].clear()   # callers get their own copies
+    assert len(TipLoader.get_tips_by_category("lis", auto_scrape=False)["food"]) == 2
+    assert loads == ["LIS"]
+
+    monkeypatch.setattr(tip_loader.json_codec, "dump_file", lambda data, path: None)
+    updated = {"destinations": {"LIS": [{"category": "culture", "title": "Fado"}]}}
+    assert TipLoader.save_tips(updated)
+
+    monkeypatch.setattr(TipLoader, "_tips_cache", updated)
+    assert set(TipLoader.get_tips_by_category("LIS", auto_scrape=False)) == {"culture"}
+
+def test_auto_scrape_invalidates_category_cache(sample_tips, monkeypatch, tmp_path):
+    """Test a successful auto-scrape replaces a previously cached empty result."""
+    from app.parsers.wikivoyage_scraper import WikiVoyageScraper
+
+    assert TipLoader.get_tips_by_category("OPO", auto_scrape=False) == {}
+
+    monkeypatch.setattr(tip_loader, "_TIPS_DIR", str(tmp_path))
+    monkeypatch.setattr(WikiVoyageScraper, "scrape_city",
+                        lambda city, code, country: [{"category": "food", "title": "Francesinha"}])
+
+    scraped = TipLoader.get_tips_by_category("OPO")
+    assert [t["title"] for t in scraped["food"]] == ["Francesinha"]
+    assert TipLoader.get_tips_by_category("OPO", auto_scrape=False) == scraped
+
+def test_failed_auto_scrape_is_retried(sample_tips, monkeypatch, tmp_path):
+    """Test an empty scrape result isn't memoized, so the next request scrapes again."""
+    from app.parsers.wikivoyage_scraper import WikiVoyageScraper
+
+    monkeypatch.setattr(tip_loader, "_TIPS_DIR", str(tmp_path))
+    results = [[], [{"category": "place", "title": "Ribeira"}]]
+    monkeypatch.setattr(WikiVoyageScraper, "scrape_city", lambda city, code, country: results.pop(0))
+
+    assert TipLoader.get_tips_by_category("OPO") == {}
+    assert [t["title"] for t in TipLoader.get_tips_by_category("OPO")["place"]] == ["Ribeira"]
+
+def test_auto_scrape_writes_only_destination_file(sample_tips, monkeypatch, tmp_path):
+    """Test auto-scrape writes a sidecar file and leaves tips.json alone."""
+    from app.parsers.wikivoyage_scraper import WikiVoyageScraper
+
+    monkeypatch.setattr(tip_loader, "_TIPS_DIR", str(tmp_path))
+    monkeypatch.setattr(tip_loader, "_TIPS_PATH", str(tmp_path / "tips.json"))
+    monkeypatch.setattr(WikiVoyageScraper, "scrape_city",
+                        lambda city, code, country: [{"category": "culture", "title": "Fado"}])
+
+    assert TipLoader.get_tips_for_destination("OPO")[0]["title"] == "Fado"
+    assert not (tmp_path / "tips.json").exists()
+    assert tip_loader.json_codec.load_file(str(tmp_path / "OPO.json")) == [{"category": "culture", "title": "Fado"}]
+
+    # A fresh load picks the destination up from its sidecar file
+    monkeypatch.setattr(TipLoader, "_tips_cache", copy.deepcopy(SAMPLE_TIPS))
+    tip_loader._clear_tip_caches()
+    assert TipLoader.get_tips_for_destination("OPO", auto_scrape=False)[0]["title"] == "Fado"
+
+def test_missing_tips_file_still_memoizes_sidecars(monkeypatch, tmp_path):
+    """Test that without tips.json, sidecar tips are kept in the cached fallback database."""
+    monkeypatch.setattr(TipLoader, "_tips_cache", None)
+    monkeypatch.setattr(tip_loader, "_TIPS_PATH", str(tmp_path / "tips.json"))
+    monkeypatch.setattr(tip_loader, "_TIPS_DIR", str(tmp_path))
+    tip_loader.json_codec.dump_file([{"category": "food", "title": "Tripas"}], str(tmp_path / "OPO.json"))
+
+    assert TipLoader.load_destination("OPO")[0]["title"] == "Tripas"
+    assert TipLoader.load_tips() is TipLoader.load_tips()
+    assert TipLoader.load_tips()["destinations"]["OPO"][0]["title"] == "Tripas"
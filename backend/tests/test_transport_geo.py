@@ -0,0 +1,186 @@
+import sqlite3
+
+import pytest
+
+from app.transport import connection as transport_connection
+from app.transport.geo import StopIndex, _lat_lon_to_cartesian, haversine_meters
+from app.transport.models import Stop
+
+# (search_id, name, lat, lon) around Porto's Aliados, one in Lisbon and two
+# in Coimbra, which has no local agency
+LOCATIONS = [
+    ("stcp_ALD", "Aliados", 41.1496, -8.6110),
+    ("cp_TRD", "Trindade", 41.1522, -8.6093),
+    ("cp_SBT", "São Bento", 41.1456, -8.6106),
+    ("stcp_BLH", "Bolhão", 41.1497, -8.6062),
+    ("cmet_ROS", "Rossio", 38.7139, -9.1394),
+    ("cp_CBR", "Coimbra", 40.2033, -8.4339),
+    ("flix_CBR", "Coimbra Flixbus", 40.2089, -8.4356),
+]
+
+
+@pytest.fixture
+def transport_db(monkeypatch):
+    """In-memory transport DB holding LOCATIONS, shared across threads like the real one."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE locations (search_id TEXT, name TEXT, lat REAL, lon REAL, provider TEXT)")
+    conn.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, 'test')", LOCATIONS)
+    monkeypatch.setattr(transport_connection, "_conn", conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def stop_index(transport_db):
+    """StopIndex loaded from the in-memory transport DB."""
+    index = StopIndex()
+    index.load()
+    return index
+
+
+def test_load_builds_stops_and_coordinates(stop_index):
+    """Test the column-wise load matches the per-stop conversion."""
+    assert stop_index.size == len(LOCATIONS)
+    stop = stop_index.get_stop("stcp_BLH")
+    assert (stop.stop_name, stop.lat, stop.lon) == ("Bolhão", 41.1497, -8.6062)
+    assert type(stop.lat) is float
+    for row, (search_id, _, lat, lon) in zip(stop_index._xyz, LOCATIONS):
+        assert row == pytest.approx(_lat_lon_to_cartesian(lat, lon), abs=1e-15)
+
+
+def test_preload_in_background(transport_db):
+    """Test a background preload makes the index ready for queries."""
+    index = StopIndex()
+    thread = index.preload()
+
+    assert index.wait_ready(timeout=5)
+    thread.join(timeout=5)
+    assert index.size == len(LOCATIONS)
+
+
+def test_wait_ready_after_failed_preload(monkeypatch, tmp_path):
+    """Test waiters are released, not left hanging, when the preload fails."""
+    monkeypatch.setattr(transport_connection, "_conn", None)
+    monkeypatch.setattr(transport_connection, "TRANSPORT_DB_PATH", str(tmp_path / "missing.db"))
+    index = StopIndex()
+    index.preload().join(timeout=5)
+
+    assert index.wait_ready(timeout=5) is False
+
+
+def test_find_nearest_distances_match_haversine(stop_index):
+    """Test KDTree chord distances convert to the same metres as haversine_meters."""
+    results = stop_index.find_nearest(41.15, -8.61, k=10, max_distance_m=1000)
+
+    assert results
+    for stop, dist in results:
+        assert dist == pytest.approx(haversine_meters(41.15, -8.61, stop.lat, stop.lon), rel=1e-9)
+
+
+def test_find_nearest_sorted_within_radius(stop_index):
+    """Test nearest stops come back closest-first and inside max_distance_m."""
+    results = stop_index.find_nearest(40.2033, -8.4339, k=10, max_distance_m=1000)
+
+    assert [stop.stop_id for stop, _ in results] == ["cp_CBR", "flix_CBR"]
+    dists = [d for _, d in results]
+    assert dists == sorted(dists) and dists[-1] <= 1000
+    assert all(type(d) is float for d in dists)
+
+
+def test_find_nearest_ignores_agency(stop_index):
+    """Test a nearer train station isn't ranked behind city bus stops."""
+    results = stop_index.find_nearest(41.1496, -8.6110, k=10, max_distance_m=500)
+
+    assert [stop.stop_id for stop, _ in results] == ["stcp_ALD", "cp_TRD", "stcp_BLH", "cp_SBT"]
+
+
+def test_find_nearest_limits_to_k(stop_index):
+    """Test only the k closest stops are returned."""
+    results = stop_index.find_nearest(41.1496, -8.6110, k=2, max_distance_m=500)
+
+    assert [stop.stop_id for stop, _ in results] == ["stcp_ALD", "cp_TRD"]
+
+
+def test_find_nearest_nothing_in_range(stop_index):
+    """Test a point far from every stop yields no results."""
+    assert stop_index.find_nearest(40.0, -8.0, k=5, max_distance_m=1000) == []
+
+
+def test_haversine_meters_accepts_ints():
+    """Test integer coordinates give the same distance as floats."""
+    assert haversine_meters(41, -8, 42, -9) == haversine_meters(41.0, -8.0, 42.0, -9.0)
+    assert haversine_meters(41.1496, -8.6110, 41.1496, -8.6110) == 0.0
+
+
+def test_find_nearest_single_candidate(stop_index):
+    """Test k=1 works although KDTree returns scalars rather than arrays."""
+    results = stop_index.find_nearest(38.7139, -9.1394, k=1, max_distance_m=100)
+
+    assert [(stop.stop_id, d) for stop, d in results] == [("cmet_ROS", 0.0)]
+
+
+def test_find_transfers_excludes_self(stop_index):
+    """Test walkable neighbours come back closest-first, without the stop itself."""
+    results = stop_index.find_transfers("stcp_ALD", 420)
+
+    assert [stop.stop_id for stop, _ in results] == ["cp_TRD", "stcp_BLH"]
+    assert results[0][1] == pytest.approx(haversine_meters(41.1496, -8.6110, 41.1522, -8.6093))
+
+
+def test_find_transfers_unknown_stop(stop_index):
+    """Test an unknown stop ID has no transfers."""
+    assert stop_index.find_transfers("nope_1", 300) == []
+
+
+def test_find_cross_agency_transfers(stop_index):
+    """Test cross-agency transfers drop stops of the origin's own agency."""
+    results = stop_index.find_cross_agency_transfers("stcp_ALD", 500)
+
+    assert [stop.stop_id for stop, _ in results] == ["cp_TRD", "cp_SBT"]
+
+
+def test_search_by_name(stop_index):
+    """Test name search is case-insensitive, deduplicated and in stop order."""
+    assert [s.stop_id for s in stop_index.search_by_name("COIMBRA")] == ["cp_CBR", "flix_CBR"]
+    assert [s.stop_id for s in stop_index.search_by_name("bo")] == ["stcp_BLH"]
+    assert [s.stop_id for s in stop_index.search_by_name("a", limit=2)] == ["stcp_ALD", "cp_TRD"]
+    assert stop_index.search_by_name("xyz") == []
+    assert stop_index.search_by_name("  ") == []
+
+
+def test_stop_agency_prefix_precomputed(stop_index):
+    """Test each loaded stop carries its parsed agency prefix."""
+    assert stop_index.get_stop("flix_CBR").agency_prefix == "flix_"
+    assert Stop("__dest__", "Destination", 0.0, 0.0).agency_prefix == "_"
+
+
+def test_find_nearest_batch_matches_single_queries(stop_index):
+    """Test a batched query returns what find_nearest returns point by point."""
+    points = [(41.1496, -8.6110), (40.2033, -8.4339), (40.0, -8.0)]
+    lats, lons = zip(*points)
+
+    for k in (1, 3):
+        batch = stop_index.find_nearest_batch(lats, lons, k=k, max_distance_m=500)
+        assert batch == [stop_index.find_nearest(lat, lon, k=k, max_distance_m=500)
+                         for lat, lon in points]
+    assert stop_index.find_nearest_batch([], []) == []
+
+
+def test_stop_positions_index_rows(stop_index):
+    """Test every stop id maps to its row in the stops list."""
+    stops, positions = stop_index.stops, stop_index.stop_positions
+
+    assert len(stops) == len(positions) == len(LOCATIONS)
+    for search_id, *_ in LOCATIONS:
+        assert stops[positions[search_id]] is stop_index.get_stop(search_id)
+
+
+def test_find_transfers_batch_matches_single_queries(stop_index):
+    """Test a batched transfer query returns what find_transfers returns stop by stop."""
+    stop_ids = ["stcp_ALD", "cp_CBR", "nope", "cmet_ROS"]
+
+    batch = stop_index.find_transfers_batch(stop_ids, max_distance_m=1000)
+    assert batch == [stop_index.find_transfers(s, 1000) for s in stop_ids]
+    assert [s.stop_id for s, _ in batch[1]] == ["flix_CBR"]
+    assert stop_index.find_transfers_batch(["nope"]) == [[]]
@@ -0,0 +1,467 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from app.transport import connection as transport_connection
+from app.transport import models
+from app.transport.geo import StopIndex
+from app.transport.models import LegMode, RouteLeg, Stop, route_type_to_mode
+from app.transport.router import TransportRouter, _merge_walks
+from app.transport.schedule import parse_gtfs_time
+
+# A bus line A → B → C, then a short walk from C to the train at D, which
+# runs on to E.  Apart from C/D, every stop is > 1.5 km from the others.
+# A second bus runs from A to Z, 40 km south, away from everything else.
+STOPS = [
+    ("stcp_A", "Alpha", 41.1400, -8.6100),
+    ("stcp_B", "Bravo", 41.1600, -8.6100),
+    ("stcp_C", "Charlie", 41.1800, -8.6100),
+    ("cp_D", "Delta", 41.1813, -8.6100),
+    ("cp_E", "Echo", 41.1813, -8.5800),
+    ("stcp_Z", "Zulu", 40.7800, -8.6100),
+]
+
+ROUTES = [("R1", 3), ("R2", 2)]
+
+# (trip_id, route_id, service_id, trip_headsign, agency_id)
+TRIPS = [
+    ("BUS1", "R1", "ALL", "Charlie", "STCP"),
+    ("BUS2", "R1", "ALL", "Zulu", "STCP"),
+    ("NIGHT1", "R1", "ALL", "Bravo", "STCP"),
+    ("TRAIN1", "R2", "ALL", "Echo", "CP"),
+    ("TRAIN2", "R2", "ALL", "Echo", "CP"),
+]
+
+# (trip_id, arrival_time, departure_time, stop_id, stop_sequence)
+STOP_TIMES = [
+    ("BUS1", "08:05:00", "08:05:00", "stcp_A", 1),
+    ("BUS1", "08:10:00", "08:10:00", "stcp_B", 2),
+    ("BUS1", "08:15:00", "08:15:00", "stcp_C", 3),
+    ("BUS2", "08:05:00", "08:05:00", "stcp_A", 1),
+    ("BUS2", "08:30:00", "08:30:00", "stcp_Z", 2),
+    # Early-morning service, encoded on the next day's clock
+    ("NIGHT1", "00:20:00", "00:20:00", "stcp_A", 1),
+    ("NIGHT1", "00:30:00", "00:30:00", "stcp_B", 2),
+    ("TRAIN1", "08:25:00", "08:25:00", "cp_D", 1),
+    ("TRAIN1", "08:35:00", "08:35:00", "cp_E", 2),
+    ("TRAIN2", "08:45:00", "08:45:00", "cp_D", 1),
+    ("TRAIN2", "08:55:00", "08:55:00", "cp_E", 2),
+]
+
+
+@pytest.fixture
+def transport_db(monkeypatch):
+    """In-memory transport DB holding the two-line network above."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE locations (search_id TEXT, name TEXT, lat REAL, lon REAL, provider TEXT);
+        CREATE TABLE routes (route_id TEXT, route_type INTEGER);
+        CREATE TABLE trips (trip_id TEXT, route_id TEXT, service_id TEXT,
+                            trip_headsign TEXT, agency_id TEXT);
+        CREATE TABLE stop_times (trip_id TEXT, arrival_time TEXT, departure_time TEXT,
+                                 stop_id TEXT, stop_sequence INTEGER);
+        CREATE TABLE calendar (service_id TEXT, monday INT, tuesday INT, wednesday INT,
+                               thursday INT, friday INT, saturday INT, sunday INT,
+                               start_date TEXT, end_date TEXT);
+        CREATE TABLE calendar_dates (service_id TEXT, date TEXT, exception_type INT);
+    """)
+    conn.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, 'test')", STOPS)
+    conn.executemany("INSERT INTO routes VALUES (?, ?)", ROUTES)
+    conn.executemany("INSERT INTO trips VALUES (?, ?, ?, ?, ?)", TRIPS)
+    conn.executemany("INSERT INTO stop_times VALUES (?, ?, ?, ?, ?)", STOP_TIMES)
+    monkeypatch.setattr(transport_connection, "_conn", conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def router(transport_db):
+    """TransportRouter over the in-memory network."""
+    index = StopIndex()
+    index.load()
+    return TransportRouter(index)
+
+
+def test_route_transfers_between_lines(router):
+    """Test the route rides the bus, walks to the train and rides it to the end."""
+    result = router.route(41.1400, -8.6100, 41.1813, -8.5800, "08:00", "2026-02-16")
+
+    assert [leg.mode for leg in result.legs] == [
+        LegMode.WALK, LegMode.BUS, LegMode.WALK, LegMode.TRAIN,
+    ]
+    bus, walk, train = result.legs[1:]
+    assert (bus.from_stop.stop_id, bus.to_stop.stop_id, bus.trip_id) == ("stcp_A", "stcp_C", "BUS1")
+    assert (walk.from_stop.stop_id, walk.to_stop.stop_id) == ("stcp_C", "cp_D")
+    assert (train.departure_time, train.arrival_time, train.trip_id) == ("08:25", "08:35", "TRAIN1")
+    assert result.total_transfers == 1
+    assert result.total_duration_minutes == 35.0
+    assert (result.origin_name, result.destination_name) == ("Your location", "Echo")
+    assert [leg.instructions for leg in result.legs] == [
+        "Walk 0m to Alpha station (STCP)",
+        "Take Bus (STCP) towards Charlie — ride 10 min to Charlie",
+        "Walk 145m to Delta (cp)",
+        "Take Train (CP) towards Echo — ride 10 min to Echo",
+    ]
+
+
+def test_route_search_skips_stops_leading_away(router, monkeypatch):
+    """Test the A* bound keeps the search from expanding a stop far off course.
+
+    Zulu is reached at 08:30, before the 08:35 arrival at Echo, so plain
+    Dijkstra would expand it; its distance from Echo rules it out here.
+    """
+    expanded = []
+    get_departures = router._sched.get_departures
+
+    def spy(stop_id, *args, **kwargs):
+        expanded.append(stop_id)
+        return get_departures(stop_id, *args, **kwargs)
+
+    monkeypatch.setattr(router._sched, "get_departures", spy)
+    result = router.route(41.1400, -8.6100, 41.1813, -8.5800, "08:00", "2026-02-16")
+
+    assert result.legs[-1].to_stop.stop_id == "cp_E"
+    assert "stcp_A" in expanded
+    assert "stcp_Z" not in expanded
+
+
+def test_route_search_does_not_chain_transfer_walks(router, monkeypatch):
+    """Test a stop reached by a transfer walk is not walked on from."""
+    walked_from = []
+    find_transfers = router._geo.find_transfers
+
+    def spy(stop_id, *args, **kwargs):
+        walked_from.append(stop_id)
+        return find_transfers(stop_id, *args, **kwargs)
+
+    monkeypatch.setattr(router._geo, "find_transfers", spy)
+    router.route(41.1400, -8.6100, 41.1813, -8.5800, "08:00", "2026-02-16")
+
+    # Seeded from the origin walk, and reached by bus: both walk on
+    assert "stcp_A" in walked_from
+    assert "stcp_C" in walked_from
+    # Reached only by walking from Charlie
+    assert "cp_D" not in walked_from
+
+    # Walks from a stop are looked up once, then reused by later searches
+    walked_from.clear()
+    router.route(41.1400, -8.6100, 41.1813, -8.5800, "08:00", "2026-02-16")
+    assert walked_from == []
+
+
+def test_route_adds_final_walk_to_destination(router):
+    """Test a destination away from the last stop ends with a walk leg to it."""
+    result = router.route(41.1400, -8.6100, 41.1813, -8.5750, "08:00", "2026-02-16")
+
+    final = result.legs[-1]
+    assert final.mode == LegMode.WALK
+    assert (final.from_stop.stop_id, final.to_stop.stop_id) == ("cp_E", "__dest__")
+    assert final.departure_time == "08:35"
+    assert final.instructions == "Walk 418m to your destination"
+    assert result.destination_name == "Destination"
+
+
+def test_route_fetches_early_morning_departures_once_per_stop(router, monkeypatch):
+    """Test a late search reuses a stop's next-day departures on later requests."""
+    next_day_queries = []
+    get_departures = router._sched.get_departures
+
+    def spy(stop_id, after_minutes, limit=None, date=None):
+        if date == datetime.date(2026, 2, 17):
+            next_day_queries.append(stop_id)
+        return get_departures(stop_id, after_minutes, limit=limit, date=date)
+
+    monkeypatch.setattr(router._sched, "get_departures", spy)
+    for _ in range(2):
+        router.route(41.1400, -8.6100, 41.1600, -8.6100, "23:50", "2026-02-16")
+
+    assert next_day_queries == ["stcp_A"]
+    early = router._overnight_cache[("stcp_A", datetime.date(2026, 2, 17))]
+    assert [(d.trip_id, offset) for d, offset in early] == [("NIGHT1", 1440.0)]
+
+
+def test_route_rides_early_morning_service_after_midnight(router):
+    """Test a late departure boards the next day's 00:xx trip and rides it."""
+    result = router.route(41.1400, -8.6100, 41.1600, -8.6100, "23:50", "2026-02-16")
+
+    bus = result.legs[-1]
+    assert (bus.trip_id, bus.from_stop.stop_id, bus.to_stop.stop_id) == ("NIGHT1", "stcp_A", "stcp_B")
+    assert (bus.departure_time, bus.arrival_time, bus.duration_minutes) == ("24:20", "24:30", 10.0)
+    assert result.total_duration_minutes == 40.0
+    # The cached Departure keeps its own clock
+    early = router._overnight_cache[("stcp_A", datetime.date(2026, 2, 17))]
+    assert early[0][0].departure_minutes == 20.0
+
+
+def test_route_without_nearby_stops_is_empty(router):
+    """Test an origin with no stop in walking range yields no route."""
+    result = router.route(40.0, -8.0, 41.1813, -8.5800, "08:00", "2026-02-16")
+
+    assert result.legs == []
+    assert result.total_duration_minutes == 0.0
+
+
+def test_route_type_to_mode_memoised_lookup():
+    """Test the cached route-type mapping still accepts strings and odd values."""
+    assert route_type_to_mode(2) is LegMode.TRAIN
+    assert route_type_to_mode("2") is LegMode.TRAIN
+    assert route_type_to_mode(2) is LegMode.TRAIN
+    assert route_type_to_mode(None) is LegMode.BUS
+    assert route_type_to_mode("tram") is LegMode.BUS
+
+
+def test_departures_loaded_once_per_stop_and_date(router, transport_db):
+    """Test later departure lookups at a stop bisect the cached day."""
+    sched = router._sched
+    monday = datetime.date(2026, 2, 16)
+
+    first = sched.get_departures("stcp_A", 480.0, date=monday)
+    assert [d.trip_id for d in first] == ["BUS1", "BUS2"]
+
+    # Served from the cache from now on
+    transport_db.execute("DELETE FROM stop_times")
+    assert sched.get_departures("stcp_A", 485.0, date=monday) == first
+    assert sched.get_departures("stcp_A", 485.5, date=monday) == []
+    assert sched.get_departures("stcp_A", 0.0, date=monday)[0].trip_id == "NIGHT1"
+    # Two-hour window, one departure per trip
+    assert sched.get_departures("stcp_A", 200.0, date=monday) == []
+    assert sched.get_departures("stcp_A", 480.0, limit=1, date=monday) == first[:1]
+
+
+def test_merge_walks_joins_each_run_once():
+    """Test a run of walks collapses into a single leg spanning the run."""
+    a, b, c, d, e = (Stop(s, s.upper(), 0.0, 0.0) for s in "abcde")
+
+    def leg(mode, frm, to, dep, arr, minutes):
+        return RouteLeg(mode, frm, to, dep, arr, minutes, instructions=f"{frm.stop_id}{to.stop_id}")
+
+    legs = [
+        leg(LegMode.WALK, a, b, "08:00", "08:02", 2.2),
+        leg(LegMode.WALK, b, c, "08:02", "08:05", 3.1),
+        leg(LegMode.WALK, c, d, "08:05", "08:09", 4.0),
+        leg(LegMode.BUS, d, e, "08:10", "08:20", 10.0),
+        leg(LegMode.WALK, e, a, "08:20", "08:21", 1.0),
+    ]
+    merged = _merge_walks(legs)
+
+    assert [m.mode for m in merged] == [LegMode.WALK, LegMode.BUS, LegMode.WALK]
+    walk = merged[0]
+    assert (walk.from_stop, walk.to_stop) == (a, d)
+    assert (walk.departure_time, walk.arrival_time) == ("08:00", "08:09")
+    assert walk.duration_minutes == 9.3
+    assert walk.instructions == "Walk 9 min to D"
+    # Legs outside a run are passed through untouched
+    assert merged[1:] == legs[3:]
+    assert merged[2] is legs[4]
+    assert _merge_walks([]) == []
+
+
+@pytest.mark.parametrize("schema", [
+    models.StopSchema, models.RouteLegSchema,
+    models.RouteResultSchema, models.NearbyStopSchema,
+])
+def test_api_schemas_built_at_import(schema):
+    """Test each API schema's validator is built with the class, not on first use."""
+    assert schema.__pydantic_complete__
+
+
+def test_to_schema_matches_validated_schema(router):
+    """Test the unvalidated API conversion equals a fully validated one."""
+    result = router.route(41.1400, -8.6100, 41.1813, -8.5750, "08:00", "2026-02-16")
+
+    schema = models.to_schema(result)
+    assert schema == models.RouteResultSchema.model_validate(schema.model_dump())
+    assert [leg.mode for leg in schema.legs] == ["WALK", "BUS", "WALK", "TRAIN", "WALK"]
+    assert schema.legs[-1].to_stop.stop_id == "__dest__"
+    assert schema.summary == result.summary
+
+
+def test_trip_columns_cached_and_skip_unknown_stops(router, transport_db):
+    """Test a trip is loaded once as columns holding only indexed stops."""
+    transport_db.execute("INSERT INTO stop_times VALUES ('BUS1', '08:20:00', '08:20:00', 'gone', 4)")
+    router.route(41.1400, -8.6100, 41.1813, -8.5800, "08:00", "2026-02-16")
+
+    seqs, arrivals, positions = router._trip_columns["BUS1"]
+    assert seqs == [1, 2, 3]
+    assert arrivals == [485.0, 490.0, 495.0]
+    assert [router._geo.stops[p].stop_id for p in positions] == ["stcp_A", "stcp_B", "stcp_C"]
+
+
+def test_router_caches_are_bounded(router, monkeypatch):
+    """Test the router's per-trip and per-date caches evict old entries."""
+    monkeypatch.setattr(router._trip_columns, "maxsize", 1)
+    monkeypatch.setattr(router._overnight_cache, "maxsize", 1)
+
+    router.route(41.1400, -8.6100, 41.1813, -8.5800, "08:00", "2026-02-16")
+    router.route(41.1400, -8.6100, 41.1600, -8.6100, "23:55", "2026-02-16")
+    router.route(41.1400, -8.6100, 41.1600, -8.6100, "23:55", "2026-02-17")
+
+    assert len(router._trip_columns) == 1
+    assert list(router._overnight_cache) == [("stcp_A", datetime.date(2026, 2, 18))]
+
+
+def test_schedule_reads_precomputed_minutes(router, transport_db):
+    """Test departure_min / arrival_min are used instead of parsing when present."""
+    transport_db.executescript("""
+        ALTER TABLE stop_times ADD COLUMN departure_min REAL;
+        ALTER TABLE stop_times ADD COLUMN arrival_min REAL;
+        UPDATE stop_times SET departure_min = 600.0, arrival_min = 601.0
+        WHERE trip_id = 'BUS1' AND stop_id = 'stcp_A';
+    """)
+    sched = router._sched
+
+    deps = sched.get_departures("stcp_A", 599.0, date=datetime.date(2026, 2, 16))
+    assert [(d.trip_id, d.departure_minutes) for d in deps] == [("BUS1", 600.0)]
+    # Rows left NULL fall back to the time string
+    stops = sched.get_trip_stops_after("BUS1", 0)
+    assert [ts.arrival_minutes for ts in stops] == [601.0, 490.0, 495.0]
+
+
+def test_stop_time_minutes_migration_matches_parser(tmp_path):
+    """Test add_stop_time_minutes fills what parse_gtfs_time reads and leaves the rest NULL."""
+    from tools.transportdata import add_stop_time_minutes
+
+    times = ["08:05:30", "8:05:30", "25:10:59", "xx:yy:zz", "08:05:07.5", " 08:05:00", "08:05", ""]
+    db_path = str(tmp_path / "transport.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE stop_times (trip_id TEXT, arrival_time TEXT, departure_time TEXT, "
+                 "stop_id TEXT, stop_sequence INTEGER)")
+    conn.executemany("INSERT INTO stop_times VALUES ('T', ?, ?, 'S', 1)", [(t, t) for t in times])
+    conn.commit()
+
+    add_stop_time_minutes(db_path)
+
+    rows = conn.execute("SELECT departure_time, departure_min, arrival_min FROM stop_times").fetchall()
+    conn.close()
+    assert all(dep == arr for _, dep, arr in rows)
+    migrated = {t: dep for t, dep, _ in rows}
+    assert [t for t in times if migrated[t] is not None] == ["08:05:30", "8:05:30", "25:10:59"]
+    for t, minutes in migrated.items():
+        # NULL rows are parsed by the app instead, so both paths agree
+        assert (parse_gtfs_time(t) if minutes is None else minutes) == parse_gtfs_time(t)
+
+
+def test_stop_departures_fetch_trip_metadata_in_one_query(router, transport_db):
+    """Test loading a stop's departures looks its trips up together."""
+    queries = []
+    transport_db.set_trace_callback(queries.append)
+
+    deps = router._sched.get_departures("stcp_A", 480.0, date=datetime.date(2026, 2, 16))
+
+    assert [(d.trip_id, d.route_type, d.trip_headsign) for d in deps] == [
+        ("BUS1", 3, "Charlie"), ("BUS2", 3, "Zulu"),
+    ]
+    assert sum("t.trip_id IN" in q for q in queries) == 1
+    # Every trip at the stop is cached, including ones outside the window
+    assert router._sched._get_trip_meta("NIGHT1") == ("R1", "STCP", "Bravo", 3)
+    assert sum("t.trip_id IN" in q for q in queries) == 1
+
+
+def test_stop_departures_cache_only_running_trips(router, transport_db):
+    """Test trips that don't run on the date are filtered before their metadata is cached."""
+    transport_db.execute("INSERT INTO trips VALUES ('WKND1', 'R1', 'WEEKEND', 'Bravo', 'STCP')")
+    transport_db.execute("INSERT INTO stop_times VALUES ('WKND1', '08:01:00', '08:01:00', 'stcp_A', 1)")
+    transport_db.execute("INSERT INTO calendar VALUES ('WEEKEND', 0, 0, 0, 0, 0, 1, 1, '20260101', '20261231')")
+    sched = router._sched
+
+    monday = sched.get_departures("stcp_A", 480.0, date=datetime.date(2026, 2, 16))
+
+    assert [d.trip_id for d in monday] == ["BUS1", "BUS2"]
+    assert "WKND1" not in sched._trip_meta and "BUS1" in sched._trip_meta
+
+def test_service_checks_use_interned_ids(router, transport_db):
+    """Test trips and valid-service sets share interned integer service ids."""
+    transport_db.executemany("INSERT INTO trips VALUES (?, 'R1', ?, 'Bravo', 'STCP')",
+                             [("WKND1", "WEEKEND"), ("NOSRV", "")])
+    transport_db.executemany("INSERT INTO stop_times VALUES (?, '08:01:00', '08:01:00', 'stcp_A', 1)",
+                             [("WKND1",), ("NOSRV",)])
+    transport_db.execute("INSERT INTO calendar VALUES ('WEEKEND', 0, 0, 0, 0, 0, 1, 1, '20260101', '20261231')")
+    sched = router._sched
+
+    monday = sched.get_departures("stcp_A", 480.0, date=datetime.date(2026, 2, 16))
+    saturday = sched.get_departures("stcp_A", 480.0, date=datetime.date(2026, 2, 21))
+
+    assert [d.trip_id for d in monday] == ["NOSRV", "BUS1", "BUS2"]
+    assert [d.trip_id for d in saturday] == ["WKND1", "NOSRV", "BUS1", "BUS2"]
+    weekend = sched._get_trip_service("WKND1")
+    assert sched._get_trip_service("NOSRV") == 0
+    assert weekend in sched._get_valid_service_ids(datetime.date(2026, 2, 21))
+    assert weekend not in sched._get_valid_service_ids(datetime.date(2026, 2, 16))
+    assert "WEEKEND" in sched.get_valid_services(datetime.date(2026, 2, 21))
+
+
+def test_valid_services_resolved_from_calendar_read_once(router, transport_db):
+    """Test new dates are resolved in memory after one read of the calendar tables."""
+    transport_db.executemany("INSERT INTO trips VALUES (?, 'R1', ?, 'Bravo', 'STCP')",
+                             [("WKDY1", "WEEKDAY"), ("EXTRA1", "EXTRA")])
+    transport_db.execute("INSERT INTO calendar VALUES ('WEEKDAY', 1, 1, 1, 1, 1, 0, 0, '20260101', '20260630')")
+    transport_db.executemany("INSERT INTO calendar_dates VALUES (?, ?, ?)", [
+        ("WEEKDAY", "20260217", 2),   # removed on a Tuesday
+        ("EXTRA", "20260221", 1),     # added on a Saturday
+    ])
+    queries = []
+    transport_db.set_trace_callback(queries.append)
+    sched = router._sched
+
+    def valid(y, m, d):
+        return sched.get_valid_services(datetime.date(y, m, d)) - {"ALL"}
+
+    assert valid(2026, 2, 16) == {"WEEKDAY"}
+    assert valid(2026, 2, 17) == set()
+    assert valid(2026, 2, 21) == {"EXTRA"}
+    assert valid(2026, 7, 1) == set()
+    # One read each of calendar and calendar_dates; the other query
+    # finds services without calendar data
+    calendar_reads = [q for q in queries if "calendar" in q and "NOT IN" not in q]
+    assert len(calendar_reads) == 2
+
+
+def test_valid_services_with_numeric_calendar_columns(router, transport_db):
+    """Test INTEGER dates and TEXT weekday flags, as some GTFS imports store them."""
+    transport_db.executescript("""
+        DROP TABLE calendar_dates;
+        CREATE TABLE calendar_dates (service_id TEXT, date INTEGER, exception_type INTEGER);
+        INSERT INTO calendar_dates VALUES ('WK', 20260216, 2), ('HOL', 20260216, 1);
+        INSERT INTO calendar VALUES ('WK', '1', '1', '1', '1', '1', '0', '0', '20260101', '20261231');
+        INSERT INTO trips VALUES ('WK1', 'R1', 'WK', 'Bravo', 'STCP'), ('HOL1', 'R1', 'HOL', 'Bravo', 'STCP');
+    """)
+    sched = router._sched
+
+    assert sched.get_valid_services(datetime.date(2026, 2, 16)) - {"ALL"} == {"HOL"}
+    assert sched.get_valid_services(datetime.date(2026, 2, 17)) - {"ALL"} == {"WK"}
+
+
+
+def test_schedule_caches_evict_least_recently_used(router, monkeypatch):
+    """Test the trip caches stay within their bounds and keep recent entries."""
+    sched = router._sched
+    monkeypatch.setattr(sched._trip_stops, "maxsize", 2)
+
+    sched.get_trip_stops_after("BUS1", 0)
+    sched.get_trip_stops_after("BUS2", 0)
+    sched.get_trip_stops_after("BUS1", 0)      # BUS1 is now the most recent
+    sched.get_trip_stops_after("NIGHT1", 0)
+
+    assert list(sched._trip_stops) == ["BUS1", "NIGHT1"]
+    hits, misses, size = sched.cache_info()["trip_stops"]
+    assert (hits, misses, size) == (1, 3, 2)
+    # An evicted trip is simply loaded again
+    assert [ts.stop_id for ts in sched.get_trip_stops_after("BUS2", 1)] == ["stcp_Z"]
+
+@pytest.mark.parametrize("time_str, minutes", [
+    ("08:05:30", 485.5),
+    ("25:10:59", 25 * 60 + 10 + 59 / 60.0),
+    ("00:00:00", 0.0),
+    # Off the fast path: parsed by splitting
+    ("8:05:00", 485.0),
+    (" 08:05:00", 485.0),
+    ("08:75:00", 555.0),
+    ("08:05", 485.0),
+    ("08:05:3a", -1.0),
+    ("", -1.0),
+])
+def test_parse_gtfs_time(time_str, minutes):
+    """Test the canonical fast path and the general parser agree on every layout."""
+    assert parse_gtfs_time(time_str) == minutes
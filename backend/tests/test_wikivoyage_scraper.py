@@ -0,0 +1,141 @@
+import pytest
+from app.parsers import wikivoyage_scraper
+from app.parsers.wikivoyage_scraper import WikiVoyageScraper
+
+CITY_PAGE = """<html><body><div id="mw-content-text">
+<div class="mw-heading"><h2 id="Stay_safe">Stay safe</h2></div>
+<p>Pickpockets work the crowded trams, so keep your wallet in a front pocket.</p>
+<p>Short.</p>
+<ul>
+<li>Avoid unlit alleys in the old town late at night.</li>
+<li>Too short</li>
+</ul>
+<div class="mw-heading"><h2 id="Eat">Eat</h2></div>
+<p>Try a francesinha, a sandwich smothered in cheese and beer sauce.</p>
+</div></body></html>"""
+
+class FakeResponse:
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.content = text.encode()
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        # Small chunks so the incremental parser sees the page in pieces
+        for i in range(0, len(self.content), 64):
+            yield self.content[i:i + 64]
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture(autouse=True)
+def http_cache(tmp_path, monkeypatch):
+    """Keep the WikiVoyage HTTP cache in a temporary file."""
+    monkeypatch.setattr(wikivoyage_scraper, "_HTTP_CACHE_PATH", str(tmp_path / "cache.json"))
+    monkeypatch.setattr(wikivoyage_scraper, "_http_cache", None)
+
+def fake_page(monkeypatch, text, status_code=200):
+    monkeypatch.setattr(wikivoyage_scraper._SESSION, "get",
+                        lambda *a, **kw: FakeResponse(text, status_code))
+
+def test_scrape_city_sections(monkeypatch):
+    """Test paragraphs and list items become tips with category and severity."""
+    fake_page(monkeypatch, CITY_PAGE)
+
+    tips = WikiVoyageScraper.scrape_city("Porto", "OPO", "PT")
+
+    safe = [t for t in tips if t["category"] == "scam"]
+    assert [t["title"] for t in safe[:2]] == ["Stay safe", "Stay safe - Tip 2"]
+    assert safe[0]["content"].startswith("Pickpockets")
+    assert safe[0]["severity"] == "warning"
+    assert safe[1]["content"].startswith("• Avoid unlit alleys")
+    assert safe[1]["severity"] == "critical"
+    eat = [t for t in tips if t["category"] == "food"]
+    assert eat[0]["title"] == "Eat"
+    assert eat[0]["location_code"] == "OPO"
+
+def test_severity_keywords_match_inside_words(monkeypatch):
+    """Test severity keywords match case-insensitively, including inside longer words."""
+    page = """<div id="mw-content-text"><div><h2 id="Eat">Eat</h2></div>
+<p>The riverside stalls can be Dangerous for your budget, honestly speaking.</p>
+<p>Watch your bag: PICKPOCKETING happens around the busiest food markets.</p>
+<p>Grilled sardines are sold on almost every corner during June festivals.</p>
+</div>"""
+    fake_page(monkeypatch, page)
+
+    tips = WikiVoyageScraper.scrape_city("Porto", "OPO", "PT")
+
+    assert [t["severity"] for t in tips] == ["critical", "warning", "info"]
+
+def test_scrape_city_stops_after_content(monkeypatch):
+    """Test the download stops once the content div closes."""
+    response = FakeResponse(CITY_PAGE.replace("</body>", "<footer>x</footer>" * 1000 + "</body>"))
+    chunks_read = []
+    original = response.iter_content
+
+    def iter_content(chunk_size=1):
+        for chunk in original(chunk_size):
+            chunks_read.append(chunk)
+            yield chunk
+
+    response.iter_content = iter_content
+    monkeypatch.setattr(wikivoyage_scraper._SESSION, "get", lambda *a, **kw: response)
+
+    tips = WikiVoyageScraper.scrape_city("Porto", "OPO", "PT")
+
+    assert [t["title"] for t in tips][:1] == ["Stay safe"]
+    assert len(b"".join(chunks_read)) < len(response.content) // 10
+    assert response.closed
+
+def test_scrape_city_http_error(monkeypatch):
+    """Test non-200 responses yield no tips."""
+    fake_page(monkeypatch, "", status_code=404)
+
+    assert WikiVoyageScraper.scrape_city("Porto", "OPO", "PT") == []
+
+def test_scrape_multiple_cities(monkeypatch):
+    """Test cities are scraped concurrently and returned in mapping order."""
+    pages = {"Porto": CITY_PAGE, "Faro": "<html></html>"}
+    monkeypatch.setattr(wikivoyage_scraper._SESSION, "get",
+                        lambda url, **kw: FakeResponse(pages[url.rsplit("/", 1)[-1]]))
+    monkeypatch.setattr(wikivoyage_scraper, "_POLITE_DELAY_SECONDS", 0)
+
+    all_tips = WikiVoyageScraper.scrape_multiple_cities({
+        "OPO": {"city": "Porto", "country": "PT"},
+        "FAO": {"city": "Faro", "country": "PT"},
+    })
+
+    assert list(all_tips) == ["OPO", "FAO"]
+    assert all_tips["OPO"][0]["title"] == "Stay safe"
+    assert all_tips["FAO"] == []
+
+def test_scrape_city_revalidates_with_etag(monkeypatch):
+    """Test a 304 reply reuses the cached tips, re-stamped for the caller."""
+    requests_seen = []
+
+    def get(url, headers=None, **kw):
+        requests_seen.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse("", status_code=304)
+        return FakeResponse(CITY_PAGE, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(wikivoyage_scraper._SESSION, "get", get)
+
+    first = WikiVoyageScraper.scrape_city("Porto", "OPO", "PT")
+    monkeypatch.setattr(wikivoyage_scraper, "_http_cache", None)  # reload from disk
+    second = WikiVoyageScraper.scrape_city("Porto", "XXX", "PT")
+
+    assert requests_seen == [{}, {"If-None-Match": '"v1"'}]
+    assert [t["content"] for t in second] == [t["content"] for t in first]
+    assert {t["location_code"] for t in second} == {"XXX"}
+
+def test_scrape_city_remembers_not_found(monkeypatch):
+    """Test a 404 is cached so the page isn't requested again."""
+    fake_page(monkeypatch, "", status_code=404)
+    assert WikiVoyageScraper.scrape_city("Atlantis", "ATL", "XX") == []
+
+    monkeypatch.setattr(wikivoyage_scraper._SESSION, "get",
+                        lambda *a, **kw: pytest.fail("should not refetch"))
+    assert WikiVoyageScraper.scrape_city("Atlantis", "ATL", "XX") == []
@@ -2,6 +2,9 @@
 Transport Database Builder — locations only.
 Downloads GTFS feeds, extracts stops, and builds a simple 'locations' table
 for autocomplete. No routing tables are created (routing is handled by Google Maps).
+
+With --stop-time-minutes, instead adds precomputed minute columns to the
+stop_times table of an existing transport.db for the routing schedule.
 """
 
 import pandas as pd
@@ -152,6 +155,57 @@ def process_agency(source: dict, conn: sqlite3.Connection):
     print(f"   → {len(stops):,} locations added")
 
 
+# ─── STOP TIME MINUTES ───────────────────────────────────────────────────────
+
+def _minutes_sql(column: str) -> str:
+    """SQL turning an "H:MM:SS" / "HH:MM:SS" column into minutes since midnight.
+
+    Same value as the app's parse_gtfs_time: seconds become a fraction.
+    Anything else (spaces, letters, fractional seconds…) is left NULL,
+    so the app parses it itself and skips what it can't parse.
+    """
+    rest = f"substr({column}, instr({column}, ':') + 1)"
+    return (
+        f"CASE WHEN {column} GLOB '[0-9]:[0-9][0-9]:[0-9][0-9]' "
+        f"OR {column} GLOB '[0-9][0-9]:[0-9][0-9]:[0-9][0-9]' THEN "
+        f"CAST({column} AS INTEGER) * 60 + CAST({rest} AS INTEGER) + "
+        f"CAST(substr({column}, -2) AS INTEGER) / 60.0 "
+        f"END"
+    )
+
+
+def add_stop_time_minutes(db_path: str = DB_NAME):
+    """Add departure_min / arrival_min columns to stop_times.
+
+    The routing schedule reads these instead of parsing every time string
+    it fetches.  Safe to re-run: existing columns are refilled.
+    """
+    conn = sqlite3.connect(db_path)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(stop_times)")}
+    if not columns:
+        print(f"   ❌ No stop_times table in {db_path}")
+        conn.close()
+        return
+
+    print("⏱  Precomputing stop_times minutes…")
+    for name in ("departure_min", "arrival_min"):
+        if name not in columns:
+            conn.execute(f"ALTER TABLE stop_times ADD COLUMN {name} REAL")
+    conn.execute(f"""
+        UPDATE stop_times SET
+            departure_min = {_minutes_sql("departure_time")},
+            arrival_min   = {_minutes_sql("arrival_time")}
+    """)
+    # Departures are looked up per stop in time order
+    conn.execute("DROP INDEX IF EXISTS idx_st_stop_depart")
+    conn.execute(
+        "CREATE INDEX idx_st_stop_depart ON stop_times(stop_id, departure_min)"
+    )
+    conn.commit()
+    conn.close()
+    print("   → departure_min / arrival_min ready")
+
+
 # ─── DATABASE BUILDER ────────────────────────────────────────────────────────
 
 def build_database():
@@ -203,7 +257,10 @@ def build_database():
 
 if __name__ == "__main__":
     try:
-        build_database()
+        if "--stop-time-minutes" in sys.argv[1:]:
+            add_stop_time_minutes()
+        else:
+            build_database()
     except KeyboardInterrupt:
         print("\n⚠  Interrupted by user.")
     except Exception as e: